@@ -0,0 +1,95 @@
+// Headless test harness for the typeahead logic in script.js.
+//
+// Simulates typing strings key by key against a fake autocomplete endpoint
+// with random latency, and counts the requests sent for each typed string.
+// Run with: node harness.js [debounceDelay] [keystrokeInterval]
+
+// script.js wires itself to the page on $(document).ready; there is no page here
+global.document = {};
+global.$ = function() {
+    return { ready: function() {} };
+};
+var createTypeahead = require("./script.js").createTypeahead;
+
+var debounceDelay = Number(process.argv[2] || 250);
+var keystrokeInterval = Number(process.argv[3] || 80);
+
+var typedStrings = [
+    "5201 California Ave",
+    "25482 Buckwood Land Forest",
+    "24299 Paseo De Valencia"
+];
+
+function sleep(milliseconds) {
+    return new Promise(function(resolve) {
+        setTimeout(resolve, milliseconds);
+    });
+}
+
+// Fake endpoint answering after 50-300 ms, so responses can arrive out of order
+function fakeFetch(counters) {
+    return function(text, onSuccess) {
+        counters.sent++;
+        var timer = setTimeout(function() {
+            counters.completed++;
+            onSuccess([{ label: text + " (suggestion)" }]);
+        }, 50 + Math.random() * 250);
+        return {
+            abort: function() {
+                clearTimeout(timer);
+            }
+        };
+    };
+}
+
+async function typeString(text) {
+    var counters = { sent: 0, completed: 0 };
+    var rendered = [];
+    var typeahead = createTypeahead({
+        debounceDelay: debounceDelay,
+        fetchSuggestions: fakeFetch(counters),
+        render: function(addresses) {
+            rendered.push(addresses[0].label);
+        },
+        clear: function() {}
+    });
+
+    // Type the string, pause, then backspace three characters and retype them
+    for (var i = 1; i <= text.length; i++) {
+        typeahead.onInput(text.slice(0, i));
+        await sleep(keystrokeInterval);
+    }
+    await sleep(debounceDelay + 400);
+    for (var j = text.length - 1; j >= text.length - 3; j--) {
+        typeahead.onInput(text.slice(0, j));
+        await sleep(keystrokeInterval);
+    }
+    for (var k = text.length - 2; k <= text.length; k++) {
+        typeahead.onInput(text.slice(0, k));
+        await sleep(keystrokeInterval);
+    }
+    await sleep(debounceDelay + 400);
+
+    var lastRendered = rendered[rendered.length - 1];
+    return {
+        text: text,
+        keystrokes: text.length + 6,
+        requests: counters.sent,
+        aborted: typeahead.stats.aborted,
+        cacheHits: typeahead.stats.cacheHits,
+        staleIgnored: typeahead.stats.stale,
+        finalSuggestionMatchesInput: lastRendered === text + " (suggestion)"
+    };
+}
+
+(async function() {
+    var failures = 0;
+    for (var i = 0; i < typedStrings.length; i++) {
+        var result = await typeString(typedStrings[i]);
+        console.log(JSON.stringify(result));
+        if (!result.finalSuggestionMatchesInput || result.requests >= result.keystrokes) {
+            failures++;
+        }
+    }
+    process.exit(failures ? 1 : 0);
+})();
@@ -1,3 +1,79 @@
+// Creates the typeahead logic: debounced, cancellable and cached autocomplete requests.
+//
+// options.fetchSuggestions(text, onSuccess, onError) sends one request and returns an
+// object with an abort() method (a jqXHR works as is).
+// options.render(addresses) shows suggestions, options.clear() hides them.
+// options.minLength is the shortest text looked up, options.debounceDelay the number of
+// milliseconds the input must stay unchanged before a request is sent.
+function createTypeahead(options) {
+    var minLength = options.minLength !== undefined ? options.minLength : 4;
+    var debounceDelay = options.debounceDelay !== undefined ? options.debounceDelay : 250;
+    var cache = new Map(); // Per-session responses, keyed by the exact text
+    var timer = null;
+    var inFlight = null;
+    var latestText = null;
+    var stats = { requests: 0, aborted: 0, cacheHits: 0, stale: 0 };
+
+    function abortInFlight() {
+        if (inFlight) {
+            inFlight.abort();
+            inFlight = null;
+            stats.aborted++;
+        }
+    }
+
+    function request(text) {
+        abortInFlight();
+        stats.requests++;
+        var handle = options.fetchSuggestions(text, function(addresses) {
+            if (inFlight === handle) {
+                inFlight = null;
+            }
+            cache.set(text, addresses);
+            // An older response arriving late must not overwrite the newer text's suggestions
+            if (text !== latestText) {
+                stats.stale++;
+                return;
+            }
+            options.render(addresses);
+        }, function(error) {
+            if (inFlight === handle) {
+                inFlight = null;
+            }
+            if (options.onError) {
+                options.onError(error);
+            }
+        });
+        inFlight = handle;
+    }
+
+    function onInput(text) {
+        latestText = text;
+        clearTimeout(timer);
+        // A response for the previous text would be discarded anyway
+        abortInFlight();
+        if (text.length < minLength) {
+            options.clear();
+            return;
+        }
+        // Backspacing to an earlier prefix re-renders instantly
+        if (cache.has(text)) {
+            stats.cacheHits++;
+            options.render(cache.get(text));
+            return;
+        }
+        timer = setTimeout(function() {
+            request(text);
+        }, debounceDelay);
+    }
+
+    return { onInput: onInput, stats: stats };
+}
+
+if (typeof module !== "undefined" && module.exports) {
+    module.exports = { createTypeahead: createTypeahead };
+}
+
 $(document).ready(function() {
     var apiKey = ""
 
@@ -26,7 +102,7 @@ $(document).ready(function() {
         });
 
     }
-    
+
     // Add an event listener to the button
     document.getElementById("apiButton").addEventListener("click", function() {
         // Call the function from the separate JavaScript file
@@ -35,17 +111,25 @@ $(document).ready(function() {
     });
 
 
-    $("#input-text").on("input", function() {
-        var inputValue = $(this).val();
-        if (inputValue.length > 3) {
-            fetchDropdown(inputValue);
-        } else {
-            $("#dropdown").empty(); // Clear dropdown if input field is empty
+    var typeahead = createTypeahead({
+        minLength: 4, // Look up once the input is longer than 3 characters
+        debounceDelay: 250, // Milliseconds without typing before a request is sent
+        fetchSuggestions: fetchDropdown,
+        render: renderDropdown,
+        clear: function() {
+            $("#dropdown").empty(); // Clear dropdown if input field is too short
+        },
+        onError: function(error) {
+            console.error("Error fetching data:", error);
         }
     });
 
-    function fetchDropdown(inputValue) {
-        $.ajax({
+    $("#input-text").on("input", function() {
+        typeahead.onInput($(this).val());
+    });
+
+    function fetchDropdown(inputValue, onSuccess, onError) {
+        return $.ajax({
             url: "https://api.lightboxre.com/v1/addresses/_autocomplete",
             method: "GET",
             headers: {
@@ -56,14 +140,17 @@ $(document).ready(function() {
                 countryCode: "US"
             },
             success: function(data) {
-                renderDropdown(data.addresses);
+                onSuccess(data.addresses);
             },
             error: function(xhr, status, error) {
-                console.error("Error fetching data:", error);
+                // Requests superseded by newer input are aborted on purpose
+                if (status !== "abort") {
+                    onError(error);
+                }
             }
         });
     }
-    
+
 
     function renderDropdown(addresses) {
         var dropdownOptions = addresses.map(function(item) {
@@ -1,39 +1,15 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox.endpoints import autocomplete_address
 
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
-def autocomplete_address(
-        lightbox_api_key: str, 
-        address: str, 
-        country_code: str
-) -> Dict:
-    """
-    Autocompletes the provided address using the LightBox API.
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        address (str): The partial address to be autocompleted.
-        country_code (str): The ISO 3166-1 alpha-2 country code.
-    
-    Returns:
-        dict: The autocompleted address information in JSON format.
-    """
-    # Prepare request parameters
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = "/addresses/_autocomplete"
-    URL = BASE_URL + ENDPOINT
-    params = {'text': address, 'countryCode': country_code}
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Send request to LightBox API
-    response = requests.get(URL, params=params, headers=headers)
-
-    return response
-
 
 def test_autocomplete_address_response_status(lightbox_api_key: str) -> None:
     # Test case for successful request (HTTP status code 200)
@@ -65,16 +41,19 @@ def test_autocomplete_address_response_status(lightbox_api_key: str) -> None:
 # ----------------------------
 # API Usage
 # ----------------------------
-lightbox_api_key = '<YOUR_API_KEY>'
-address = '5201 California A'
-country_code = 'US'
 
-address_search_data = autocomplete_address(lightbox_api_key, address, country_code)
-print(f"status_code: {address_search_data.status_code}")
-print(json.dumps(address_search_data.json(), indent=4))
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    lightbox_api_key = '<YOUR_API_KEY>'
+    address = '5201 California A'
+    country_code = 'US'
+
+    address_search_data = autocomplete_address(lightbox_api_key, address, country_code)
+    print(f"status_code: {address_search_data.status_code}")
+    print(json.dumps(address_search_data.json(), indent=4))
 
 
-# ----------------------------
-# API Testing
-# ----------------------------
-test_autocomplete_address_response_status(lightbox_api_key)
+    # ----------------------------
+    # API Testing
+    # ----------------------------
+    test_autocomplete_address_response_status(lightbox_api_key)
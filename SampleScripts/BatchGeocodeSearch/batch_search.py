@@ -1,37 +1,76 @@
+import io
+import os
+import sys
+import json
+import heapq
+import zlib
+import pickle
+import shutil
+import argparse
+import contextvars
+import tempfile
+import multiprocessing
+import time
+from contextlib import nullcontext
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_EXCEPTION, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import count, islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
 import requests
-import pandas as pd
-from typing import Dict, List
 
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import BASE_URL, ResponseCache, SharedTokenBucket, configure_clients, get_client
+from lightbox.cache import CACHE_PATH_ENV
+from lightbox.endpoints import geocode_address
+from lightbox.normalize import normalize_address
+from lightbox.records import FAILED, MATCH, NO_MATCH, GeocodeRecord, RecordColumns
 
-# ----------------------------
-# Function Definitions
-# ----------------------------
+# pandas is only imported by the functions that read or build DataFrames
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Function to geocode a single address using the LightBox API.
-def geocode_address(lightbox_api_key: str, address: str) -> Dict:
+
+# Columns of the geocoded output file, one per GeocodeRecord field
+OUTPUT_COLUMNS = list(GeocodeRecord._fields)
+
+# Function to get the column types of the geocoded output.
+def output_dtypes() -> Dict:
     """
-    Geocodes the provided address using the LightBox API.
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        address (str): The address string for matching.
-    
-    Returns:
-        dict: The geocoded address information in JSON format.
+    Returns the pandas type of each output column: coordinates and scores are floats with real nulls.
     """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = "/addresses/search"
-    URL = BASE_URL + ENDPOINT
+    import pandas as pd
+    return {
+        "address": "string",
+        "latitude": "float64",
+        "longitude": "float64",
+        "confidence_score": "float64",
+        "precision_code": "string",
+        "status": pd.CategoricalDtype([MATCH, NO_MATCH, FAILED]),
+        "status_code": "Int16",
+    }
+
+# Output file formats, by file extension
+OUTPUT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+# Ways of splitting the input rows between worker processes
+SHARD_BY = ("range", "hash")
+
+# Row outcomes counted by the shard workers, in the order of their shared counters
+STATUSES = (MATCH, NO_MATCH, FAILED)
 
-    # Setting up request parameters and headers
-    params = {'text': address}
-    headers = {'x-api-key': lightbox_api_key}
+# Seconds between two reads of the shard workers' counters
+SHARD_PROGRESS_INTERVAL = 0.5
 
-    # Sending request to the LightBox API
-    response = requests.get(URL, params=params, headers=headers)
+# Row counters and stop signal shared with the parent, set in each shard worker process
+_shard_progress = None
 
-    return response
+
+# ----------------------------
+# Function Definitions
+# ----------------------------
 
 # Function to read addresses from a CSV file and format them.
 def read_addresses_from_csv(file_path: str) -> List[str]:
@@ -44,24 +83,127 @@ def read_addresses_from_csv(file_path: str) -> List[str]:
     Returns:
         List[str]: A list of formatted address strings.
     """
+    import pandas as pd
     df = pd.read_csv(file_path)
+    return format_addresses(df).tolist()
 
-    # Concatenating address components into a single address string per row
-    formatted_addresses = df.apply(
-        lambda row: f"{row['Address']}, {row['City']} {row['State']} {row['Zip Code']}", 
-        axis=1
+# Function to format the address columns of a DataFrame into address strings.
+def format_addresses(df: "pd.DataFrame") -> "pd.Series":
+    """
+    Formats the address columns of a DataFrame into 'Address, City State Zip Code'.
+
+    Args:
+        df (pd.DataFrame): DataFrame with 'Address', 'City', 'State' and 'Zip Code' columns.
+
+    Returns:
+        pd.Series: The formatted address strings.
+    """
+    # Concatenating address components column-wise into a single address string per row
+    return (
+        df['Address'].astype(str) + ", " + df['City'].astype(str) + " "
+        + df['State'].astype(str) + " " + df['Zip Code'].astype(str)
     )
-    return formatted_addresses.tolist()
+
+# Function to stream formatted addresses from a CSV file in chunks.
+def iter_addresses_from_csv(file_path: str, chunksize: int = 10000, start_row: int = 0) -> Iterator[str]:
+    """
+    Reads a CSV file chunk by chunk and yields its formatted addresses one at a time.
+
+    Only one chunk of the file is held in memory at a time.
+
+    Args:
+        file_path (str): Path to the CSV file, or '-' for standard input.
+        chunksize (int): Number of rows read from the file at a time.
+        start_row (int): Number of data rows to skip at the start of the file.
+
+    Yields:
+        str: Formatted address strings, in file order.
+    """
+    import pandas as pd
+    source = sys.stdin if file_path == "-" else file_path
+    # Skipped rows are parsed and dropped chunk by chunk: skiprows would hold every skipped row number in a set
+    skip = start_row
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        if skip >= len(chunk):
+            skip -= len(chunk)
+            continue
+        yield from format_addresses(chunk.iloc[skip:])
+        skip = 0
+
+# Function to turn a single geocode response into an output row.
+def parse_geocode_response(address: str, result) -> GeocodeRecord:
+    """
+    Extracts the output columns for one address from its geocode response.
+
+    Addresses without a match or whose request failed get null coordinates,
+    score and precision code; the outcome is recorded in 'status' and the HTTP
+    status code in 'status_code'.
+
+    Args:
+        address (str): The address string that was geocoded.
+        result (requests.Response): The response returned by geocode_address.
+
+    Returns:
+        GeocodeRecord: A row with the address, latitude, longitude, confidence score, precision code, status and status code.
+    """
+    row = GeocodeRecord.from_response(address, result)
+    if row.status == FAILED:
+        print(f"Failed to geocode address '{address}', Status Code: {result.status_code}", file=sys.stderr)
+    return row
+
+# Function to build a typed DataFrame from output rows.
+def results_to_dataframe(rows: Iterable[GeocodeRecord]) -> "pd.DataFrame":
+    """
+    Builds a DataFrame of output rows with the column types of output_dtypes().
+
+    Rows are first collected into array-backed columns, so coordinates and
+    scores go straight into float64 arrays.
+
+    Args:
+        rows (Iterable[GeocodeRecord]): Output rows, e.g. from stream_geocode_addresses.
+
+    Returns:
+        pd.DataFrame: The output rows, with float64 coordinates and a categorical status.
+    """
+    return RecordColumns(GeocodeRecord, rows).to_dataframe().astype(output_dtypes())
+
+# Function to geocode one address and parse the response into an output row.
+def geocode_address_row(api_key: str, address: str) -> GeocodeRecord:
+    """
+    Geocodes a single address and returns its output row.
+
+    A request that still fails once the client's retries are exhausted (e.g. a
+    connection error or timeout) yields a FAILED row without status code, so it
+    counts toward the error budget instead of aborting the whole run.
+
+    Args:
+        api_key (str): API key for the geocoding service.
+        address (str): The address string for matching.
+
+    Returns:
+        GeocodeRecord: A row with the address, latitude, longitude, confidence score and precision code.
+    """
+    try:
+        return parse_geocode_response(address, geocode_address(api_key, address))
+    except requests.RequestException as error:
+        print(f"Failed to geocode address '{address}', {type(error).__name__}: {error}", file=sys.stderr)
+        return GeocodeRecord(address, None, None, None, None, FAILED, None)
 
 # Function to batch process addresses for geocoding.
-def batch_geocode_addresses(api_key: str, addresses: List[str], batch_size: int = 200) -> pd.DataFrame:
+def batch_geocode_addresses(api_key: str, addresses: List[str], batch_size: int = 200, max_workers: int = 1, deduplicate: bool = False) -> "pd.DataFrame":
     """
     Batch processes a list of addresses for geocoding.
 
+    With max_workers greater than 1, addresses are geocoded concurrently on a
+    thread pool (see stream_geocode_addresses), with at most max_workers requests in flight.
+    Results are always returned in input order.
+
     Args:
         api_key (str): API key for the geocoding service.
         addresses (List[str]): List of addresses to geocode.
         batch_size (int): Number of addresses to process in each batch.
+        max_workers (int): Maximum number of geocode requests in flight at once.
+        deduplicate (bool): Geocode equivalent addresses only once (see normalize_address).
     
     Returns:
         pd.DataFrame: DataFrame containing original addresses and expanded geocoded data.
@@ -69,44 +211,571 @@ def batch_geocode_addresses(api_key: str, addresses: List[str], batch_size: int
     batched_addresses = [addresses[i:i + batch_size] for i in range(0, len(addresses), batch_size)]
     all_results = []
 
-    for batch in batched_addresses:
-        for address in batch:
-            result = geocode_address(api_key, address)
-            if result.status_code == 200:
-                data = result.json()
-                # Extracting data from the first match
-                if data['addresses']:
-                    first_match = data['addresses'][0]
-                    latitude = first_match['location']['representativePoint']['latitude']
-                    longitude = first_match['location']['representativePoint']['longitude']
-                    confidence_score = first_match['$metadata']['geocode']['confidence']['score']
-                    precision_code = first_match['$metadata']['geocode']['precisionCode']  # Extracting precision code
-                    all_results.append({
-                        "address": address, 
-                        "latitude": latitude, 
-                        "longitude": longitude, 
-                        "confidence_score": confidence_score,
-                        "precision_code": precision_code  # Adding precision code to the DataFrame
-                    })
-                else:
-                    all_results.append({
-                        "address": address, 
-                        "latitude": "No match", 
-                        "longitude": "No match", 
-                        "confidence_score": "No match",
-                        "precision_code": "No match"
-                    })
+    if max_workers <= 1 and not deduplicate:
+        for batch in batched_addresses:
+            for address in batch:
+                all_results.append(geocode_address_row(api_key, address))
+        return results_to_dataframe(all_results)
+
+    all_results = stream_geocode_addresses(api_key, addresses, max_workers=max_workers, deduplicate=deduplicate)
+    return results_to_dataframe(all_results)
+
+# Function to geocode a stream of addresses as a generator pipeline.
+def stream_geocode_addresses(api_key: str, addresses: Iterable[str], max_workers: int = 1, deduplicate: bool = False, max_unique: int = 1000000) -> Iterator[GeocodeRecord]:
+    """
+    Geocodes addresses lazily, yielding one output row per address in input order.
+
+    Addresses are pulled from the iterable only as requests complete: at most
+    max_workers requests are in flight and at most twice that many addresses
+    are held at once, so any number of addresses runs in bounded memory.
+
+    With deduplicate, addresses are collapsed to a canonical key by
+    normalize_address: each key is geocoded once and its result fanned out to
+    every row sharing it. The results of the max_unique most recently seen keys
+    are kept.
+
+    Requests run in the caller's context, so a request_priority block around
+    the loop (e.g. request_priority('batch')) sets their priority class.
+
+    Args:
+        api_key (str): API key for the geocoding service.
+        addresses (Iterable[str]): Addresses to geocode, e.g. from iter_addresses_from_csv.
+        max_workers (int): Maximum number of geocode requests in flight at once.
+        deduplicate (bool): Geocode equivalent addresses only once.
+        max_unique (int): Number of canonical keys whose results are kept for deduplication.
+
+    Yields:
+        GeocodeRecord: A row with the address, latitude, longitude, confidence score and precision code.
+    """
+    addresses = iter(addresses)
+    if max_workers <= 1 and not deduplicate:
+        for address in addresses:
+            yield geocode_address_row(api_key, address)
+        return
+
+    # Futures of the most recently seen canonical addresses, oldest first
+    futures_by_key = OrderedDict()
+
+    def submit(address: str) -> Tuple[str, Future]:
+        if not deduplicate:
+            return address, executor.submit(contextvars.copy_context().run, geocode_address_row, api_key, address)
+        key = normalize_address(address)
+        future = futures_by_key.get(key)
+        if future is None:
+            future = executor.submit(contextvars.copy_context().run, geocode_address_row, api_key, address)
+            futures_by_key[key] = future
+            if len(futures_by_key) > max_unique:
+                futures_by_key.popitem(last=False)
+        else:
+            futures_by_key.move_to_end(key)
+        return address, future
+
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Sliding window of pending futures, consumed oldest first to keep input order
+        pending = deque(submit(address) for address in islice(addresses, 2 * max_workers))
+        try:
+            while pending:
+                address, future = pending.popleft()
+                row = future.result()
+                for next_address in islice(addresses, 1):
+                    pending.append(submit(next_address))
+                # Fanning a shared result back out under each row's original address
+                yield row._replace(address=address)
+        finally:
+            # When the consumer stops early, requests not started yet are dropped rather than waited for
+            for _, future in pending:
+                future.cancel()
+
+# Function to read the progress recorded in a journal file.
+def read_journal(journal_path: str) -> Tuple[int, int]:
+    """
+    Returns the last checkpoint recorded in a progress journal.
+
+    Each journal line records, after a batch was durably written, the number of
+    input rows completed and the size of the output file at that point. A line
+    cut short by a crash is ignored.
+
+    Args:
+        journal_path (str): Path of the journal file.
+
+    Returns:
+        Tuple[int, int]: The number of completed input rows and the output file offset (0, 0 without journal).
+    """
+    completed_rows, output_offset = 0, 0
+    if not os.path.exists(journal_path):
+        return completed_rows, output_offset
+    with open(journal_path) as journal_file:
+        for line in journal_file:
+            try:
+                checkpoint = json.loads(line)
+            except ValueError:
+                break
+            completed_rows, output_offset = checkpoint["rows"], checkpoint["offset"]
+    return completed_rows, output_offset
+
+# Function to durably append a checkpoint to a journal file.
+def write_journal(journal_file, completed_rows: int, output_offset: int) -> None:
+    """
+    Appends a checkpoint to the progress journal and flushes it to disk.
+
+    Args:
+        journal_file (file): The journal file, opened for appending.
+        completed_rows (int): Number of input rows whose output rows are on disk.
+        output_offset (int): Size of the output file after those rows.
+    """
+    journal_file.write(json.dumps({"rows": completed_rows, "offset": output_offset}) + "\n")
+    journal_file.flush()
+    os.fsync(journal_file.fileno())
+
+# Function to append output rows to a CSV file as they are produced.
+def write_results_to_csv(results: Iterable[GeocodeRecord], output_file_path: str, batch_size: int = 200, journal_path: str = None, resume: bool = False) -> int:
+    """
+    Writes output rows to a CSV file incrementally, one batch at a time.
+
+    The header is written first and every batch is flushed as soon as it is
+    complete, so the file can be read while the job is still running. With a
+    journal, a checkpoint is recorded after every batch; resuming truncates the
+    output back to the last checkpoint and appends after it, in which case the
+    results must start at the first row not yet completed.
+
+    Args:
+        results (Iterable[GeocodeRecord]): Output rows, e.g. from stream_geocode_addresses.
+        output_file_path (str): Path of the output CSV file, or '-' for standard output.
+        batch_size (int): Number of rows buffered before each write.
+        journal_path (str): Optional path of the progress journal.
+        resume (bool): Continue the output file from the journal's last checkpoint.
+
+    Returns:
+        int: The total number of rows in the output file.
+    """
+    results = iter(results)
+    rows_written, output_offset = read_journal(journal_path) if resume and journal_path else (0, 0)
+    resuming = output_offset > 0 and os.path.exists(output_file_path)
+
+    journal_file = open(journal_path, "a" if resuming else "w") if journal_path else None
+    try:
+        if output_file_path == "-":
+            output = nullcontext(sys.stdout.buffer)
+        else:
+            output = open(output_file_path, "r+b" if resuming else "wb")
+        with output as output_file:
+            if resuming:
+                # Dropping any rows written after the last checkpoint
+                output_file.truncate(output_offset)
+                output_file.seek(output_offset)
             else:
-                all_results.append({
-                    "address": address, 
-                    "latitude": "Failed",
-                    "longitude": f"Status Code: {result.status_code}",
-                    "confidence_score": "Failed",
-                    "precision_code": "Failed"
-                })
-                print(f"Failed to geocode address '{address}', Status Code: {result.status_code}")
+                rows_written = 0
+                output_file.write(results_to_dataframe([]).to_csv(index=False).encode())
+            while True:
+                batch = list(islice(results, batch_size))
+                if not batch:
+                    break
+                output_file.write(results_to_dataframe(batch).to_csv(header=False, index=False).encode())
+                output_file.flush()
+                rows_written += len(batch)
+                if journal_file:
+                    os.fsync(output_file.fileno())
+                    write_journal(journal_file, rows_written, output_file.tell())
+    finally:
+        if journal_file:
+            journal_file.close()
+    return rows_written
+
+# Function to write output rows to a Parquet or Arrow file as they are produced.
+def write_results_to_arrow(results: Iterable[GeocodeRecord], output_file_path: str, batch_size: int = 200, output_format: str = "parquet") -> int:
+    """
+    Writes output rows incrementally to a Parquet file or an Arrow IPC file.
+
+    Every batch becomes one Parquet row group or Arrow record batch, keeping
+    the column types of output_dtypes(). Requires the 'pyarrow' package.
+
+    Args:
+        results (Iterable[GeocodeRecord]): Output rows, e.g. from stream_geocode_addresses.
+        output_file_path (str): Path of the output file, or '-' for standard output.
+        batch_size (int): Number of rows buffered before each write.
+        output_format (str): 'parquet' or 'arrow'.
+
+    Returns:
+        int: The total number of rows in the output file.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    results = iter(results)
+    schema = pa.Schema.from_pandas(results_to_dataframe([]), preserve_index=False)
+    sink = sys.stdout.buffer if output_file_path == "-" else output_file_path
+    if output_format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    rows_written = 0
+    with writer:
+        while True:
+            batch = list(islice(results, batch_size))
+            if not batch:
+                break
+            writer.write_table(pa.Table.from_pandas(results_to_dataframe(batch), schema=schema, preserve_index=False))
+            rows_written += len(batch)
+    return rows_written
+
+# Function to geocode a CSV file into an output file in constant memory.
+def geocode_csv_file(api_key: str, input_file_path: str, output_file_path: str, batch_size: int = 200, max_workers: int = 1, chunksize: int = 10000, resume: bool = False, deduplicate: bool = False, output_format: str = None, on_row: Optional[Callable[[GeocodeRecord], None]] = None) -> int:
+    """
+    Streams addresses from an input CSV file through the geocoder into an output file.
 
-    return pd.DataFrame(all_results)
+    The output is CSV, Parquet or Arrow IPC. Progress of CSV output files is
+    journaled to '<output_file_path>.journal' after every batch. With resume,
+    input rows completed by a previous run are skipped.
+
+    Args:
+        api_key (str): API key for the geocoding service.
+        input_file_path (str): Path of the input CSV file, or '-' for standard input.
+        output_file_path (str): Path of the output file, or '-' for standard output.
+        batch_size (int): Number of rows buffered before each write to the output.
+        max_workers (int): Maximum number of geocode requests in flight at once.
+        chunksize (int): Number of rows read from the input file at a time.
+        resume (bool): Continue a previous run from its progress journal.
+        deduplicate (bool): Geocode equivalent addresses only once (see normalize_address).
+        output_format (str): 'csv', 'parquet' or 'arrow'; inferred from the output file extension by default.
+        on_row (Callable): Optional function called with every output row before it is written, e.g. to report progress.
+
+    Returns:
+        int: The total number of rows in the output file.
+    """
+    if output_format is None:
+        output_format = OUTPUT_FORMATS.get(os.path.splitext(output_file_path)[1].lower(), "csv")
+    if resume and (output_format != "csv" or output_file_path == "-"):
+        raise ValueError("resume is only supported for CSV output files")
+
+    journal_path = output_file_path + ".journal" if output_file_path != "-" else None
+    start_row = read_journal(journal_path)[0] if resume and os.path.exists(output_file_path) else 0
+    if start_row:
+        print(f"Resuming after {start_row} completed rows.", file=sys.stderr)
+
+    addresses = iter_addresses_from_csv(input_file_path, chunksize=chunksize, start_row=start_row)
+    results = stream_geocode_addresses(api_key, addresses, max_workers=max_workers, deduplicate=deduplicate)
+    if on_row is not None:
+        results = observe_rows(results, on_row)
+    if output_format != "csv":
+        return write_results_to_arrow(results, output_file_path, batch_size=batch_size, output_format=output_format)
+    return write_results_to_csv(results, output_file_path, batch_size=batch_size, journal_path=journal_path, resume=resume)
+
+# Function to pass every output row to a callback on its way to the output.
+def observe_rows(rows: Iterable[GeocodeRecord], on_row: Callable[[GeocodeRecord], None]) -> Iterator[GeocodeRecord]:
+    for row in rows:
+        on_row(row)
+        yield row
+
+# Function to count the data rows of a CSV file.
+def count_csv_rows(file_path: str, chunksize: int = 100000) -> int:
+    import pandas as pd
+    # Parsing only the first column, since only the number of rows matters
+    return sum(len(chunk) for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=[0]))
+
+# Function to assign an address to a hash shard.
+def shard_of(address: str, shards: int) -> int:
+    """
+    Returns the shard of an address, the same in every process and run.
+
+    Equivalent addresses (see normalize_address) always land in the same
+    shard, so deduplication within each shard covers the whole input.
+
+    Args:
+        address (str): The address string.
+        shards (int): Number of shards.
+
+    Returns:
+        int: The shard number, from 0 to shards - 1.
+    """
+    return zlib.crc32(normalize_address(address).encode()) % shards
+
+# Function to yield the byte offset just past every record of a CSV file opened in binary mode.
+def _csv_record_ends(csv_file) -> Iterator[int]:
+    offset, quotes = 0, 0
+    for line in csv_file:
+        offset += len(line)
+        quotes += line.count(b'"')
+        # A line break inside a quoted field, i.e. after an odd number of quotes, does not end the record
+        if quotes % 2 == 0:
+            quotes = 0
+            yield offset
+    if quotes:
+        yield offset
+
+# Function to split the data rows of a CSV file into byte ranges of consecutive rows.
+def split_csv_rows(file_path: str, parts: int) -> List[Tuple[int, Tuple[int, int]]]:
+    """
+    Splits the data rows of a CSV file into blocks of about equal row counts, without parsing any field.
+
+    The file is scanned twice as raw bytes: once to count its records, once to
+    find the byte offsets where blocks start. Records are counted by their line
+    breaks outside quoted fields, so blank lines, which pandas skips, count as
+    rows here: row numbers stay increasing from one block to the next, but may
+    leave gaps.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        parts (int): Number of blocks.
+
+    Returns:
+        List[Tuple[int, Tuple[int, int]]]: The first row number and the (start, stop) byte offsets of each block.
+    """
+    with open(file_path, "rb") as csv_file:
+        # The first record is the header
+        total_rows = sum(1 for _ in _csv_record_ends(csv_file)) - 1
+    part_rows = max(1, -(-total_rows // parts))
+    first_rows = [min(total_rows, part * part_rows) for part in range(parts + 1)]
+
+    # Byte offset where each block's first row starts, i.e. where the record before it ends
+    wanted, offsets = set(first_rows), {}
+    with open(file_path, "rb") as csv_file:
+        for row, end in enumerate(_csv_record_ends(csv_file)):
+            if row in wanted:
+                offsets[row] = end
+            if row >= total_rows:
+                break
+    data_end = offsets.get(total_rows, 0)
+    starts = [offsets.get(row, data_end) for row in first_rows]
+    return [(first_rows[part], (starts[part], starts[part + 1])) for part in range(parts)]
+
+# A read-only raw stream over a byte range of an open binary file.
+class _FileRange(io.RawIOBase):
+
+    def __init__(self, raw_file, start: int, stop: int):
+        raw_file.seek(start)
+        self._file = raw_file
+        self._left = stop - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._file.read(min(len(buffer), self._left))
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+# Function to stream the rows of one shard of a CSV file.
+def iter_shard_addresses(file_path: str, shard: int, shards: int, shard_by: str = "range", start_row: int = 0, byte_range: Optional[Tuple[int, int]] = None, chunksize: int = 10000) -> Iterator[Tuple[int, str]]:
+    """
+    Yields the row number and formatted address of every input row of one shard.
+
+    Range shards parse only their own block of rows: they seek to the byte
+    range found by split_csv_rows in the parent. Hash shards are the rows whose
+    address hashes to the shard (see shard_of), so every hash shard parses the
+    whole file.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        shard (int): The shard number.
+        shards (int): Number of shards.
+        shard_by (str): 'range' or 'hash'.
+        start_row (int): Row number of the first row of a range shard.
+        byte_range (Tuple[int, int]): Start and stop byte offsets of the rows of a range shard.
+        chunksize (int): Number of rows read from the file at a time.
+
+    Yields:
+        Tuple[int, str]: The row number and the address, in file order.
+    """
+    if shard_by == "range":
+        import pandas as pd
+        start, stop = byte_range
+        if start >= stop:
+            return
+        columns = pd.read_csv(file_path, nrows=0).columns
+        with open(file_path, "rb", buffering=0) as raw_file:
+            rows = io.BufferedReader(_FileRange(raw_file, start, stop))
+            chunks = pd.read_csv(rows, header=None, names=columns, chunksize=chunksize)
+            yield from zip(count(start_row), (address for chunk in chunks for address in format_addresses(chunk)))
+        return
+    for row, address in enumerate(iter_addresses_from_csv(file_path, chunksize=chunksize)):
+        if shard_of(address, shards) == shard:
+            yield row, address
+
+# Function to set up the shared clients and progress counters of a shard worker process.
+def _init_shard_worker(rate_limiter: Optional[SharedTokenBucket], client_options: Dict, progress=None) -> None:
+    global _shard_progress
+    _shard_progress = progress
+    configure_clients(rate_limiter=rate_limiter, **client_options)
+
+# Function to geocode one shard of a CSV file into a part file; runs in a worker process.
+def geocode_shard(api_key: str, input_file_path: str, part_path: str, shard: int, shards: int, shard_by: str, start_row: int, byte_range: Optional[Tuple[int, int]], max_workers: int, deduplicate: bool, chunksize: int, batch_size: int) -> Dict:
+    """
+    Geocodes the rows of one shard and writes them, with their row numbers, to a part file.
+
+    The part file holds pickled batches of (row number, GeocodeRecord) pairs in row order.
+
+    Args:
+        api_key (str): API key for the geocoding service.
+        input_file_path (str): Path of the input CSV file.
+        part_path (str): Path of the part file.
+        shard (int): The shard number.
+        shards (int): Number of shards.
+        shard_by (str): 'range' or 'hash'.
+        start_row (int): Row number of the first row of a range shard.
+        byte_range (Tuple[int, int]): Start and stop byte offsets of the rows of a range shard.
+        max_workers (int): Maximum number of geocode requests in flight at once in this shard.
+        deduplicate (bool): Geocode equivalent addresses only once.
+        chunksize (int): Number of rows read from the input file at a time.
+        batch_size (int): Number of rows per pickled batch.
+
+    Returns:
+        dict: The number of rows of the shard and the request counters of its client.
+    """
+    counts, stop = _shard_progress or (None, None)
+    pairs = iter_shard_addresses(input_file_path, shard, shards, shard_by, start_row, byte_range, chunksize)
+    # Row numbers of the addresses handed to the geocoder, waiting for their results
+    pending_rows = deque()
+
+    def addresses() -> Iterator[str]:
+        for row, address in pairs:
+            # The parent asks every shard to stop, e.g. once too many requests have failed
+            if stop is not None and stop.is_set():
+                return
+            pending_rows.append(row)
+            yield address
+
+    # Reporting the outcome of every row to the parent as soon as it is known
+    def count_row(row: GeocodeRecord) -> None:
+        with counts.get_lock():
+            counts[STATUSES.index(row.status)] += 1
+
+    rows = 0
+    results = stream_geocode_addresses(api_key, addresses(), max_workers=max_workers, deduplicate=deduplicate)
+    if counts is not None:
+        results = observe_rows(results, count_row)
+    with open(part_path, "wb") as part_file:
+        while True:
+            batch = list(islice(results, batch_size))
+            if not batch:
+                break
+            pickle.dump([(pending_rows.popleft(), row) for row in batch], part_file, protocol=pickle.HIGHEST_PROTOCOL)
+            rows += len(batch)
+    return {"rows": rows, **get_client(api_key).stats()}
+
+# Function to read back the rows of a part file.
+def _read_part(part_path: str) -> Iterator[Tuple[int, GeocodeRecord]]:
+    with open(part_path, "rb") as part_file:
+        while True:
+            try:
+                batch = pickle.load(part_file)
+            except EOFError:
+                return
+            yield from batch
+
+# Function to geocode a CSV file with several worker processes.
+def geocode_csv_file_sharded(api_key: str, input_file_path: str, output_file_path: str, shards: int = 4, shard_by: str = "range", batch_size: int = 200, max_workers: int = 8, chunksize: int = 10000, deduplicate: bool = False, output_format: str = None, rate_limit: Optional[float] = None, burst: Optional[float] = None, client_options: Optional[Dict] = None, on_row: Optional[Callable[[GeocodeRecord], None]] = None, on_counts: Optional[Callable[[Dict[str, int]], None]] = None) -> int:
+    """
+    Splits the rows of an input CSV file into shards geocoded by separate worker processes.
+
+    Each worker has its own client, connection pool and max_workers requests in
+    flight, and parses its responses into records itself, so JSON decoding
+    and building the output are not bound to a single process. Range shards
+    are equal blocks of consecutive rows: the parent finds their byte offsets
+    in one scan of the raw file, and each worker parses only its own block.
+    Hash shards group equivalent addresses, so deduplicate covers the whole
+    file, but every worker parses the whole file to find its rows. Workers write part files
+    next to the output. These are then merged by row number into one output
+    file in input order, and deleted.
+
+    All workers draw from one SharedTokenBucket, so the whole job stays within
+    rate_limit requests per second, and a 429 received by one worker holds
+    back all of them. Workers are spawned and get their client options from
+    client_options, which must be picklable. A persistent cache still comes
+    from the LIGHTBOX_CACHE_PATH environment variable. Resuming is not
+    supported.
+
+    While the shards run, workers count the outcome of every row in shared
+    counters, which on_counts receives as they grow. When
+    on_counts raises, e.g. because too many requests failed, every worker
+    stops taking new rows, and the error propagates once the requests in
+    flight are done, without a merge.
+
+    Args:
+        api_key (str): API key for the geocoding service.
+        input_file_path (str): Path of the input CSV file.
+        output_file_path (str): Path of the output file, or '-' for standard output.
+        shards (int): Number of worker processes.
+        shard_by (str): 'range' or 'hash'.
+        batch_size (int): Number of rows buffered before each write.
+        max_workers (int): Maximum number of geocode requests in flight at once, per worker process.
+        chunksize (int): Number of rows read from the input file at a time.
+        deduplicate (bool): Geocode equivalent addresses only once (see normalize_address).
+        output_format (str): 'csv', 'parquet' or 'arrow'; inferred from the output file extension by default.
+        rate_limit (float): Optional maximum number of requests per second, across all worker processes.
+        burst (float): Optional burst size of the shared rate limiter.
+        client_options (dict): Other LightBoxClient options of the workers' clients (e.g., timeout=30).
+        on_row (Callable): Optional function called with every output row during the merge, before it is written.
+        on_counts (Callable): Optional function called about every SHARD_PROGRESS_INTERVAL seconds while
+                              the shards run, with the number of rows of each status completed since its
+                              previous call, e.g. {'match': 180, 'no_match': 15, 'failed': 5}.
+
+    Returns:
+        int: The total number of rows in the output file.
+    """
+    if shard_by not in SHARD_BY:
+        raise ValueError(f"shard_by must be one of {SHARD_BY}, got '{shard_by}'")
+    if output_format is None:
+        output_format = OUTPUT_FORMATS.get(os.path.splitext(output_file_path)[1].lower(), "csv")
+
+    if shard_by == "range":
+        bounds = split_csv_rows(input_file_path, shards)
+    else:
+        bounds = [(0, None)] * shards
+
+    # Spawned rather than forked, so workers never inherit the parent's connections or locks
+    context = multiprocessing.get_context("spawn")
+    rate_limiter = SharedTokenBucket(rate_limit, burst, context=context) if rate_limit else None
+    options = {"pool_maxsize": max_workers, **(client_options or {})}
+    counts, stop = context.Array("q", len(STATUSES)), context.Event()
+
+    # Part files go next to the output file, or in the temporary directory when writing to standard output
+    part_dir = tempfile.mkdtemp(prefix=os.path.basename(output_file_path) + ".shards-",
+                                dir=os.path.dirname(os.path.abspath(output_file_path)) if output_file_path != "-" else None)
+    part_paths = [os.path.join(part_dir, f"{shard}.part") for shard in range(shards)]
+    try:
+        with ProcessPoolExecutor(max_workers=shards, mp_context=context, initializer=_init_shard_worker,
+                                 initargs=(rate_limiter, options, (counts, stop))) as executor:
+            futures = {
+                executor.submit(geocode_shard, api_key, input_file_path, part_paths[shard], shard, shards, shard_by,
+                                start_row, byte_range, max_workers, deduplicate, chunksize, batch_size): shard
+                for shard, (start_row, byte_range) in enumerate(bounds)
+            }
+            reported = [0] * len(STATUSES)
+            pending = set(futures)
+            try:
+                while True:
+                    done, pending = wait(pending, timeout=SHARD_PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        shard_stats = future.result()
+                        print(f"Shard {futures[future] + 1}/{shards} completed: {shard_stats['rows']} rows, "
+                              f"{shard_stats['requests']} requests, {shard_stats['retries']} retries, "
+                              f"throttled (429): {shard_stats['throttled']}", file=sys.stderr)
+                    if on_counts is not None:
+                        with counts.get_lock():
+                            current = list(counts)
+                        on_counts({status: now - before for status, now, before in zip(STATUSES, current, reported)})
+                        reported = current
+                    if not pending:
+                        break
+            except BaseException:
+                # Shards stop taking new rows instead of running to the end
+                stop.set()
+                raise
+
+        # Every part is in row order, so a k-way merge restores the input order
+        merged = heapq.merge(*(_read_part(part_path) for part_path in part_paths), key=itemgetter(0))
+        results = (row for _, row in merged)
+        if on_row is not None:
+            results = observe_rows(results, on_row)
+        if output_format != "csv":
+            return write_results_to_arrow(results, output_file_path, batch_size=batch_size, output_format=output_format)
+        return write_results_to_csv(results, output_file_path, batch_size=batch_size)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
 
 
 # Testing function for verifying the response status of the geocode_address function
@@ -134,29 +803,232 @@ def test_geocode_address_response_status(lightbox_api_key: str) -> None:
     address_search_data = geocode_address(lightbox_api_key, address)
     assert address_search_data.status_code == 404, f"Expected status code 404, but got {address_search_data.status_code}"
 
+# Testing function for verifying that equivalent spellings of an address share one deduplication key
+def test_normalize_address() -> None:
+    # Each test case lists spellings expected to share one key
+    cases = [
+        ["123 Main Street Apt 4", "123 Main St Apt 4", "123 main st. apartment 4"],
+        ["12 N Avenue Ste 200", "12 N Ave Suite 200", "12 n. ave. ste 200"],
+        ["12 North Main Avenue Suite 200", "12 N Main Ave Ste 200"],
+        ["123 Main Street #4", "123 Main St #4", "123 Main St # 4"],
+        ["807 Farson Street, Belpre OH", "807 farson st., belpre OH"],
+    ]
+    for spellings in cases:
+        keys = {normalize_address(address) for address in spellings}
+        assert len(keys) == 1, f"Expected one key for {spellings}, but got {sorted(keys)}"
+
+    # Test case for a street name that only looks like a directional
+    assert normalize_address("12 East Street") != normalize_address("12 E Street"), "Expected 'East Street' to keep its name"
+
 # ----------------------------
-# API Usage
+# Command Line Interface
 # ----------------------------
 
-lightbox_api_key = 'your_api_key'  # Replace with the actual API key
-input_file_path = input('Enter your input file name: ')  # User inputs the file name
-output_file_path = input('Enter your output file name: ')  # User inputs the output file name
+# Environment variable holding the API key when --api-key is not given
+API_KEY_ENV = "LIGHTBOX_API_KEY"
 
-# Reading and processing addresses
-print("Reading addresses from CSV file...")
-addresses = read_addresses_from_csv(input_file_path)
-print("Starting batch geocoding...")
-geocoded_data = batch_geocode_addresses(lightbox_api_key, addresses)
-print("Batch geocoding completed.")
+# Exit statuses of the command line
+EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_INTERRUPTED = 0, 1, 2, 130
 
-# Saving geocoded data to output file
-geocoded_data.to_csv(output_file_path, index=False)
-print(f"Geocoded data saved to '{output_file_path}'.")
 
-# ----------------------------
-# API Testing
-# ----------------------------
+class ErrorThresholdExceeded(Exception):
+    """
+    Raised when more geocode requests failed than the command line allows.
+    """
+
+
+class ProgressReporter:
+    """
+    Counts output rows and reports throughput, ETA and error rate on standard error.
+
+    Called with every output row (see the on_row argument of geocode_csv_file),
+    or with the row counts of the shard workers through add (see the on_counts
+    argument of geocode_csv_file_sharded), it prints one line at most every
+    interval seconds, and raises ErrorThresholdExceeded as soon as more than
+    max_errors rows have failed.
+
+    Args:
+        total_rows (int): Number of rows expected, for the percentage and ETA; None when unknown (e.g. stdin).
+        interval (float): Seconds between two progress lines; 0 disables them.
+        max_errors (int): Number of failed rows tolerated before aborting; None for no limit.
+        stream (file): Where progress lines are written.
+    """
+
+    def __init__(self, total_rows: Optional[int] = None, interval: float = 5.0, max_errors: Optional[int] = None, stream=None):
+        self.total_rows = total_rows
+        self.interval = interval
+        self.max_errors = max_errors
+        self.stream = stream or sys.stderr
+        self.counts = {MATCH: 0, NO_MATCH: 0, FAILED: 0}
+        self.rows = 0
+        self.started_at = time.monotonic()
+        self._reported_at = self.started_at
+
+    def __call__(self, row: GeocodeRecord) -> None:
+        self.add({row.status: 1})
+
+    def add(self, counts: Dict[str, int]) -> None:
+        """
+        Counts completed rows by status, e.g. {'match': 180, 'failed': 2}.
+        """
+        for status, rows in counts.items():
+            self.counts[status] += rows
+            self.rows += rows
+        if self.max_errors is not None and self.counts[FAILED] > self.max_errors:
+            raise ErrorThresholdExceeded(f"{self.counts[FAILED]} geocode requests failed, more than the {self.max_errors} allowed")
+        now = time.monotonic()
+        if self.interval and now - self._reported_at >= self.interval:
+            self._reported_at = now
+            self.report()
+
+    @property
+    def error_rate(self) -> float:
+        return self.counts[FAILED] / self.rows if self.rows else 0.0
+
+    def report(self, final: bool = False) -> None:
+        """
+        Prints one progress line.
+        """
+        seconds = time.monotonic() - self.started_at
+        rate = self.rows / seconds if seconds else 0.0
+        line = f"{'Done' if final else 'Progress'}: {self.rows:,}"
+        if self.total_rows:
+            line += f"/{self.total_rows:,} rows ({self.rows / self.total_rows:.1%})"
+        else:
+            line += " rows"
+        line += f", {rate:,.1f} rows/s"
+        if self.total_rows and rate and not final:
+            remaining = max(0, self.total_rows - self.rows) / rate
+            line += f", ETA {int(remaining // 3600):02d}:{int(remaining % 3600 // 60):02d}:{int(remaining % 60):02d}"
+        elif final:
+            line += f", {seconds:,.1f}s"
+        line += f", no match {self.counts[NO_MATCH]:,}, failed {self.counts[FAILED]:,} ({self.error_rate:.2%})"
+        print(line, file=self.stream, flush=True)
+
+
+# Function to build the parser of the command line arguments.
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Batch geocode the addresses of a CSV file ('Address', 'City', 'State' and 'Zip Code' columns) "
+                    "with the LightBox API.",
+        epilog=f"The API key is read from --api-key or the {API_KEY_ENV} environment variable. "
+               f"Exit status: {EXIT_OK} on success, {EXIT_FAILED} when a failure threshold is exceeded or the run fails, "
+               f"{EXIT_USAGE} on invalid arguments, {EXIT_INTERRUPTED} when interrupted.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input CSV file, '-' for standard input (default)")
+    parser.add_argument("output", nargs="?", default="-", help="output file (.csv, .parquet or .arrow), '-' for standard output (default)")
+    parser.add_argument("--api-key", default=os.environ.get(API_KEY_ENV), help=f"LightBox API key (default: ${API_KEY_ENV})")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"root URL of the LightBox API (default: {BASE_URL})")
+    parser.add_argument("--format", choices=sorted(set(OUTPUT_FORMATS.values())), help="output format (default: from the output file extension, CSV for standard output)")
+    parser.add_argument("--workers", type=int, default=8, help="geocode requests in flight at once, per process (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=200, help="rows per write to the output (default: 200)")
+    parser.add_argument("--chunksize", type=int, default=10000, help="rows read from the input at a time (default: 10000)")
+    parser.add_argument("--rate-limit", type=float, help="maximum requests per second (default: unlimited)")
+    parser.add_argument("--shards", type=int, default=1, help="worker processes splitting the input rows (default: 1, this process only)")
+    parser.add_argument("--shard-by", choices=SHARD_BY, default="hash", help="how rows are split between shards: range parses each row once, hash parses the whole file in every shard but geocodes equivalent addresses once across shards (default: hash)")
+    parser.add_argument("--deduplicate", action=argparse.BooleanOptionalAction, default=True, help="geocode equivalent addresses only once (default: on)")
+    parser.add_argument("--cache", metavar="PATH", help=f"persistent response cache file (default: ${CACHE_PATH_ENV}, if set)")
+    parser.add_argument("--no-cache", action="store_true", help="do not use any persistent response cache")
+    parser.add_argument("--resume", action="store_true", help="skip the input rows completed by an interrupted run (CSV output files only)")
+    parser.add_argument("--max-errors", type=int, help="abort once more than this many requests have failed")
+    parser.add_argument("--max-error-rate", type=float, help="exit with a failure status when the share of failed requests exceeds this (e.g. 0.01)")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="seconds between progress lines on standard error (default: 5)")
+    parser.add_argument("--quiet", action="store_true", help="print nothing but errors on standard error")
+    parser.add_argument("--api-tests", action="store_true", help="run the live API status tests instead of geocoding")
+    return parser
+
+
+# Function to run the command line interface.
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Geocodes a CSV file, or standard input, into an output file, or standard output.
+
+    Nothing is prompted for: everything comes from the arguments and the
+    environment, and progress and summaries go to standard error, so the
+    command runs unattended in schedulers and pipelines.
+
+    Args:
+        argv (List[str]): The arguments; sys.argv[1:] by default.
+
+    Returns:
+        int: The exit status: EXIT_OK, EXIT_FAILED (a failure threshold was exceeded) or EXIT_INTERRUPTED.
+             Invalid arguments exit with EXIT_USAGE through the parser; any other error, such as
+             an unreadable input file, propagates with its traceback, which exits with status 1.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error(f"an API key is required: pass --api-key or set {API_KEY_ENV}")
+    if args.input != "-" and not os.path.exists(args.input):
+        parser.error(f"input file '{args.input}' does not exist")
+    if args.shards > 1 and (args.input == "-" or args.resume):
+        parser.error("--shards needs an input file and does not support --resume")
+    if args.workers < 1 or args.shards < 1 or args.batch_size < 1:
+        parser.error("--workers, --shards and --batch-size must be at least 1")
+    output_format = args.format or OUTPUT_FORMATS.get(os.path.splitext(args.output)[1].lower(), "csv")
+    if args.resume and (output_format != "csv" or args.output == "-"):
+        parser.error("--resume is only supported for CSV output files")
+
+    client_options = {"base_url": args.base_url, "pool_maxsize": args.workers}
+    if args.no_cache:
+        client_options["cache"] = None
+    elif args.cache:
+        client_options["cache"] = ResponseCache(args.cache)
+    configure_clients(rate_limit=args.rate_limit, **client_options)
+
+    if args.api_tests:
+        try:
+            test_normalize_address()
+            test_geocode_address_response_status(args.api_key)
+        except AssertionError as error:
+            print(f"API tests failed: {error}", file=sys.stderr)
+            return EXIT_FAILED
+        print("API tests passed.", file=sys.stderr)
+        return EXIT_OK
+
+    total_rows = None
+    if args.input != "-" and not args.quiet:
+        total_rows = count_csv_rows(args.input)
+        if args.resume and args.output != "-":
+            total_rows -= read_journal(args.output + ".journal")[0] if os.path.exists(args.output) else 0
+    progress = ProgressReporter(total_rows, interval=0 if args.quiet else args.progress_interval,
+                                max_errors=args.max_errors)
+
+    try:
+        if args.shards > 1:
+            # Workers are spawned processes, which open the cache named by the environment themselves
+            if args.cache:
+                os.environ[CACHE_PATH_ENV] = args.cache
+            worker_options = {"base_url": args.base_url, **({"cache": None} if args.no_cache else {})}
+            geocode_csv_file_sharded(args.api_key, args.input, args.output, shards=args.shards, shard_by=args.shard_by,
+                                     batch_size=args.batch_size, max_workers=args.workers, chunksize=args.chunksize,
+                                     deduplicate=args.deduplicate, output_format=args.format, rate_limit=args.rate_limit,
+                                     client_options=worker_options, on_counts=progress.add)
+        else:
+            geocode_csv_file(args.api_key, args.input, args.output, batch_size=args.batch_size, max_workers=args.workers,
+                             chunksize=args.chunksize, resume=args.resume, deduplicate=args.deduplicate,
+                             output_format=args.format, on_row=progress)
+    except ErrorThresholdExceeded as error:
+        print(f"Aborted: {error}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        print("Interrupted." + (" Rerun with --resume to continue." if args.output != "-" and args.shards == 1 else ""), file=sys.stderr)
+        return EXIT_INTERRUPTED
+
+    if not args.quiet:
+        progress.report(final=True)
+    # Shard workers already reported their own requests
+    if not args.quiet and args.shards == 1:
+        client_stats = get_client(args.api_key).stats()
+        print(f"Requests sent: {client_stats['requests']}, retries: {client_stats['retries']}, "
+              f"throttled (429): {client_stats['throttled']}, "
+              f"delayed by rate limiter: {client_stats['rate_limited']} ({client_stats['rate_limit_wait']:.1f}s)", file=sys.stderr)
+    if args.max_error_rate is not None and progress.error_rate > args.max_error_rate:
+        print(f"Failed: {progress.error_rate:.2%} of the geocode requests failed, more than the {args.max_error_rate:.2%} allowed", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_OK
+
 
-print("Starting API tests...")
-test_geocode_address_response_status(lightbox_api_key)
-print("API tests completed.")
+# Worker processes re-import this script, so the command line only runs when it is executed directly
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import os
+import sys
+import csv
+import json
+import tempfile
+import time
+import argparse
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+# Make the shared 'lightbox' package and the sample scripts importable
+SAMPLE_SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.append(SAMPLE_SCRIPTS_DIR)
+for script_dir in ("BatchGeocodeSearch", "ParcelEnrichment", "MultidwellingAssessmentLogic"):
+    sys.path.append(os.path.join(SAMPLE_SCRIPTS_DIR, script_dir))
+from lightbox import LightBoxClient, PrefixCache, configure_clients, get_client
+
+# The scenarios run the entry points of the sample scripts themselves
+from lightbox.endpoints import autocomplete_address
+from batch_search import geocode_csv_file
+from enrich_parcels import get_parcel_profiles
+from multidwelling_assessment_logic import build_assessment_pipeline
+
+from mock_server import AUTOCOMPLETE_NUMBERS, AUTOCOMPLETE_STREETS, MockLightBoxServer
+
+# API key of the benchmark clients; the mock server accepts any key
+API_KEY = "benchmark"
+
+# ----------------------------
+# Benchmark Helpers
+# ----------------------------
+
+# Function to point the shared LightBox client at the mock server.
+def make_client(base_url: str, workers: int, **options) -> LightBoxClient:
+    """
+    Sets up the shared client the sample scripts use for API_KEY, without any persistent cache,
+    so every row reaches the mock server unless a local cache in options answers it.
+
+    Args:
+        base_url (str): Base URL of the mock server.
+        workers (int): Number of concurrent requests, used to size the connection pool.
+        **options: Other LightBoxClient options, e.g. autocomplete_cache.
+
+    Returns:
+        LightBoxClient: The shared client of API_KEY, recording its requests in client.metrics.
+    """
+    configure_clients(base_url=base_url, pool_maxsize=workers, cache=None, **options)
+    return get_client(API_KEY)
+
+# Function to estimate latency quantiles over every endpoint from a metrics snapshot.
+def latency_quantiles(snapshot: Dict, quantiles: Tuple[float, ...]) -> List[float]:
+    """
+    Merges the latency histograms of all endpoints and reads quantiles from them.
+
+    Like Histogram.quantile, each quantile is the upper bound in seconds of the
+    bucket holding it (see lightbox.metrics.DEFAULT_BUCKETS), 0.0 without requests.
+    """
+    totals: Dict[str, int] = {}
+    for endpoint in snapshot["endpoints"].values():
+        for bound, total in endpoint["latency"]["buckets"].items():
+            totals[bound] = totals.get(bound, 0) + total
+    cumulative = sorted((float(bound), total) for bound, total in totals.items())
+    count = cumulative[-1][1] if cumulative else 0
+    if not count:
+        return [0.0] * len(quantiles)
+    return [next(bound for bound, total in cumulative if total >= q * count) for q in quantiles]
+
+# Function to build distinct synthetic (Address, City, State, Zip Code) rows.
+def make_address_rows(rows: int) -> List[Tuple[str, str, str, int]]:
+    return [(f"{100 + row} Benchmark St", "Springfield", "IL", 62701 + row % 90) for row in range(rows)]
+
+# Function to build distinct synthetic addresses, formatted like the batch script formats its input rows.
+def make_addresses(rows: int) -> List[str]:
+    return [f"{street}, {city} {state} {zip_code}" for street, city, state, zip_code in make_address_rows(rows)]
+
+# Function to read the peak resident set size of the current process.
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+
+# ----------------------------
+# Benchmark Scenarios
+# ----------------------------
+
+# Scenario: geocode a CSV file into a CSV file with the batch script, reading, deduplicating and writing included.
+def run_batch_geocode(client: LightBoxClient, rows: int, workers: int) -> int:
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path, output_path = os.path.join(work_dir, "input.csv"), os.path.join(work_dir, "output.csv")
+        with open(input_path, "w", newline="") as input_file:
+            writer = csv.writer(input_file)
+            writer.writerow(["Address", "City", "State", "Zip Code"])
+            writer.writerows(make_address_rows(rows))
+        return geocode_csv_file(client.lightbox_api_key, input_path, output_path, max_workers=workers, deduplicate=True)
+
+# Scenario: fetch every parcel dataset of a batch of LightBox IDs and merge them into one record per parcel.
+def run_enrichment(client: LightBoxClient, rows: int, workers: int) -> int:
+    ids = (f"MOCK{row:016d}" for row in range(rows))
+    return sum(1 for _ in get_parcel_profiles(client.lightbox_api_key, ids, max_workers=workers))
+
+# Scenario: type addresses keystroke by keystroke into the autocomplete endpoint, through a prefix cache.
+def run_autocomplete(client: LightBoxClient, rows: int, workers: int) -> int:
+    def type_address(row: int) -> bool:
+        label = f"{AUTOCOMPLETE_NUMBERS[row * 7 % len(AUTOCOMPLETE_NUMBERS)]} {AUTOCOMPLETE_STREETS[row % len(AUTOCOMPLETE_STREETS)]} St"
+        # Every keystroke asks for the suggestions of the text typed so far
+        return all(autocomplete_address(client.lightbox_api_key, label[:length], "US").status_code == 200
+                   for length in range(1, len(label) + 1))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(type_address, range(rows)))
+
+# Scenario: run the geocode -> parcel -> assessment pipeline of the multidwelling script.
+def run_multidwelling(client: LightBoxClient, rows: int, workers: int) -> int:
+    stage_workers = max(1, workers // 3)
+    pipeline = build_assessment_pipeline(client.lightbox_api_key, "US", workers=(stage_workers,) * 3)
+    return sum(1 for item in pipeline.run(make_addresses(rows)) if item.error is None)
+
+SCENARIOS: Dict[str, Callable[[LightBoxClient, int, int], int]] = {
+    "batch_geocode": run_batch_geocode,
+    "enrichment": run_enrichment,
+    "multidwelling": run_multidwelling,
+    "autocomplete": run_autocomplete,
+}
+
+# Local caches of the client per scenario, built in the scenario's process
+SCENARIO_CLIENT_OPTIONS: Dict[str, Callable[[], Dict]] = {
+    "autocomplete": lambda: {"autocomplete_cache": PrefixCache()},
+}
+
+# Function to run one scenario and measure it; runs in its own process so peak RSS is per scenario.
+def run_scenario(name: str, base_url: str, rows: int, workers: int) -> Dict:
+    """
+    Runs one scenario against the mock server.
+
+    Args:
+        name (str): Name of the scenario, a key of SCENARIOS.
+        base_url (str): Base URL of the mock server.
+        rows (int): Number of input rows.
+        workers (int): Number of concurrent requests.
+
+    Every figure but the timings and peak RSS comes from the client's own metrics
+    (client.metrics), so the benchmark also exercises that instrumentation.
+
+    Returns:
+        dict: scenario, rows completed, seconds, rows_per_sec, requests sent, p50/p95/p99 request
+              latency in milliseconds (histogram bucket bounds), retries, throttled (429 responses),
+              local_hits (requests answered by a local cache) and peak_rss_mb.
+    """
+    options = SCENARIO_CLIENT_OPTIONS.get(name, dict)()
+    with make_client(base_url, workers, **options) as client:
+        started_at = time.perf_counter()
+        completed = SCENARIOS[name](client, rows, workers)
+        seconds = time.perf_counter() - started_at
+        snapshot = client.metrics.snapshot()
+    configure_clients()
+
+    endpoints = snapshot["endpoints"].values()
+    p50, p95, p99 = latency_quantiles(snapshot, (0.50, 0.95, 0.99))
+    return {
+        "scenario": name,
+        "rows": completed,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(completed / seconds, 1) if seconds else 0.0,
+        "requests": sum(endpoint["requests"] for endpoint in endpoints),
+        "p50_ms": round(p50 * 1000, 1),
+        "p95_ms": round(p95 * 1000, 1),
+        "p99_ms": round(p99 * 1000, 1),
+        "retries": sum(endpoint["retries"] for endpoint in endpoints),
+        "throttled": sum(endpoint["responses"].get("429", 0) for endpoint in endpoints),
+        "local_hits": sum(tier["hit"] for endpoint in endpoints for tier in endpoint["cache"].values()),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+# Function to print the results as a table.
+def print_results(results: List[Dict]) -> None:
+    columns = list(results[0])
+    widths = {column: max(len(column), *(len(str(result[column])) for result in results)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for result in results:
+        print("  ".join(str(result[column]).rjust(widths[column]) for column in columns))
+
+# ----------------------------
+# Benchmark Usage
+# ----------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the LightBox client against a local mock server.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS), help="Scenarios to run.")
+    parser.add_argument("--rows", type=int, default=2000, help="Input rows per scenario.")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Median latency of the mock server.")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the log-normal latency distribution.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with a 429.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the mock server's random draws.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table.")
+    args = parser.parse_args()
+
+    server = MockLightBoxServer(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    results = []
+    with server:
+        for name in args.scenarios:
+            # A fresh process per scenario, so its peak RSS is not inflated by the previous ones
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results.append(executor.submit(run_scenario, name, server.base_url, args.rows, args.workers).result())
+
+    if args.json:
+        print(json.dumps({"results": results, "server": server.stats()}, indent=4))
+    else:
+        print_results(results)
@@ -0,0 +1,343 @@
+import bisect
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# ----------------------------
+# Mock Server Configuration
+# ----------------------------
+
+# Routes of the LightBox API used by the sample scripts, matched against the path after /v1
+ROUTES = [
+    ("geocode", re.compile(r"^/addresses/search$")),
+    ("autocomplete", re.compile(r"^/addresses/_autocomplete$")),
+    ("reverse", re.compile(r"^/addresses/reverse$")),
+    ("parcel_geometry", re.compile(r"^/parcels/(?P<country_code>\w+)/geometry$")),
+    ("adjacent", re.compile(r"^/parcels/_adjacent/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("parcel", re.compile(r"^/parcels/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("assessments", re.compile(r"^/assessments/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("zoning", re.compile(r"^/zoning/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("nfhls", re.compile(r"^/nfhls/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("wetlands", re.compile(r"^/wetlands/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("riskindexes", re.compile(r"^/riskindexes/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+    ("demographics", re.compile(r"^/demographics/_on/parcel/(?P<country_code>\w+)/(?P<id>[^/]+)$")),
+]
+
+# Number of vertices of the synthetic parcel polygons; raise it to make parcel responses heavier
+DEFAULT_POLYGON_VERTICES = 32
+
+# Width and height in degrees of the synthetic parcels (about 50 m x 45 m)
+PARCEL_SIZE = (0.0006, 0.0004)
+
+# Streets and house numbers of the synthetic addresses suggested by the autocomplete endpoint
+AUTOCOMPLETE_STREETS = ("Cedar", "Elm", "Hill", "Lake", "Main", "Maple", "Oak", "Park", "Pine", "View")
+AUTOCOMPLETE_NUMBERS = range(1, 2001)
+
+# Maximum number of suggestions returned by the autocomplete endpoint
+AUTOCOMPLETE_PAGE_SIZE = 10
+
+
+# ----------------------------
+# Synthetic Responses
+# ----------------------------
+
+# Function to derive a stable number in [0, 1) from a string.
+def _unit(text: str) -> float:
+    return zlib.crc32(text.encode()) / 2 ** 32
+
+
+# Function to derive a stable LightBox-like ID from a string.
+def _lightbox_id(text: str) -> str:
+    return f"{zlib.crc32(text.encode()):08X}{zlib.adler32(text.encode()):08X}"
+
+
+# Function to derive a stable point in the continental United States from a string.
+def _point(text: str) -> Tuple[float, float]:
+    return -122 + 50 * _unit("lon:" + text), 26 + 22 * _unit("lat:" + text)
+
+
+# Function to build a synthetic address record.
+def _address(label: str, longitude: float, latitude: float) -> Dict:
+    return {
+        "id": _lightbox_id("address:" + label),
+        "label": label,
+        "location": {
+            "representativePoint": {
+                "longitude": longitude,
+                "latitude": latitude,
+                "geometry": {"wkt": f"POINT({longitude} {latitude})"},
+            }
+        },
+        "parcels": [{"id": _lightbox_id(f"parcel:{longitude:.5f},{latitude:.5f}")}],
+        "$metadata": {"geocode": {"confidence": {"score": 80 + int(20 * _unit(label))}, "precisionCode": "A"}},
+    }
+
+
+# Function to build a synthetic parcel record.
+def _parcel(id: str, vertices: int, center: Optional[Tuple[float, float]] = None) -> Dict:
+    longitude, latitude = center or _point(id)
+    # Vertices spread along the outline of a PARCEL_SIZE rectangle, so that parcels built on the tile grid tessellate
+    width, height = PARCEL_SIZE
+    perimeter = 2 * (width + height)
+    ring = []
+    for i in range(vertices):
+        distance = perimeter * i / vertices
+        if distance < width:
+            x, y = distance, 0.0
+        elif distance < width + height:
+            x, y = width, distance - width
+        elif distance < 2 * width + height:
+            x, y = 2 * width + height - distance, height
+        else:
+            x, y = 0.0, perimeter - distance
+        ring.append((longitude - width / 2 + x, latitude - height / 2 + y))
+    ring.append(ring[0])
+    return {
+        "id": id,
+        "location": {"representativePoint": {"longitude": longitude, "latitude": latitude}},
+        "geometry": {"wkt": "POLYGON((" + ", ".join(f"{x:.7f} {y:.7f}" for x, y in ring) + "))"},
+        "landUse": {"normalized": {"categoryDescription": "RESIDENTIAL"}},
+    }
+
+
+# Synthetic addresses of the autocomplete endpoint, sorted by their case-folded label
+_AUTOCOMPLETE_LABELS = sorted((f"{number} {street} St" for number in AUTOCOMPLETE_NUMBERS for street in AUTOCOMPLETE_STREETS), key=str.casefold)
+_AUTOCOMPLETE_KEYS = [label.casefold() for label in _AUTOCOMPLETE_LABELS]
+
+
+# Function to find the synthetic addresses starting with a typed prefix, as many as the endpoint returns at most.
+def _suggestions(text: str) -> list:
+    # Normalized like lightbox.prefix_cache.normalize_prefix, so shorter prefixes always hold the longer ones' suggestions
+    prefix = re.sub(r"\s+", " ", text).strip().casefold()
+    start = bisect.bisect_left(_AUTOCOMPLETE_KEYS, prefix)
+    labels = []
+    for key, label in zip(_AUTOCOMPLETE_KEYS[start:start + AUTOCOMPLETE_PAGE_SIZE], _AUTOCOMPLETE_LABELS[start:]):
+        if not key.startswith(prefix):
+            break
+        labels.append(label)
+    return labels
+
+
+# Function to build the synthetic parcel under a WKT point: parcels tile the plane in PARCEL_SIZE rectangles.
+def _parcel_at(wkt: str, vertices: int) -> Dict:
+    match = re.match(r"^\s*POINT\s*\(\s*(\S+)\s+(\S+)\s*\)\s*$", wkt, re.IGNORECASE)
+    if match is None:
+        return _parcel(_lightbox_id("parcel:" + wkt), vertices)
+    width, height = PARCEL_SIZE
+    column, row = math.floor(float(match.group(1)) / width), math.floor(float(match.group(2)) / height)
+    return _parcel(_lightbox_id(f"parcel:{column},{row}"), vertices, ((column + 0.5) * width, (row + 0.5) * height))
+
+
+# Function to build the synthetic body of one request.
+def build_body(endpoint: str, match: Dict[str, str], query: Dict[str, str], vertices: int) -> Dict:
+    """
+    Builds a deterministic response body shaped like the LightBox API's for an endpoint.
+
+    Args:
+        endpoint (str): Short name of the endpoint (a name of ROUTES).
+        match (dict): The groups matched in the path (country_code, id).
+        query (dict): The query string parameters.
+        vertices (int): Number of vertices of the parcel polygons.
+
+    Returns:
+        dict: The JSON body.
+    """
+    if endpoint == "geocode":
+        text = query.get("text", "")
+        return {"addresses": [_address(text, *_point(text))] if text.strip() else []}
+    if endpoint == "autocomplete":
+        return {"addresses": [_address(label, *_point(label)) for label in _suggestions(query.get("text", ""))]}
+    if endpoint == "reverse":
+        longitude, latitude = _point(query.get("wkt", ""))
+        limit = int(query.get("limit", 10))
+        return {"addresses": [
+            _address(f"{i + 1} Mock Ave", longitude + 0.0001 * i, latitude) for i in range(min(limit, 5))
+        ]}
+    if endpoint == "parcel_geometry":
+        return {"parcels": [_parcel_at(query.get("wkt", ""), vertices)]}
+    if endpoint == "parcel":
+        return {"parcels": [_parcel(match["id"], vertices)]}
+    if endpoint == "adjacent":
+        return {"parcels": [_parcel(_lightbox_id(f"{match['id']}:{i}"), vertices) for i in range(2)]}
+    if endpoint == "assessments":
+        return {"assessments": [{
+            "id": _lightbox_id("assessment:" + match["id"]),
+            "apn": str(zlib.crc32(match["id"].encode())),
+            "parcel": {"id": match["id"]},
+            "primaryStructure": {"units": 1 + int(40 * _unit(match["id"])), "yearBuilt": 1950 + int(70 * _unit(match["id"]))},
+            "avm": float(100000 + int(900000 * _unit("avm:" + match["id"]))),
+        }]}
+    # Parcel datasets: zoning, nfhls, wetlands, riskindexes, demographics
+    return {endpoint: [{"id": _lightbox_id(f"{endpoint}:{match['id']}"), "parcelId": match["id"]}]}
+
+
+# ----------------------------
+# Mock Server Definition
+# ----------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY, delayed ACKs add ~40 ms per keep-alive request
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.mock.handle(self)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockLightBoxServer:
+    """
+    Local stand-in for the LightBox API, for benchmarks and tests that must not use real quota.
+
+    Serves the endpoints used by the sample scripts under http://127.0.0.1:<port>/v1
+    with deterministic synthetic bodies. Each request waits for a latency drawn
+    from a log-normal distribution, then fails with a 500 with probability
+    error_rate, or with a 429 (and a Retry-After header) with probability
+    throttle_rate. Requests without an x-api-key header get a 401.
+
+    Args:
+        latency_ms (float): Median latency in milliseconds.
+        latency_sigma (float): Spread of the log-normal latency distribution; 0 makes every latency the median.
+        latencies (dict): Median latency in milliseconds per endpoint name, overriding latency_ms.
+        error_rate (float): Share of requests answered with a 500.
+        throttle_rate (float): Share of requests answered with a 429.
+        retry_after (float): Seconds sent in the Retry-After header of the 429 responses.
+        polygon_vertices (int): Number of vertices of the synthetic parcel polygons.
+        seed (int): Seed of the random draws, for reproducible runs.
+        port (int): Port to listen on; a free port by default.
+    """
+
+    def __init__(
+            self,
+            latency_ms: float = 20.0,
+            latency_sigma: float = 0.5,
+            latencies: Optional[Dict[str, float]] = None,
+            error_rate: float = 0.0,
+            throttle_rate: float = 0.0,
+            retry_after: float = 0.1,
+            polygon_vertices: int = DEFAULT_POLYGON_VERTICES,
+            seed: Optional[int] = None,
+            port: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.latencies = dict(latencies or {})
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.polygon_vertices = polygon_vertices
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[int, int]] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        Root URL to pass as the base_url of a LightBoxClient.
+        """
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> str:
+        """
+        Starts serving in a background thread.
+
+        Returns:
+            str: The base URL of the mock API.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the listening socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw(self, endpoint: str) -> Tuple[float, float]:
+        """
+        Draws the latency in seconds and the outcome of one request.
+        """
+        median = self.latencies.get(endpoint, self.latency_ms)
+        with self._lock:
+            latency = self._random.lognormvariate(math.log(median), self.latency_sigma) if median > 0 else 0.0
+            outcome = self._random.random()
+        return latency / 1000, outcome
+
+    def _count(self, endpoint: str, status_code: int) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, {})
+            counts[status_code] = counts.get(status_code, 0) + 1
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        """
+        Answers one request.
+        """
+        url = urlsplit(request.path)
+        path = url.path[len("/v1"):] if url.path.startswith("/v1/") else url.path
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        endpoint, match = None, None
+        for name, pattern in ROUTES:
+            match = pattern.match(path)
+            if match:
+                endpoint = name
+                break
+
+        headers = {}
+        latency, outcome = self._draw(endpoint or "unknown")
+        time.sleep(latency)
+        if endpoint is None:
+            status_code, body = 404, {"error": {"code": 404, "message": f"Unknown path {path}"}}
+        elif not request.headers.get("x-api-key"):
+            status_code, body = 401, {"error": {"code": 401, "message": "Missing API key"}}
+        elif outcome < self.throttle_rate:
+            status_code, body = 429, {"error": {"code": 429, "message": "Too Many Requests"}}
+            headers["Retry-After"] = f"{self.retry_after:g}"
+        elif outcome < self.throttle_rate + self.error_rate:
+            status_code, body = 500, {"error": {"code": 500, "message": "Internal Server Error"}}
+        else:
+            status_code, body = 200, build_body(endpoint, match.groupdict(), query, self.polygon_vertices)
+
+        content = json.dumps(body).encode()
+        request.send_response(status_code)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(content)
+        self._count(endpoint or "unknown", status_code)
+
+    def stats(self) -> Dict[str, Dict[int, int]]:
+        """
+        Returns the number of requests answered, per endpoint and status code.
+
+        Returns:
+            dict: {endpoint: {status_code: count}}.
+        """
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
@@ -1,35 +1,42 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+from typing import Dict, Iterable
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import get_client
+from lightbox.endpoints import get_common_owners
+from lightbox.ownership import OwnershipGraph, crawl_ownership
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to take a LightBox ID and Country Code, and a Common Ownership flag to determine adjacent parcels with a common owner
-def get_common_owners(lightbox_api_key: str, country_code: str, id: str, common_ownership: str) -> Dict:
+# Function to find every parcel of the contiguous holdings containing the given LightBox IDs
+def get_ownership_clusters(lightbox_api_key: str, country_code: str, ids: Iterable[str], graph_path: str = ":memory:", max_workers: int = 8, max_parcels: int = None) -> Dict:
     """
-    Query for adjacent parcel(s) with a common owner using the LightBox parcel 'ID.'
-    
+    Follows common-ownership links from the given parcels, fetching each parcel at most once,
+    and groups the parcels reached into clusters of contiguous parcels with a common owner.
+
     Args:
         lightbox_api_key (str): The API key for accessing the LightBox API.
-        id (str): The LightBox ID for the specified parcel.
-        country_code (str): ISO 3166 alpha-2 country code (e.g., 'us' for the United States). 
-        common_ownership (boolean): Flag to return only parcels that have a common ownership with the target parcel ID. If false return parcels that intersect the parcel noted by the parcel LightBox ID.
+        country_code (str): ISO 3166 alpha-2 country code (e.g., 'us' for the United States).
+        ids (Iterable[str]): The LightBox IDs of the parcels to start from.
+        graph_path (str): SQLite file storing the links found, so later runs only fetch parcels never expanded before.
+        max_workers (int): Maximum number of requests in flight at once.
+        max_parcels (int): Maximum number of parcels fetched from the API; unlimited by default.
     Returns:
-        dict: The parcel information in JSON format.
+        dict: The clusters (lists of LightBox IDs, largest first), the fetched/reused counts, the frontier left
+              unexpanded because of max_parcels and the per-parcel errors.
     """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/parcels/_adjacent/{country_code}/{id}?commonOwnership='{common_ownership}'" # Concatenate endpoint with country code, id and common ownership value
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Sending request to the LightBox API
-    response = requests.get(URL, headers=headers)
-    return response
+    graph = OwnershipGraph(graph_path)
+    try:
+        # Sending requests through the shared, pooled LightBox client
+        return crawl_ownership(get_client(lightbox_api_key), ids, country_code=country_code, graph=graph,
+                               max_workers=max_workers, max_parcels=max_parcels)
+    finally:
+        graph.close()
 
 # Function to test the response status of the get_common_owners function.
 def test_response_status(lightbox_api_key: str) -> None:
@@ -69,27 +76,34 @@ def test_response_status(lightbox_api_key: str) -> None:
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = '<YOUR_API_KEY>'
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = '<YOUR_API_KEY>'
 
-# Specify the LightBoxID for the specified parcel 
-id = '0201MABNPDBU5D2EGP08YA'
+    # Specify the LightBoxID for the specified parcel 
+    id = '0201MABNPDBU5D2EGP08YA'
 
-# Specify the Country Code
-country_code = "us"
+    # Specify the Country Code
+    country_code = "us"
 
-# Pass in common_ownership=true and get only the parcels adjacent to this parcel that have common ownership.
-common_ownership = "true"
+    # Pass in common_ownership=true and get only the parcels adjacent to this parcel that have common ownership.
+    common_ownership = "true"
 
-# Get the parcel data for the specified LightBoxID
-data = get_common_owners(lightbox_api_key, country_code, id, common_ownership)
+    # Get the parcel data for the specified LightBoxID
+    data = get_common_owners(lightbox_api_key, country_code, id, common_ownership)
 
-# Print the common ownership data in a readable JSON format
-print(json.dumps(data.json(), indent=4))
+    # Print the common ownership data in a readable JSON format
+    print(json.dumps(data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
+    # Crawl the whole contiguous holding of the parcel, storing the links found next to this script
+    graph_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ownership_graph.sqlite")
+    holdings = get_ownership_clusters(lightbox_api_key, country_code, [id], graph_path=graph_path, max_parcels=500)
+    print(json.dumps(holdings, indent=4))
+
+    # ----------------------------
+    # API Testing
+    # ----------------------------
 
-# Perform tests to verify the response status of the get_common_owners function
-test_status = test_response_status(lightbox_api_key)
+    # Perform tests to verify the response status of the get_common_owners function
+    test_status = test_response_status(lightbox_api_key)
@@ -1,36 +1,15 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox.endpoints import geocode_address
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to geocode a single address using the LightBox API.
-def geocode_address(lightbox_api_key: str, address: str) -> Dict:
-    """
-    Geocodes the provided address using the LightBox API.
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        address (str): The address string for matching.
-    
-    Returns:
-        dict: The geocoded address information in JSON format.
-    """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = "/addresses/search"
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    params = {'text': address}
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Sending request to the LightBox API
-    response = requests.get(URL, params=params, headers=headers)
-    return response
-
 # Function to test the response status of the geocode_address function.
 def test_geocode_address_response_status(lightbox_api_key: str) -> None:
     """
@@ -64,21 +43,23 @@ def test_geocode_address_response_status(lightbox_api_key: str) -> None:
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = 'your_lightbox_api_key'
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = 'your_lightbox_api_key'
 
-# Specify the address to geocode
-address = '25482 Buckwood Land Forest, Ca, 92630'
+    # Specify the address to geocode
+    address = '25482 Buckwood Land Forest, Ca, 92630'
 
-# Geocode the specified address
-address_search_data = geocode_address(lightbox_api_key, address)
+    # Geocode the specified address
+    address_search_data = geocode_address(lightbox_api_key, address)
 
-# Print the geocoded address data in a readable JSON format
-print(json.dumps(address_search_data.json(), indent=4))
+    # Print the geocoded address data in a readable JSON format
+    print(json.dumps(address_search_data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
+    # ----------------------------
+    # API Testing
+    # ----------------------------
 
-# Perform tests to verify the response status of the geocode_address function
-test_status = test_geocode_address_response_status(lightbox_api_key)
+    # Perform tests to verify the response status of the geocode_address function
+    test_status = test_geocode_address_response_status(lightbox_api_key)
@@ -1,36 +1,17 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+import tempfile
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import ResponseCache, configure_clients
+from lightbox.endpoints import get_parcel
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to take a LightBox ID and Country Code as parameters and return the associated Parcel data
-def get_parcel(lightbox_api_key: str, country_code: str, id: str) -> Dict:
-    """
-    Query for a specific parcel using the LightBox parcel 'ID.'
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        id (str): The LightBox ID for the specified parcel.
-        country_code (str): ISO 3166 alpha-2 country code (e.g., 'US' for the United States). 
-    
-    Returns:
-        dict: The parcel information in JSON format.
-    """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/parcels/{country_code}/{id}" # Concatenate endpoint with country code and id
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Sending request to the LightBox API
-    response = requests.get(URL, headers=headers)
-    return response
-
 # Function to test the response status of the get_parcel function.
 def test_response_status(lightbox_api_key: str) -> None:
     """
@@ -64,28 +45,57 @@ def test_response_status(lightbox_api_key: str) -> None:
     data = get_parcel(lightbox_api_key, country_code, id)
     assert data.status_code == 404, f"Expected status code 404, but got {data.status_code}"
 
+# Function to test that cached responses are never served to another API key.
+def test_cache_isolation(lightbox_api_key: str) -> None:
+    """
+    Tests that an invalid API key still gets a 401 once a valid key has cached the same parcel.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+    """
+    id = '0201MABNPDBU5D2EGP08YA'
+    country_code = 'US'
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Sharing one persistent cache between every client, as LIGHTBOX_CACHE_PATH does
+        configure_clients(cache=ResponseCache(os.path.join(cache_dir, "responses.sqlite")))
+        try:
+            # Filling the cache with the valid key (HTTP status code 200)
+            data = get_parcel(lightbox_api_key, country_code, id)
+            assert data.status_code == 200, f"Expected status code 200, but got {data.status_code}"
+
+            # The same request with an invalid API key must reach the API (HTTP status code 401)
+            data = get_parcel("My LightBox Key", country_code, id)  # Invalid API key
+            assert data.status_code == 401, f"Expected status code 401, but got {data.status_code}"
+        finally:
+            configure_clients()
+
 # ----------------------------
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = '<YOUR_API_KEY>'
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = '<YOUR_API_KEY>'
 
-# Specify the LightBoxID
-id = '0201MABNPDBU5D2EGP08YA'
+    # Specify the LightBoxID
+    id = '0201MABNPDBU5D2EGP08YA'
 
-# Specify the Country Code
-country_code = "US"
+    # Specify the Country Code
+    country_code = "US"
 
-# Get the parcel data for the specified LightBoxID
-data = get_parcel(lightbox_api_key, country_code, id)
+    # Get the parcel data for the specified LightBoxID
+    data = get_parcel(lightbox_api_key, country_code, id)
 
-# # Print the geocoded address data in a readable JSON format
-print(json.dumps(data.json(), indent=4))
+    # # Print the geocoded address data in a readable JSON format
+    print(json.dumps(data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
+    # ----------------------------
+    # API Testing
+    # ----------------------------
+
+    # Perform tests to verify the response status of the get_parcel function
+    test_status = test_response_status(lightbox_api_key)
 
-# Perform tests to verify the response status of the get_parcel function
-test_status = test_response_status(lightbox_api_key)
+    # Verify that cached responses are not shared between API keys
+    test_cache_isolation(lightbox_api_key)
@@ -1,35 +1,15 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox.endpoints import get_wetlands
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to take a LightBox ID as a parameter and return the associated Wetlands data
-def get_wetlands(lightbox_api_key: str, id: str) -> Dict:
-    """
-    Query for wetland records related to a parcel by the LightBox parcel 'ID.'
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        id (str): The LightBox ID for the specified parcel.
-    
-    Returns:
-        dict: The parcel information in JSON format.
-    """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/wetlands/_on/parcel/us/{id}" # Concatenate endpoint with the id
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Sending request to the LightBox API
-    response = requests.get(URL, headers=headers)
-    return response
-
 # Function to test the response status of the geocode_address function.
 def test_response_status(lightbox_api_key: str) -> None:
     """
@@ -63,21 +43,23 @@ def test_response_status(lightbox_api_key: str) -> None:
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = '<YOUR_API_KEY>'
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = '<YOUR_API_KEY>'
 
-# Specify the LightBoxID
-id = '0200SD3985NHUDEC0TL67G'
+    # Specify the LightBoxID
+    id = '0200SD3985NHUDEC0TL67G'
 
-# Get the Wetlands data for the specified LightBoxID
-data = get_wetlands(lightbox_api_key, id)
+    # Get the Wetlands data for the specified LightBoxID
+    data = get_wetlands(lightbox_api_key, id)
 
-# # Print the geocoded address data in a readable JSON format
-print(json.dumps(data.json(), indent=4))
+    # # Print the geocoded address data in a readable JSON format
+    print(json.dumps(data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
+    # ----------------------------
+    # API Testing
+    # ----------------------------
 
-# Perform tests to verify the response status of the get_wetlands function
-test_status = test_response_status(lightbox_api_key)
+    # Perform tests to verify the response status of the get_wetlands function
+    test_status = test_response_status(lightbox_api_key)
@@ -1,36 +1,15 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox.endpoints import get_zoning
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to take a LightBox ID and Country Code as parameters and return the associated Zoning data
-def get_zoning(lightbox_api_key: str, country_code: str, id: str) -> Dict:
-    """
-    Query for zoning records related to a parcel by the LightBox parcel 'ID.'
-    
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        id (str): The LightBox ID for the specified parcel.
-        country_code (str): ISO 3166 alpha-2 country code (e.g., 'US' for the United States). 
-    
-    Returns:
-        dict: The parcel information in JSON format.
-    """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/zoning/_on/parcel/{country_code}/{id}" # Concatenate endpoint with the country code and id
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Sending request to the LightBox API
-    response = requests.get(URL, headers=headers)
-    return response
-
 # Function to test the response status of the get_zoning function.
 def test_response_status(lightbox_api_key: str) -> None:
     """
@@ -62,24 +41,26 @@ def test_response_status(lightbox_api_key: str) -> None:
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = '<YOUR_API_KEY>'
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = '<YOUR_API_KEY>'
 
-# Specify the LightBoxID
-id = '0200EYAN6C9OGWBUD0IIIO'
+    # Specify the LightBoxID
+    id = '0200EYAN6C9OGWBUD0IIIO'
 
-# Specify the Country Code
-country_code = "US"
+    # Specify the Country Code
+    country_code = "US"
 
-# Get the zoning data for the specified LightBoxID
-data = get_zoning(lightbox_api_key, country_code, id)
+    # Get the zoning data for the specified LightBoxID
+    data = get_zoning(lightbox_api_key, country_code, id)
 
-# # Print the geocoded address data in a readable JSON format
-print(json.dumps(data.json(), indent=4))
+    # # Print the geocoded address data in a readable JSON format
+    print(json.dumps(data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
+    # ----------------------------
+    # API Testing
+    # ----------------------------
 
-# Perform tests to verify the response status of the get_zoning function
-test_status = test_response_status(lightbox_api_key)
+    # Perform tests to verify the response status of the get_zoning function
+    test_status = test_response_status(lightbox_api_key)
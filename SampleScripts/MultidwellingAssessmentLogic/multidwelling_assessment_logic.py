@@ -1,89 +1,108 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+from functools import partial
+from typing import Dict, Tuple
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import ParcelGeometryCache, configure_clients, get_client
+from lightbox.endpoints import geocode_address, get_assessment_data_from_lbx_parcel_id, get_parcel_data_from_address_coordinates
+from lightbox.pipeline import StagedPipeline
 
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
 
-# Function to geocode a single address using the LightBox API.
-def geocode_address(lightbox_api_key: str, address: str) -> Dict:
+# Pipeline stage: geocode an address and keep its representative point.
+def geocode_step(lightbox_api_key: str, address: str) -> Dict:
     """
-    Geocodes the provided address using the LightBox API.
-    
+    Geocodes an address and returns the record passed on to the parcel stage.
+
     Args:
         lightbox_api_key (str): The API key for accessing the LightBox API.
         address (str): The address string for matching.
-    
+
     Returns:
-        dict: The geocoded address information in JSON format.
+        dict: The address, its geocoded data and the WKT of its representative point.
     """
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = "/addresses/search"
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    params = {"text": address}
-    headers = {"x-api-key": lightbox_api_key}
-
-    # Sending request to the LightBox API
-    geocoder_data = requests.get(URL, params=params, headers=headers)
-    
-    # Returning the geocoded address information
-    return geocoder_data
-
-
-# Test for the get_parcel_from_lbx_address_id() function
-def get_parcel_data_from_address_coordinates(lightbox_api_key: str, country_code: str, address_wkt_coordinates: str) -> Dict:
+    response = geocode_address(lightbox_api_key, address)
+    if response.status_code != 200:
+        raise ValueError(f"Geocoding failed, Status Code: {response.status_code}")
+    address_search_data = response.json()
+    if not address_search_data["addresses"]:
+        raise ValueError("No geocode match")
+    wkt = address_search_data["addresses"][0]["location"]["representativePoint"]["geometry"]["wkt"]
+    return {"address": address, "address_search_data": address_search_data, "wkt": wkt}
+
+
+# Pipeline stage: find the parcel under a geocoded address.
+def parcel_step(lightbox_api_key: str, country_code: str, record: Dict) -> Dict:
     """
-    Returns a dictionary containing the parcel data for the specified address.
+    Adds the parcel data of a geocoded address to its record.
 
     Args:
         lightbox_api_key (str): The API key for accessing the LightBox API.
         country_code (str): The country code for the address.
-        address_wkt_coordinates (str): The address coordinates for the address.
-    """
-
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/parcels/{country_code}/geometry"
-    URL = BASE_URL + ENDPOINT
-
-    # Setting up request parameters and headers
-    params = {"wkt": address_wkt_coordinates}
-    headers = {"x-api-key": lightbox_api_key}
+        record (dict): The record returned by geocode_step.
 
-    # Make the request
-    parcel_data = requests.get(URL, params=params, headers=headers)
-    
-    # Return the parcel data
-    return parcel_data
+    Returns:
+        dict: The record with the parcel data and the LightBox parcel ID.
+    """
+    response = get_parcel_data_from_address_coordinates(lightbox_api_key, country_code, record["wkt"])
+    if response.status_code != 200:
+        raise ValueError(f"Parcel lookup failed, Status Code: {response.status_code}")
+    record["parcel_data"] = response.json()
+    if not record["parcel_data"]["parcels"]:
+        raise ValueError("No parcel at the geocoded point")
+    record["parcel_id"] = record["parcel_data"]["parcels"][0]["id"]
+    return record
+
+
+# Pipeline stage: fetch the assessment of a parcel.
+def assessment_step(lightbox_api_key: str, record: Dict) -> Dict:
+    """
+    Adds the assessment data of a parcel to its record.
 
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        record (dict): The record returned by parcel_step.
 
-def get_assessment_data_from_lbx_parcel_id(lightbox_api_key: str, parcel_id: str) -> Dict:
+    Returns:
+        dict: The record with the assessment data.
     """
-    Returns a dictionary containing the assessment data for the specified parcel.
+    response = get_assessment_data_from_lbx_parcel_id(lightbox_api_key, record["parcel_id"])
+    if response.status_code != 200:
+        raise ValueError(f"Assessment lookup failed, Status Code: {response.status_code}")
+    record["assessment_data"] = response.json()
+    return record
 
-    Args:
-        lightbox_api_key (str): The LightBox API key.
-        parcel_id (str): The parcel ID.
+
+# Function to build the geocode -> parcel -> assessment pipeline.
+def build_assessment_pipeline(lightbox_api_key: str, country_code: str, workers: Tuple[int, int, int] = (4, 4, 4), queue_size: int = 100) -> StagedPipeline:
     """
+    Builds a pipeline running the geocode, parcel and assessment lookups as three worker pools.
 
-    # API endpoint configuration
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = f"/assessments/_on/parcel/us/{parcel_id}"
-    URL = BASE_URL + ENDPOINT
+    Geocoding of the next addresses overlaps the parcel and assessment lookups
+    of the previous ones. Run it with pipeline.run(addresses) and read per-stage
+    throughput and queue depth with pipeline.stats().
 
-    # Setting up request parameters and headers
-    headers = {"x-api-key": lightbox_api_key}
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        country_code (str): The country code for the addresses.
+        workers (Tuple[int, int, int]): Number of workers of the geocode, parcel and assessment stages.
+        queue_size (int): Capacity of the queue in front of each stage.
 
-    # Make the request
-    assessment_data = requests.get(URL, headers=headers)
-    
-    # Return the assessment data
-    return assessment_data
+    Returns:
+        StagedPipeline: The pipeline; each finished item's value is the record returned by assessment_step.
+    """
+    geocode_workers, parcel_workers, assessment_workers = workers
+    return StagedPipeline([
+        ("geocode", partial(geocode_step, lightbox_api_key), geocode_workers),
+        ("parcel", partial(parcel_step, lightbox_api_key, country_code), parcel_workers),
+        ("assessment", partial(assessment_step, lightbox_api_key), assessment_workers),
+    ], queue_size=queue_size)
 
 
 # Function to test the response status of the geocode_address function.
@@ -176,41 +195,55 @@ def test_get_assessment_data_from_lbx_parcel_id(lightbox_api_key):
 # API Usage
 # ----------------------------
 
-# Assign your LightBox API key
-lightbox_api_key = ""
-
-# Specify the address to geocode
-address = "24299 Paseo De Valencia, Laguna Woods, CA 92637"
-country_code = "us" # 'us' for the United States
-
-# Geocode the specified address
-address_search_data = geocode_address(lightbox_api_key, address)
-
-# Get the parcel data from the geocoded address
-parcel_data = get_parcel_data_from_address_coordinates(lightbox_api_key, country_code, address_search_data.json()["addresses"][0]["location"]["representativePoint"]["geometry"]["wkt"])
-
-# Get the assessment data from the parcel ID
-assessment_data = get_assessment_data_from_lbx_parcel_id(lightbox_api_key, parcel_data.json()["parcels"][0]["id"])
-
-
-# --------------------
-# Print collected data
-# --------------------
-
-# Print the geocoded address data in a readable JSON format
-print(json.dumps(address_search_data.json(), indent=4))
-# Print the parcel data in a readable JSON format
-print(json.dumps(parcel_data.json(), indent=4))
-# Print the assessment data in a readable JSON format
-print(json.dumps(assessment_data.json(), indent=4))
-
-
-# ----------------------------
-# API Testing
-# ----------------------------
-
-# Perform tests to verify the response status of the geocode_address function
-test_geocode_address_response_status(lightbox_api_key)
-test_get_parcel_data_from_address_coordinates(lightbox_api_key)
-test_get_assessment_data_from_lbx_parcel_id(lightbox_api_key)
-
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = ""
+
+    # Specify the address to geocode
+    address = "24299 Paseo De Valencia, Laguna Woods, CA 92637"
+    country_code = "us" # 'us' for the United States
+
+    # Specify further addresses to run through the pipeline, e.g. the units of a multidwelling property
+    addresses = [address]
+
+    # Resolving points inside parcels already fetched (e.g. the other units of the property) without an API call
+    configure_clients(parcel_cache=ParcelGeometryCache())
+
+    # Geocode each address, get the parcel data from its point, then the assessment data from the parcel ID
+    pipeline = build_assessment_pipeline(lightbox_api_key, country_code)
+    for item in pipeline.run(addresses):
+        if item.error:
+            print(f"'{item.input}' failed at the {item.failed_stage} stage: {item.error}")
+            continue
+
+        # --------------------
+        # Print collected data
+        # --------------------
+
+        # Print the geocoded address data in a readable JSON format
+        print(json.dumps(item.value["address_search_data"], indent=4))
+        # Print the parcel data in a readable JSON format
+        print(json.dumps(item.value["parcel_data"], indent=4))
+        # Print the assessment data in a readable JSON format
+        print(json.dumps(item.value["assessment_data"], indent=4))
+
+    # Print the throughput and queue depth of each stage
+    for stage in pipeline.stats():
+        print(f"{stage['name']}: {stage['processed']} processed, {stage['errors']} failed, "
+              f"{stage['throughput']:.1f}/s, max queue depth {stage['max_queue_depth']}")
+
+    # Print the share of parcel lookups resolved from the local parcel geometry cache
+    parcel_cache_stats = get_client(lightbox_api_key).parcel_cache.stats()
+    print(f"Parcel lookups resolved locally: {parcel_cache_stats['hits']} of "
+          f"{parcel_cache_stats['hits'] + parcel_cache_stats['misses']} ({parcel_cache_stats['hit_rate']:.0%})")
+
+
+    # ----------------------------
+    # API Testing
+    # ----------------------------
+
+    # Perform tests to verify the response status of the geocode_address function
+    test_geocode_address_response_status(lightbox_api_key)
+    test_get_parcel_data_from_address_coordinates(lightbox_api_key)
+    test_get_assessment_data_from_lbx_parcel_id(lightbox_api_key)
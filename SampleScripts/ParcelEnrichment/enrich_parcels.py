@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+from typing import Dict, Iterable, Iterator, List
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import get_client
+from lightbox.enrichment import DATASETS, enrich_parcels
+from lightbox.records import AssessmentRecord, FloodHazardRecord, ParcelRecord, RecordColumns, WetlandRecord
+
+
+# ----------------------------
+# Function Definitions
+# ----------------------------
+
+# Function to build one wide property profile per LightBox ID from every parcel dataset.
+def get_parcel_profiles(lightbox_api_key: str, ids: Iterable[str], datasets: List[str] = None, max_workers: int = 16) -> Iterator[Dict]:
+    """
+    Fetches the parcel, zoning, flood hazard, wetlands, risk index, demographic and
+    assessment data of each parcel concurrently, and merges them into one record.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        ids (Iterable[str]): The LightBox IDs of the parcels.
+        datasets (List[str]): Names of the datasets to fetch; all of them by default.
+        max_workers (int): Maximum number of requests in flight at once.
+
+    Yields:
+        dict: One record per parcel, with one key per dataset and the per-dataset errors under 'errors'.
+    """
+    # Sending requests through the shared, pooled LightBox client
+    return enrich_parcels(get_client(lightbox_api_key), ids, datasets=datasets, max_workers=max_workers)
+
+# Function to collect the parcel, assessment, flood hazard and wetland data of many parcels into compact tables.
+def get_parcel_tables(lightbox_api_key: str, ids: Iterable[str], max_workers: int = 16) -> Dict[str, RecordColumns]:
+    """
+    Fetches the parcel, assessment, flood hazard and wetlands data of each parcel, and keeps
+    only their main fields in array-backed columns.
+
+    Each JSON response is turned into typed records as soon as it arrives and
+    then dropped, so memory grows by a few numbers and strings per parcel
+    rather than by whole JSON trees.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        ids (Iterable[str]): The LightBox IDs of the parcels.
+        max_workers (int): Maximum number of requests in flight at once.
+
+    Returns:
+        Dict[str, RecordColumns]: 'parcels', 'assessments', 'flood_hazards' and 'wetlands' tables;
+                                  call to_dataframe() or to_arrow() on each.
+    """
+    tables = {
+        "parcels": RecordColumns(ParcelRecord),
+        "assessments": RecordColumns(AssessmentRecord),
+        "flood_hazards": RecordColumns(FloodHazardRecord),
+        "wetlands": RecordColumns(WetlandRecord),
+    }
+    datasets = ['parcel', 'assessments', 'nfhls', 'wetlands']
+    for profile in get_parcel_profiles(lightbox_api_key, ids, datasets=datasets, max_workers=max_workers):
+        id = profile['id']
+        tables["parcels"].extend(ParcelRecord.from_json(parcel) for parcel in (profile['parcel'] or {}).get('parcels', []))
+        tables["assessments"].extend(AssessmentRecord.from_json(assessment) for assessment in (profile['assessments'] or {}).get('assessments', []))
+        tables["flood_hazards"].extend(FloodHazardRecord.from_json(id, nfhl) for nfhl in (profile['nfhls'] or {}).get('nfhls', []))
+        tables["wetlands"].extend(WetlandRecord.from_json(id, wetland) for wetland in (profile['wetlands'] or {}).get('wetlands', []))
+    return tables
+
+# Function to test the records returned by the get_parcel_profiles function.
+def test_get_parcel_profiles(lightbox_api_key: str) -> None:
+    """
+    Tests the records returned by get_parcel_profiles for valid and invalid LightBox IDs.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+    """
+
+    # Test for a parcel whose datasets are all available
+    ids = ['0200HK4FSP4RPX8VVBQ1N0', '0201MAA']
+    profiles = list(get_parcel_profiles(lightbox_api_key, ids))
+    assert [profile['id'] for profile in profiles] == ids, "Expected one record per LightBox ID, in input order"
+    assert profiles[0]['parcel'] is not None, f"Expected parcel data, but got errors {profiles[0]['errors']}"
+
+    # Test for an invalid LightBoxID (every dataset reports an error)
+    assert set(profiles[1]['errors']) == set(DATASETS), f"Expected an error for every dataset, but got {profiles[1]['errors']}"
+
+    # Test for an invalid API key (HTTP status code 401 reported for the dataset)
+    profile = next(get_parcel_profiles("My LightBox Key", ids[:1], datasets=['parcel']))
+    assert profile['errors'] == {'parcel': 'Status Code: 401'}, f"Expected status code 401, but got {profile['errors']}"
+
+# ----------------------------
+# API Usage
+# ----------------------------
+
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    # Assign your LightBox API key
+    lightbox_api_key = '<YOUR_API_KEY>'
+
+    # Specify the LightBoxIDs
+    ids = ['0200HK4FSP4RPX8VVBQ1N0', '0201MABNPDBU5D2EGP08YA']
+
+    # Get every dataset of each parcel, one merged record per LightBoxID
+    for profile in get_parcel_profiles(lightbox_api_key, ids):
+        # Print the merged parcel data in a readable JSON format
+        print(json.dumps(profile, indent=4))
+
+    # Keep only the main fields of many parcels, as one table per dataset
+    for name, table in get_parcel_tables(lightbox_api_key, ids).items():
+        print(name)
+        print(table.to_dataframe())
+
+    # ----------------------------
+    # API Testing
+    # ----------------------------
+
+    # Perform tests to verify the records returned by the get_parcel_profiles function
+    test_get_parcel_profiles(lightbox_api_key)
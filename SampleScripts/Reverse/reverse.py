@@ -1,54 +1,16 @@
-import requests
+import os
+import sys
 import json
-from typing import Dict
+
+# Make the shared 'lightbox' package in the parent folder importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from lightbox import ReverseSearchCache
+from lightbox.endpoints import reverse_address_search
 
 
 # ----------------------------
 # Function Definitions
 # ----------------------------
-def reverse_address_search(
-        lightbox_api_key: str, 
-        wkt: str, 
-        bufferDistance: float,
-        bufferUnit: str,
-        limit: int
-) -> Dict:
-    """
-    Performs a reverse address search using the LightBox API.
-
-    Args:
-        lightbox_api_key (str): The API key for accessing the LightBox API.
-        wkt (str): The geometry of the location expressed in WKT (well-known text) format.
-                   Example: POINT(-117.852723 33.63799)
-        bufferDistance (float): Buffer distance expressed in 'bufferUnits'.
-                                Default value: 0
-                                Example: 100
-        bufferUnit (str): The unit type to apply to the buffer (e.g., m=meters, km=kilometers, ft=feet, or mi=miles).
-                          Available values: m, km, ft, mi
-                          Default value: m
-                          Example: m
-        limit (int): The maximum number of entries to return. If the value exceeds the maximum, then the maximum value will be used.
-
-    Returns:
-        dict: A dictionary containing information about the addresses found, in JSON format.
-    """
-    # Prepare request parameters
-    BASE_URL = "https://api.lightboxre.com/v1"
-    ENDPOINT = "/addresses/reverse"
-    URL = BASE_URL + ENDPOINT
-    params = {
-        'wkt': wkt, 
-        'bufferDistance': bufferDistance,
-        'bufferUnit': bufferUnit,
-        'limit': limit
-    }
-    headers = {'x-api-key': lightbox_api_key}
-
-    # Send request to LightBox API
-    response = requests.get(URL, params=params, headers=headers)
-
-    return response
-
 
 def test_reverse_address_search_status(lightbox_api_key: str) -> None:
     # Test case for successful request (HTTP status code 200)
@@ -111,29 +73,55 @@ def test_reverse_address_search_status(lightbox_api_key: str) -> None:
     )
     assert address_search_data.status_code == 401, f"Expected status code 401, but got {address_search_data.status_code}"
 
+# Function to test that a result capped by the endpoint's maximum is never answered locally.
+def test_reverse_cache_capped_result() -> None:
+    """
+    Tests that the spatial reverse cache only reuses results shorter than the endpoint's maximum.
+    """
+    longitude, latitude = -117.852723, 33.63799
+    records = [
+        {"id": str(i), "location": {"representativePoint": {"longitude": longitude + 0.0001 * i, "latitude": latitude}}}
+        for i in range(5)
+    ]
+
+    # Test case for a result capped at the maximum: the area may hold more addresses (no local answer)
+    cache = ReverseSearchCache(max_limit=5)
+    cache.add(longitude, latitude, 100, 50, records)
+    assert cache.lookup(longitude, latitude, 50, 50) is None, "Expected a capped result not to be reused"
+
+    # Test case for a result shorter than both the limit and the maximum: the area is complete (local answer)
+    cache = ReverseSearchCache(max_limit=10)
+    cache.add(longitude, latitude, 100, 50, records)
+    addresses = cache.lookup(longitude, latitude, 50, 50)
+    assert addresses is not None and len(addresses) == 5, f"Expected 5 cached addresses, but got {addresses}"
+
 
 
 # ----------------------------
 # API Usage
 # ----------------------------
-lightbox_api_key = '<YOUR_API_KEY>'
-wkt = 'POINT(-117.852723 33.63799)'
-bufferDistance = 100
-bufferUnit = 'm'
-limit = 5
-
-address_search_data = reverse_address_search(
-    lightbox_api_key, 
-    wkt, 
-    bufferDistance,
-    bufferUnit,
-    limit
-)
-print(f"status_code: {address_search_data.status_code}")
-print(json.dumps(address_search_data.json(), indent=4))
 
+# Nothing below runs when the script is imported, e.g. to reuse its functions
+if __name__ == "__main__":
+    lightbox_api_key = '<YOUR_API_KEY>'
+    wkt = 'POINT(-117.852723 33.63799)'
+    bufferDistance = 100
+    bufferUnit = 'm'
+    limit = 5
+
+    address_search_data = reverse_address_search(
+        lightbox_api_key, 
+        wkt, 
+        bufferDistance,
+        bufferUnit,
+        limit
+    )
+    print(f"status_code: {address_search_data.status_code}")
+    print(json.dumps(address_search_data.json(), indent=4))
 
-# ----------------------------
-# API Testing
-# ----------------------------
-test_reverse_address_search_status(lightbox_api_key)
+
+    # ----------------------------
+    # API Testing
+    # ----------------------------
+    test_reverse_address_search_status(lightbox_api_key)
+    test_reverse_cache_capped_result()
@@ -0,0 +1,58 @@
+"""
+Shared building blocks for the LightBox API sample scripts.
+
+Importing the package is free of I/O and loads no submodule: each name
+below is imported from its submodule on first access (PEP 562), so code
+that only needs, e.g., lightbox.normalize does not pay for requests or sqlite3.
+"""
+import importlib
+
+# Submodule defining each exported name
+_EXPORTS = {
+    "BASE_URL": "client",
+    "LightBoxClient": "client",
+    "MemoryCache": "memcache",
+    "Metrics": "metrics",
+    "ParcelGeometryCache": "spatial",
+    "ResponseCache": "cache",
+    "PrefixCache": "prefix_cache",
+    "PriorityScheduler": "scheduler",
+    "ReverseSearchCache": "spatial",
+    "RetryPolicy": "ratelimit",
+    "SharedTokenBucket": "ratelimit",
+    "SingleFlight": "singleflight",
+    "TokenBucket": "ratelimit",
+    "configure_clients": "client",
+    "get_client": "client",
+    "make_cache_key": "cache",
+    "request_priority": "scheduler",
+    # Endpoint functions of the sample scripts
+    "autocomplete_address": "endpoints",
+    "geocode_address": "endpoints",
+    "get_assessment_data_from_lbx_parcel_id": "endpoints",
+    "get_common_owners": "endpoints",
+    "get_demographics": "endpoints",
+    "get_nfhls": "endpoints",
+    "get_parcel": "endpoints",
+    "get_parcel_data_from_address_coordinates": "endpoints",
+    "get_risk_indexes": "endpoints",
+    "get_wetlands": "endpoints",
+    "get_zoning": "endpoints",
+    "reverse_address_search": "endpoints",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cached in the package namespace, so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import requests
+from urllib.parse import urlencode
+from typing import Dict, Optional
+
+from .responses import build_response
+
+
+# ----------------------------
+# Cache Configuration
+# ----------------------------
+
+DAY = 24 * 60 * 60
+
+# How long a cached response stays valid, per endpoint (seconds)
+DEFAULT_TTLS = {
+    "geocode": 30 * DAY,
+    "autocomplete": 1 * DAY,
+    "reverse": 30 * DAY,
+    "parcel": 7 * DAY,
+    "parcel_geometry": 7 * DAY,
+    "adjacent": 7 * DAY,
+    "assessments": 7 * DAY,
+    "zoning": 7 * DAY,
+    "nfhls": 30 * DAY,
+    "wetlands": 30 * DAY,
+    "riskindexes": 30 * DAY,
+    "demographics": 30 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+# Total size of stored response bodies above which the least recently used entries are evicted
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Environment variables that enable the cache for every shared client
+CACHE_PATH_ENV = "LIGHTBOX_CACHE_PATH"
+CACHE_MAX_BYTES_ENV = "LIGHTBOX_CACHE_MAX_BYTES"
+
+# Number of stores between two size checks
+_EVICTION_CHECK_INTERVAL = 100
+
+# Accessed timestamps are refreshed at most this often, to keep cache hits read-only
+_TOUCH_INTERVAL = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+# Function to derive the cache namespace of an API key and base URL.
+def cache_namespace(lightbox_api_key: str, base_url: str) -> str:
+    """
+    Returns a short hash of an API key and a base URL, so each client caches apart.
+
+    The key itself is never stored: only the first 16 hex digits of a SHA-256 digest.
+
+    Args:
+        lightbox_api_key (str): The API key of the client.
+        base_url (str): Root URL of the LightBox API the client talks to.
+    """
+    digest = hashlib.sha256(f"{base_url.rstrip('/')}\n{lightbox_api_key}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+# Function to build the cache key of a request.
+def make_cache_key(endpoint: str, path: str, params: Optional[Dict] = None, namespace: str = "") -> str:
+    """
+    Builds the cache key of a request from its endpoint, path and normalized params.
+
+    Parameters are sorted and their values stripped with runs of whitespace
+    collapsed, so equivalent requests share one key. Keys start with the
+    endpoint name followed by ':', which allows invalidation by endpoint prefix,
+    and end with '#' and the namespace of the client, so that a response fetched
+    with one API key (or from one server) is never served to another.
+
+    Args:
+        endpoint (str): Short name of the endpoint (e.g., 'geocode', 'parcel').
+        path (str): Path of the endpoint relative to the base URL.
+        params (dict): Query string parameters.
+        namespace (str): Namespace of the client, built by cache_namespace.
+
+    Returns:
+        str: The cache key.
+    """
+    key = f"{endpoint}:{path}"
+    if params:
+        normalized = sorted((name, re.sub(r"\s+", " ", str(value)).strip()) for name, value in params.items())
+        key += "?" + urlencode(normalized)
+    return f"{key}#{namespace}"
+
+
+# ----------------------------
+# Cache Definition
+# ----------------------------
+
+class ResponseCache:
+    """
+    Persistent response cache stored in SQLite (WAL mode).
+
+    Several threads and worker processes can read and write the same cache
+    file at once: each thread of each process opens its own connection, and
+    SQLite serializes the writers. Only successful (HTTP 200) responses are
+    stored. Hit, miss, store and eviction counters are kept per instance.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        ttls (dict): Time to live in seconds per endpoint name, merged over DEFAULT_TTLS.
+        default_ttl (float): Time to live in seconds for endpoints missing from ttls.
+        max_bytes (int): Total body size above which least recently used entries are evicted.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            ttls: Optional[Dict[str, float]] = None,
+            default_ttl: float = DEFAULT_TTL,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            timeout: float = 30.0
+    ):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._stores_since_check = _EVICTION_CHECK_INTERVAL
+
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the calling thread, reopening it after a fork.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def ttl(self, endpoint: str) -> float:
+        """
+        Returns the time to live in seconds of an endpoint's responses.
+
+        Args:
+            endpoint (str): Short name of the endpoint.
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """
+        Returns the cached response for a key, or None when missing or expired.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+        """
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT status_code, headers, url, body, accessed_at FROM responses WHERE key = ? AND expires_at > ?",
+            (key, now)
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        status_code, headers, url, body, accessed_at = row
+        if now - accessed_at > _TOUCH_INTERVAL:
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return build_response(status_code, body, json.loads(headers), url)
+
+    def set(self, endpoint: str, key: str, response: requests.Response) -> None:
+        """
+        Stores a successful response under a key.
+
+        Args:
+            endpoint (str): Short name of the endpoint, used to pick the time to live.
+            key (str): The cache key built by make_cache_key.
+            response (requests.Response): The response to store.
+        """
+        if response.status_code != 200:
+            return
+
+        now = time.time()
+        body = response.content
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, endpoint, response.status_code, json.dumps(dict(response.headers)), response.url or "",
+             body, len(body), now + self.ttl(endpoint), now)
+        )
+        self._count("stores")
+
+        with self._lock:
+            self._stores_since_check += 1
+            check = self._stores_since_check >= _EVICTION_CHECK_INTERVAL
+            if check:
+                self._stores_since_check = 0
+        if check:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Deletes expired entries, then least recently used entries until under max_bytes.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        connection = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent evictions do not interleave
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                freed = 0
+                keys = []
+                for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                    keys.append((key,))
+                    freed += size
+                    if freed >= excess:
+                        break
+                connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+                deleted += len(keys)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        self._count("evictions", deleted)
+        return deleted
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes one entry from the cache.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+        """
+        self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        """
+        Returns the hit/miss counters of this instance and the size of the cache.
+
+        Returns:
+            dict: hits, misses, stores, evictions, hit_rate, entries and bytes.
+        """
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+
+# ----------------------------
+# Shared Cache
+# ----------------------------
+
+_environment_cache: Optional[ResponseCache] = None
+_environment_cache_lock = threading.Lock()
+
+
+# Function to return the cache configured through environment variables.
+def cache_from_environment() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide ResponseCache configured by LIGHTBOX_CACHE_PATH, if set.
+
+    LIGHTBOX_CACHE_MAX_BYTES optionally overrides the size limit.
+
+    Returns:
+        ResponseCache: The shared cache, or None when LIGHTBOX_CACHE_PATH is not set.
+    """
+    global _environment_cache
+    path = os.environ.get(CACHE_PATH_ENV)
+    if not path:
+        return None
+    with _environment_cache_lock:
+        if _environment_cache is None or _environment_cache.path != path:
+            max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+            _environment_cache = ResponseCache(path, max_bytes=max_bytes)
+        return _environment_cache
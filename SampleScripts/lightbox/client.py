@@ -0,0 +1,622 @@
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, Optional, Sequence
+
+from .cache import ResponseCache, cache_from_environment, cache_namespace, make_cache_key
+from .memcache import MemoryCache
+from .metrics import Metrics
+from .prefix_cache import PrefixCache
+from .responses import build_response, request_size, request_url
+from .spatial import BUFFER_UNITS, ParcelGeometryCache, ReverseSearchCache, parse_point_wkt
+from .ratelimit import RetryPolicy, TokenBucket
+from .scheduler import DEFAULT_PRIORITIES, NORMAL, PriorityScheduler, current_priority
+from .singleflight import SingleFlight
+from .streaming import DEFAULT_CHUNK_SIZE, DEFAULT_SKIP_FIELDS, iter_json_records
+
+
+# ----------------------------
+# Client Configuration
+# ----------------------------
+
+# Root of every LightBox API endpoint
+BASE_URL = "https://api.lightboxre.com/v1"
+
+# Connection pool defaults: number of host pools kept, and connections kept alive per host
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+
+# ----------------------------
+# Client Definition
+# ----------------------------
+
+class LightBoxClient:
+    """
+    Reusable LightBox API client holding a keep-alive connection pool.
+
+    A single client can be shared between threads. Every endpoint method
+    returns the raw requests.Response, exactly like the module-level
+    functions in the sample scripts.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        base_url (str): Root URL of the LightBox API.
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of keep-alive connections per host.
+        timeout (float): Optional timeout in seconds applied to every request.
+        cache (ResponseCache): Optional persistent cache consulted before every request.
+        memory_cache (MemoryCache): Optional in-process cache consulted before the persistent cache.
+        autocomplete_cache (PrefixCache): Optional prefix cache answering autocomplete requests
+                                          from the suggestions of shorter prefixes.
+        reverse_cache (ReverseSearchCache): Optional spatial cache answering reverse searches around
+                                            points inside previously fetched areas.
+        parcel_cache (ParcelGeometryCache): Optional spatial cache resolving parcel lookups by point
+                                            to previously fetched parcels whose polygon contains it.
+        rate_limit (float): Optional maximum number of requests per second sent by the client.
+        burst (float): Optional burst size of the rate limiter; defaults to one second of requests.
+        rate_limiter (TokenBucket): Optional rate limiter shared with other clients (e.g. a
+                                    SharedTokenBucket across processes); overrides rate_limit and burst.
+        scheduler (PriorityScheduler): Optional scheduler sharing its rate limiter between priority
+                                       classes; replaces rate_limiter, rate_limit and burst.
+        priorities (dict): Priority class of the requests of each endpoint, unless set with
+                           request_priority; DEFAULT_PRIORITIES by default, NORMAL for other endpoints.
+        retry (RetryPolicy): Backoff policy for 429, 5xx and connection errors; None disables retries.
+        coalesce (bool): Share one in-flight request between concurrent identical requests.
+        metrics (Metrics): Registry the per-endpoint latency, status, retry, byte and cache
+                           metrics are recorded in; a new one per client by default.
+    """
+
+    def __init__(
+            self,
+            lightbox_api_key: str,
+            base_url: str = BASE_URL,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            timeout: Optional[float] = None,
+            cache: Optional[ResponseCache] = None,
+            memory_cache: Optional[MemoryCache] = None,
+            autocomplete_cache: Optional[PrefixCache] = None,
+            reverse_cache: Optional[ReverseSearchCache] = None,
+            parcel_cache: Optional[ParcelGeometryCache] = None,
+            rate_limit: Optional[float] = None,
+            burst: Optional[float] = None,
+            rate_limiter: Optional[TokenBucket] = None,
+            scheduler: Optional[PriorityScheduler] = None,
+            priorities: Optional[Dict[str, str]] = None,
+            retry: Optional[RetryPolicy] = RetryPolicy(),
+            coalesce: bool = True,
+            metrics: Optional[Metrics] = None
+    ):
+        self.lightbox_api_key = lightbox_api_key
+        self.base_url = base_url.rstrip("/")
+        # Responses are cached apart per API key and base URL, even in a cache shared by several clients
+        self.cache_namespace = cache_namespace(lightbox_api_key, self.base_url)
+        self.timeout = timeout
+        self.cache = cache
+        self.memory_cache = memory_cache
+        self.autocomplete_cache = autocomplete_cache
+        self.reverse_cache = reverse_cache
+        self.parcel_cache = parcel_cache
+        if scheduler is not None:
+            rate_limiter = scheduler.rate_limiter
+        elif rate_limiter is None and rate_limit:
+            rate_limiter = TokenBucket(rate_limit, burst)
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.retry = retry
+        self.single_flight = SingleFlight() if coalesce else None
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "rate_limited": 0, "rate_limit_wait": 0.0}
+
+        # One session per client so TCP+TLS connections are reused across calls
+        self.session = requests.Session()
+        self.session.headers.update({'x-api-key': lightbox_api_key})
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection held by the client.
+        """
+        self.session.close()
+
+    def _count(self, **amounts) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def stats(self) -> Dict:
+        """
+        Returns the request counters of the client.
+
+        Returns:
+            dict: requests sent, retries, throttled (429 responses received),
+                  rate_limited (requests delayed by the rate limiter or the scheduler's queue),
+                  rate_limit_wait (seconds spent waiting for them) and
+                  collapsed (requests answered by an identical request already in flight).
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["collapsed"] = self.single_flight.stats()["collapsed"] if self.single_flight else 0
+        return stats
+
+    def priority_of(self, endpoint: str) -> str:
+        """
+        Returns the priority class of a request: the one set with request_priority, else the endpoint's.
+
+        Args:
+            endpoint (str): Short name of the endpoint.
+        """
+        return current_priority() or self.priorities.get(endpoint, NORMAL)
+
+    # Every endpoint method goes through this single request path.
+    def _get(self, endpoint: str, path: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Sends a GET request to the LightBox API.
+
+        Args:
+            endpoint (str): Short name of the endpoint (e.g., 'geocode', 'parcel').
+            path (str): Path of the endpoint relative to the base URL.
+            params (dict): Query string parameters.
+
+        Returns:
+            requests.Response: The response of the LightBox API.
+        """
+        key = make_cache_key(endpoint, path, params, self.cache_namespace)
+        if self.memory_cache is not None:
+            response = self.memory_cache.get(key)
+            self.metrics.count_cache(endpoint, "memory", response is not None)
+            if response is not None:
+                return response
+        if self.cache is not None:
+            response = self.cache.get(key)
+            self.metrics.count_cache(endpoint, "persistent", response is not None)
+            if response is not None:
+                if self.memory_cache is not None:
+                    self.memory_cache.set(endpoint, key, response)
+                return response
+
+        if self.single_flight is None:
+            return self._fetch(endpoint, key, path, params)
+        # Identical requests already in flight share its response
+        return self.single_flight.do(key, lambda: self._fetch(endpoint, key, path, params))
+
+    def _fetch(self, endpoint: str, key: str, path: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Sends a request over the network and stores its response in the caches.
+        """
+        response = self._send(endpoint, path, params)
+        if self.memory_cache is not None:
+            self.memory_cache.set(endpoint, key, response)
+        if self.cache is not None:
+            self.cache.set(endpoint, key, response)
+        return response
+
+    def stream_records(
+            self,
+            endpoint: str,
+            path: str,
+            params: Optional[Dict],
+            key: str,
+            fields: Optional[Sequence[str]] = None,
+            include_geometry: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Sends a GET request and yields the records of one array of its JSON body as they arrive.
+
+        The body is decoded one record at a time and only the requested fields
+        are built, instead of the whole object tree response.json() would
+        create. A cached response is decoded the same way; a response fetched
+        over the network is stored in the caches once fully read.
+
+        Args:
+            endpoint (str): Short name of the endpoint (e.g., 'parcel_geometry', 'adjacent').
+            path (str): Path of the endpoint relative to the base URL.
+            params (dict): Query string parameters.
+            key (str): Key of the array of records in the body (e.g., 'parcels', 'addresses').
+            fields (Sequence[str]): Fields kept in each record, as dotted paths; all by default.
+            include_geometry (bool): Keep the 'geometry' of each record when fields is not given.
+
+        Yields:
+            dict: The records.
+
+        Raises:
+            requests.HTTPError: When the response status is not 200.
+        """
+        skip = () if include_geometry else DEFAULT_SKIP_FIELDS
+        cache_key = make_cache_key(endpoint, path, params, self.cache_namespace)
+        for tier, cache in (("memory", self.memory_cache), ("persistent", self.cache)):
+            if cache is None:
+                continue
+            response = cache.get(cache_key)
+            self.metrics.count_cache(endpoint, tier, response is not None)
+            if response is not None:
+                yield from iter_json_records([response.content], key, fields, skip)
+                return
+
+        with self._send(endpoint, path, params, stream=True) as response:
+            response.raise_for_status()
+            if self.memory_cache is None and self.cache is None:
+                yield from iter_json_records(response.iter_content(DEFAULT_CHUNK_SIZE), key, fields, skip)
+                return
+
+            # Keeping the raw chunks, far smaller than the decoded tree, to cache the body once complete
+            body = response.iter_content(DEFAULT_CHUNK_SIZE)
+            chunks = []
+
+            def tee() -> Iterator[bytes]:
+                for chunk in body:
+                    chunks.append(chunk)
+                    yield chunk
+
+            yield from iter_json_records(tee(), key, fields, skip)
+            chunks.extend(body)
+            stored = build_response(200, b"".join(chunks), dict(response.headers), response.url)
+        if self.memory_cache is not None:
+            self.memory_cache.set(endpoint, cache_key, stored)
+        if self.cache is not None:
+            self.cache.set(endpoint, cache_key, stored)
+
+    def _local_response(self, path: str, params: Dict, data: Dict) -> requests.Response:
+        """
+        Builds the response of a request answered locally, without any network call.
+        """
+        return build_response(200, json.dumps(data).encode(), {"Content-Type": "application/json"},
+                              request_url(self.base_url + path, params))
+
+    def _send(self, endpoint: str, path: str, params: Optional[Dict] = None, stream: bool = False) -> requests.Response:
+        """
+        Sends a request over the network, within the rate limit and with retries.
+
+        Args:
+            endpoint (str): Short name of the endpoint, used to label the metrics.
+            path (str): Path of the endpoint relative to the base URL.
+            params (dict): Query string parameters.
+            stream (bool): Leave the body of a successful response unread, for the caller to
+                           stream and close; its latency is then measured up to the headers.
+
+        Returns:
+            requests.Response: The last response received.
+        """
+        attempt = 0
+        while True:
+            if self.scheduler is not None:
+                waited = self.scheduler.acquire(self.priority_of(endpoint))
+            elif self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+            else:
+                waited = 0.0
+            if waited:
+                self._count(rate_limited=1, rate_limit_wait=waited)
+
+            self._count(requests=1)
+            started_at = time.perf_counter()
+            try:
+                response = self.session.get(self.base_url + path, params=params, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                self.metrics.observe_request(endpoint, None, time.perf_counter() - started_at, 0, 0)
+                if self.retry is None or not self.retry.should_retry(attempt, None):
+                    raise
+                response = None
+            else:
+                if stream and response.status_code == 200:
+                    bytes_in = int(response.headers.get("Content-Length") or 0)
+                else:
+                    bytes_in = len(response.content)
+                self.metrics.observe_request(endpoint, response.status_code, time.perf_counter() - started_at,
+                                             request_size(response.request), bytes_in)
+
+            if response is not None and response.status_code == 429:
+                self._count(throttled=1)
+            if self.retry is None or not self.retry.should_retry(attempt, response):
+                return response
+
+            delay = self.retry.delay(attempt, response)
+            self._count(retries=1)
+            self.metrics.count_retry(endpoint)
+            attempt += 1
+            if response is not None and response.status_code == 429 and self.rate_limiter is not None:
+                # Holding back every thread of the client; the next acquire() waits out the delay
+                self.rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+    # ----------------------------
+    # Address Endpoints
+    # ----------------------------
+
+    def geocode_address(self, address: str) -> requests.Response:
+        """
+        Geocodes the provided address.
+
+        Args:
+            address (str): The address string for matching.
+        """
+        return self._get("geocode", "/addresses/search", {'text': address})
+
+    def autocomplete_address(self, address: str, country_code: str) -> requests.Response:
+        """
+        Autocompletes the provided partial address.
+
+        Args:
+            address (str): The partial address to be autocompleted.
+            country_code (str): The ISO 3166-1 alpha-2 country code.
+        """
+        params = {'text': address, 'countryCode': country_code}
+        if self.autocomplete_cache is None:
+            return self._get("autocomplete", "/addresses/_autocomplete", params)
+
+        suggestions = self.autocomplete_cache.lookup(address, country_code)
+        self.metrics.count_cache("autocomplete", "prefix", suggestions is not None)
+        if suggestions is not None:
+            return self._local_response("/addresses/_autocomplete", params, {"addresses": suggestions})
+
+        response = self._get("autocomplete", "/addresses/_autocomplete", params)
+        if response.status_code == 200:
+            self.autocomplete_cache.add(address, country_code, response.json().get("addresses") or [])
+        return response
+
+    def reverse_address_search(self, wkt: str, bufferDistance: float, bufferUnit: str, limit: int) -> requests.Response:
+        """
+        Performs a reverse address search around a geometry.
+
+        Args:
+            wkt (str): The geometry of the location expressed in WKT format.
+            bufferDistance (float): Buffer distance expressed in 'bufferUnits'.
+            bufferUnit (str): The unit type to apply to the buffer (m, km, ft or mi).
+            limit (int): The maximum number of entries to return.
+        """
+        params = {
+            'wkt': wkt,
+            'bufferDistance': bufferDistance,
+            'bufferUnit': bufferUnit,
+            'limit': limit
+        }
+        point = parse_point_wkt(wkt) if self.reverse_cache is not None else None
+        try:
+            radius_m = float(bufferDistance) * BUFFER_UNITS[bufferUnit]
+            limit = int(limit)
+        except (KeyError, TypeError, ValueError):
+            point = None
+        if point is None or radius_m < 0 or limit <= 0:
+            return self._get("reverse", "/addresses/reverse", params)
+
+        # Answering locally when the buffer lies inside an area already fetched
+        addresses = self.reverse_cache.lookup(point[0], point[1], radius_m, limit)
+        self.metrics.count_cache("reverse", "spatial", addresses is not None)
+        if addresses is not None:
+            return self._local_response("/addresses/reverse", params, {"addresses": addresses})
+
+        response = self._get("reverse", "/addresses/reverse", params)
+        if response.status_code == 200:
+            self.reverse_cache.add(point[0], point[1], radius_m, limit, response.json().get("addresses") or [])
+        return response
+
+    def iter_reverse_addresses(self, wkt: str, bufferDistance: float, bufferUnit: str, limit: int,
+                               fields: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Streams the addresses of a reverse search, one record at a time (see stream_records).
+
+        Meant for high limits; the spatial reverse cache is not consulted.
+
+        Args:
+            wkt (str): The geometry of the location expressed in WKT format.
+            bufferDistance (float): Buffer distance expressed in 'bufferUnits'.
+            bufferUnit (str): The unit type to apply to the buffer (m, km, ft or mi).
+            limit (int): The maximum number of entries to return.
+            fields (Sequence[str]): Fields kept in each address, as dotted paths; all by default.
+        """
+        params = {
+            'wkt': wkt,
+            'bufferDistance': bufferDistance,
+            'bufferUnit': bufferUnit,
+            'limit': limit
+        }
+        return self.stream_records("reverse", "/addresses/reverse", params, "addresses", fields)
+
+    # ----------------------------
+    # Parcel Endpoints
+    # ----------------------------
+
+    def get_parcel(self, country_code: str, id: str) -> requests.Response:
+        """
+        Queries for a specific parcel using the LightBox parcel 'ID.'
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("parcel", f"/parcels/{country_code}/{id}")
+
+    def get_parcel_data_from_address_coordinates(self, country_code: str, address_wkt_coordinates: str) -> requests.Response:
+        """
+        Queries for the parcels intersecting a geometry.
+
+        With a parcel cache, a point inside the polygon of a parcel already
+        fetched is answered locally, with only the 'parcels' list of the API response.
+
+        Args:
+            country_code (str): The country code for the address.
+            address_wkt_coordinates (str): The address coordinates expressed in WKT format.
+        """
+        path, params = f"/parcels/{country_code}/geometry", {'wkt': address_wkt_coordinates}
+        if self.parcel_cache is None:
+            return self._get("parcel_geometry", path, params)
+
+        # Resolving the point locally when it lies inside a parcel polygon already fetched
+        point = parse_point_wkt(address_wkt_coordinates)
+        if point is not None:
+            parcels = self.parcel_cache.lookup(country_code, point[0], point[1])
+            self.metrics.count_cache("parcel_geometry", "spatial", parcels is not None)
+            if parcels is not None:
+                return self._local_response(path, params, {"parcels": parcels})
+
+        response = self._get("parcel_geometry", path, params)
+        if response.status_code == 200:
+            self.parcel_cache.add(country_code, response.json().get("parcels") or [])
+        return response
+
+    def iter_parcels_from_address_coordinates(self, country_code: str, address_wkt_coordinates: str,
+                                              fields: Optional[Sequence[str]] = None, include_geometry: bool = False) -> Iterator[Dict]:
+        """
+        Streams the parcels intersecting a geometry, one record at a time (see stream_records).
+
+        Meant for large geometries; the parcel cache is not consulted.
+
+        Args:
+            country_code (str): The country code for the address.
+            address_wkt_coordinates (str): The address coordinates expressed in WKT format.
+            fields (Sequence[str]): Fields kept in each parcel, as dotted paths; all by default.
+            include_geometry (bool): Keep the parcel geometry when fields is not given.
+        """
+        return self.stream_records("parcel_geometry", f"/parcels/{country_code}/geometry", {'wkt': address_wkt_coordinates},
+                                   "parcels", fields, include_geometry)
+
+    def get_common_owners(self, country_code: str, id: str, common_ownership: str) -> requests.Response:
+        """
+        Queries for adjacent parcel(s), optionally only those with a common owner.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID for the specified parcel.
+            common_ownership (str): 'true' to return only parcels with a common owner.
+        """
+        return self._get("adjacent", f"/parcels/_adjacent/{country_code}/{id}", {'commonOwnership': f"'{common_ownership}'"})
+
+    def iter_common_owners(self, country_code: str, id: str, common_ownership: str,
+                           fields: Optional[Sequence[str]] = None, include_geometry: bool = False) -> Iterator[Dict]:
+        """
+        Streams the adjacent parcel(s), one record at a time (see stream_records).
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID for the specified parcel.
+            common_ownership (str): 'true' to return only parcels with a common owner.
+            fields (Sequence[str]): Fields kept in each parcel, as dotted paths; all by default.
+            include_geometry (bool): Keep the parcel geometry when fields is not given.
+        """
+        return self.stream_records("adjacent", f"/parcels/_adjacent/{country_code}/{id}", {'commonOwnership': f"'{common_ownership}'"},
+                                   "parcels", fields, include_geometry)
+
+    def get_assessment_data_from_lbx_parcel_id(self, parcel_id: str) -> requests.Response:
+        """
+        Queries for the assessment records of a parcel.
+
+        Args:
+            parcel_id (str): The LightBox parcel ID.
+        """
+        return self._get("assessments", f"/assessments/_on/parcel/us/{parcel_id}")
+
+    # ----------------------------
+    # Parcel Dataset Endpoints
+    # ----------------------------
+
+    def get_zoning(self, country_code: str, id: str) -> requests.Response:
+        """
+        Queries for zoning records related to a parcel.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("zoning", f"/zoning/_on/parcel/{country_code}/{id}")
+
+    def get_nfhls(self, id: str) -> requests.Response:
+        """
+        Queries for FEMA National Flood Hazard Layer records related to a parcel.
+
+        Args:
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("nfhls", f"/nfhls/_on/parcel/us/{id}")
+
+    def get_wetlands(self, id: str) -> requests.Response:
+        """
+        Queries for wetland records related to a parcel.
+
+        Args:
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("wetlands", f"/wetlands/_on/parcel/us/{id}")
+
+    def get_risk_indexes(self, id: str) -> requests.Response:
+        """
+        Queries for national risk index records related to a parcel.
+
+        Args:
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("riskindexes", f"/riskindexes/_on/parcel/us/{id}")
+
+    def get_demographics(self, id: str) -> requests.Response:
+        """
+        Queries for the demographic record related to a parcel.
+
+        Args:
+            id (str): The LightBox ID for the specified parcel.
+        """
+        return self._get("demographics", f"/demographics/_on/parcel/us/{id}")
+
+
+# ----------------------------
+# Shared Clients
+# ----------------------------
+
+_clients: Dict[str, LightBoxClient] = {}
+_client_options: Dict = {}
+_clients_lock = threading.Lock()
+
+
+# Function to tune the options used for shared clients created from now on.
+def configure_clients(**options) -> None:
+    """
+    Sets the LightBoxClient options used by get_client, and closes existing shared clients.
+
+    Args:
+        **options: Keyword arguments forwarded to LightBoxClient (e.g., pool_maxsize=64).
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _client_options.clear()
+        _client_options.update(options)
+
+
+# Function to return the process-wide client for an API key.
+def get_client(lightbox_api_key: str) -> LightBoxClient:
+    """
+    Returns the shared LightBoxClient for an API key, creating it on first use.
+
+    Unless a cache was passed to configure_clients, shared clients use the
+    persistent cache named by the LIGHTBOX_CACHE_PATH environment variable.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+
+    Returns:
+        LightBoxClient: The shared client for the API key.
+    """
+    with _clients_lock:
+        client = _clients.get(lightbox_api_key)
+        if client is None:
+            options = dict(_client_options)
+            # Not opening the environment's cache at all when configure_clients chose one, even None
+            if "cache" not in options:
+                options["cache"] = cache_from_environment()
+            client = LightBoxClient(lightbox_api_key, **options)
+            _clients[lightbox_api_key] = client
+        return client
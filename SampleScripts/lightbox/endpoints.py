@@ -0,0 +1,199 @@
+from typing import Dict
+
+from .client import get_client
+
+
+# ----------------------------
+# Endpoint Functions
+# ----------------------------
+# The endpoint functions the sample scripts import: each one sends its request
+# through the shared, pooled client of the API key.
+
+# Function to geocode an address.
+def geocode_address(lightbox_api_key: str, address: str) -> Dict:
+    """
+    Geocodes the provided address using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        address (str): The address string to be geocoded.
+
+    Returns:
+        dict: The geocoded address information in JSON format.
+    """
+    return get_client(lightbox_api_key).geocode_address(address)
+
+
+# Function to autocomplete a partial address.
+def autocomplete_address(lightbox_api_key: str, address: str, country_code: str) -> Dict:
+    """
+    Autocompletes the provided address using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        address (str): The partial address to be autocompleted.
+        country_code (str): The ISO 3166-1 alpha-2 country code.
+
+    Returns:
+        dict: The autocompleted address information in JSON format.
+    """
+    return get_client(lightbox_api_key).autocomplete_address(address, country_code)
+
+
+# Function to find the addresses around a location.
+def reverse_address_search(lightbox_api_key: str, wkt: str, bufferDistance: float, bufferUnit: str, limit: int) -> Dict:
+    """
+    Performs a reverse address search using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        wkt (str): The geometry of the location in WKT format, e.g. POINT(-117.852723 33.63799).
+        bufferDistance (float): Buffer distance expressed in 'bufferUnit'.
+        bufferUnit (str): The unit of the buffer: m, km, ft or mi.
+        limit (int): The maximum number of entries to return.
+
+    Returns:
+        dict: The addresses found, in JSON format.
+    """
+    return get_client(lightbox_api_key).reverse_address_search(wkt, bufferDistance, bufferUnit, limit)
+
+
+# Function to get a parcel by its LightBox ID.
+def get_parcel(lightbox_api_key: str, country_code: str, id: str) -> Dict:
+    """
+    Retrieves parcel data using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        country_code (str): The ISO 3166-1 alpha-2 country code.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The parcel data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_parcel(country_code, id)
+
+
+# Function to get the parcels at a point.
+def get_parcel_data_from_address_coordinates(lightbox_api_key: str, country_code: str, address_wkt_coordinates: str) -> Dict:
+    """
+    Retrieves the parcels containing a point using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        country_code (str): The ISO 3166-1 alpha-2 country code.
+        address_wkt_coordinates (str): The point in WKT format, e.g. POINT(-117.852723 33.63799).
+
+    Returns:
+        dict: The parcel data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_parcel_data_from_address_coordinates(country_code, address_wkt_coordinates)
+
+
+# Function to get the parcels sharing an owner with a parcel.
+def get_common_owners(lightbox_api_key: str, country_code: str, id: str, common_ownership: str) -> Dict:
+    """
+    Retrieves the parcels with a common owner using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        country_code (str): The ISO 3166-1 alpha-2 country code.
+        id (str): The LightBox ID of the parcel.
+        common_ownership (str): 'true' to return only the parcels with a common owner,
+                                'false' to return the parcels intersecting the parcel.
+
+    Returns:
+        dict: The parcels with a common owner, in JSON format.
+    """
+    return get_client(lightbox_api_key).get_common_owners(country_code, id, common_ownership)
+
+
+# Function to get the assessments of a parcel.
+def get_assessment_data_from_lbx_parcel_id(lightbox_api_key: str, parcel_id: str) -> Dict:
+    """
+    Retrieves the assessment data of a parcel using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        parcel_id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The assessment data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_assessment_data_from_lbx_parcel_id(parcel_id)
+
+
+# Function to get the zoning of a parcel.
+def get_zoning(lightbox_api_key: str, country_code: str, id: str) -> Dict:
+    """
+    Retrieves zoning data using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        country_code (str): The ISO 3166-1 alpha-2 country code.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The zoning data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_zoning(country_code, id)
+
+
+# Function to get the flood hazard status of a parcel.
+def get_nfhls(lightbox_api_key: str, id: str) -> Dict:
+    """
+    Retrieves FEMA National Flood Hazard Layer data using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The flood hazard data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_nfhls(id)
+
+
+# Function to get the wetlands of a parcel.
+def get_wetlands(lightbox_api_key: str, id: str) -> Dict:
+    """
+    Retrieves wetlands data using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The wetlands data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_wetlands(id)
+
+
+# Function to get the risk indexes of a parcel.
+def get_risk_indexes(lightbox_api_key: str, id: str) -> Dict:
+    """
+    Retrieves natural hazard risk indexes using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The risk index data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_risk_indexes(id)
+
+
+# Function to get the demographics around a parcel.
+def get_demographics(lightbox_api_key: str, id: str) -> Dict:
+    """
+    Retrieves demographics data using the LightBox API.
+
+    Args:
+        lightbox_api_key (str): The API key for accessing the LightBox API.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: The demographics data in JSON format.
+    """
+    return get_client(lightbox_api_key).get_demographics(id)
@@ -0,0 +1,112 @@
+import contextvars
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+from .client import LightBoxClient
+
+
+# ----------------------------
+# Parcel Datasets
+# ----------------------------
+
+# How to fetch each dataset available for a LightBox parcel ID
+DATASETS: Dict[str, Callable] = {
+    "parcel": lambda client, country_code, id: client.get_parcel(country_code, id),
+    "zoning": lambda client, country_code, id: client.get_zoning(country_code, id),
+    "nfhls": lambda client, country_code, id: client.get_nfhls(id),
+    "wetlands": lambda client, country_code, id: client.get_wetlands(id),
+    "riskindexes": lambda client, country_code, id: client.get_risk_indexes(id),
+    "demographics": lambda client, country_code, id: client.get_demographics(id),
+    "assessments": lambda client, country_code, id: client.get_assessment_data_from_lbx_parcel_id(id),
+}
+
+
+# Function to fetch one dataset and turn its response into data or an error.
+def fetch_dataset(client: LightBoxClient, dataset: str, country_code: str, id: str) -> Dict:
+    """
+    Fetches one dataset of a parcel.
+
+    Args:
+        client (LightBoxClient): The client used to send the request.
+        dataset (str): Name of the dataset, a key of DATASETS.
+        country_code (str): ISO 3166 alpha-2 country code.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: {'data': <JSON body>} on success, {'error': <description>} otherwise.
+    """
+    try:
+        response = DATASETS[dataset](client, country_code, id)
+        if response.status_code != 200:
+            return {"error": f"Status Code: {response.status_code}"}
+        return {"data": response.json()}
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+
+
+# ----------------------------
+# Parcel Enrichment
+# ----------------------------
+
+# Function to fetch every requested dataset of a stream of parcels concurrently.
+def enrich_parcels(
+        client: LightBoxClient,
+        ids: Iterable[str],
+        datasets: Optional[Sequence[str]] = None,
+        country_code: str = "US",
+        max_workers: int = 16,
+        max_parcels_in_flight: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Fetches all requested datasets of each parcel concurrently and merges them into one record.
+
+    The datasets of a parcel are requested at the same time, so a parcel takes
+    as long as its slowest dataset rather than the sum of all of them. Several
+    parcels are also in flight at once; records are yielded in input order.
+    Requests run in the caller's context, so a request_priority block around
+    the loop sets their priority class.
+
+    Args:
+        client (LightBoxClient): The client used to send the requests.
+        ids (Iterable[str]): LightBox parcel IDs, consumed lazily.
+        datasets (Sequence[str]): Names of the datasets to fetch (keys of DATASETS); all by default.
+        country_code (str): ISO 3166 alpha-2 country code of the parcels.
+        max_workers (int): Maximum number of requests in flight at once.
+        max_parcels_in_flight (int): Maximum number of parcels being fetched at once; defaults to
+                                     2 * max_workers, so requests stay queued for every worker even
+                                     while the oldest parcel waits on its slowest dataset.
+
+    Yields:
+        dict: One wide record per parcel: {'id': ..., <dataset>: <JSON body or None>, ..., 'errors': {<dataset>: <description>}}.
+    """
+    datasets = list(datasets or DATASETS)
+    unknown = [dataset for dataset in datasets if dataset not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown datasets {unknown}, expected some of {list(DATASETS)}")
+    if max_parcels_in_flight is None:
+        max_parcels_in_flight = 2 * max_workers
+
+    ids = iter(ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit(id: str) -> Dict[str, Future]:
+            return {
+                dataset: executor.submit(contextvars.copy_context().run, fetch_dataset, client, dataset, country_code, id)
+                for dataset in datasets
+            }
+
+        # Sliding window of parcels being fetched, consumed oldest first to keep input order
+        pending = deque((id, submit(id)) for id in islice(ids, max_parcels_in_flight))
+        while pending:
+            id, futures = pending.popleft()
+            record = {"id": id, "errors": {}}
+            for dataset, future in futures.items():
+                result = future.result()
+                record[dataset] = result.get("data")
+                if "error" in result:
+                    record["errors"][dataset] = result["error"]
+            for next_id in islice(ids, 1):
+                pending.append((next_id, submit(next_id)))
+            yield record
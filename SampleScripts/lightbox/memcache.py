@@ -0,0 +1,170 @@
+import sys
+import threading
+import time
+import requests
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .cache import DEFAULT_TTL, DEFAULT_TTLS
+
+
+# ----------------------------
+# Cache Configuration
+# ----------------------------
+
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Rough per-entry bookkeeping cost added to the body size (response object, key, LRU links)
+_ENTRY_OVERHEAD = 1024
+
+
+# ----------------------------
+# Cache Definition
+# ----------------------------
+
+class MemoryCache:
+    """
+    Bounded in-process LRU cache of responses with per-endpoint TTLs.
+
+    Meant as a fast tier in front of the network and of the persistent
+    ResponseCache: a hit returns the stored response without any I/O. The
+    cache is bounded both by number of entries and by approximate size, and
+    evicts the least recently used entries first. Keys are those built by
+    make_cache_key, so entries can be invalidated one by one or by prefix
+    (e.g. every 'autocomplete:' entry, or every entry of one parcel path).
+
+    Args:
+        max_entries (int): Maximum number of entries.
+        max_bytes (int): Maximum approximate size of the entries in bytes.
+        ttls (dict): Time to live in seconds per endpoint name, merged over DEFAULT_TTLS.
+        default_ttl (float): Time to live in seconds for endpoints missing from ttls.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            ttls: Optional[Dict[str, float]] = None,
+            default_ttl: float = DEFAULT_TTL
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        # key -> (response, expires_at, size), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """
+        Returns the cached response for a key, or None when missing or expired.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            response, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return response
+
+    def set(self, endpoint: str, key: str, response: requests.Response) -> None:
+        """
+        Stores a successful response under a key, evicting least recently used entries as needed.
+
+        Args:
+            endpoint (str): Short name of the endpoint, used to pick the time to live.
+            key (str): The cache key built by make_cache_key.
+            response (requests.Response): The response to store.
+        """
+        if response.status_code != 200:
+            return
+        size = len(response.content) + sys.getsizeof(key) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttls.get(endpoint, self.default_ttl)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, expires_at, size)
+            self._bytes += size
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes an entry; the lock must be held.
+        """
+        self._bytes -= self._entries.pop(key)[2]
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Removes one entry.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+
+        Returns:
+            bool: Whether the entry was cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._counters["invalidations"] += 1
+            return True
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Removes every entry whose key starts with a prefix.
+
+        Args:
+            prefix (str): Key prefix, e.g. 'autocomplete:' or 'parcel:/parcels/US/0201MABNPDBU5D2EGP08YA'.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            self._counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Returns the hit/miss/eviction counters and the size of the cache.
+
+        Returns:
+            dict: hits, misses, stores, evictions, expirations, invalidations, hit_rate, entries and bytes.
+        """
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
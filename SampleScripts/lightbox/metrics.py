@@ -0,0 +1,259 @@
+import bisect
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# ----------------------------
+# Metrics Configuration
+# ----------------------------
+
+# Upper bounds in seconds of the request latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Status label of requests that got no response (connection error or timeout)
+NO_RESPONSE = "error"
+
+
+# ----------------------------
+# Histogram
+# ----------------------------
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed bucket bounds, in the Prometheus style.
+
+    Args:
+        buckets (Sequence[float]): Upper bounds of the buckets, in increasing order; +Inf is implied.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        Returns (upper bound, number of observations up to it) per bucket, ending with '+Inf'.
+        """
+        total, result = 0, []
+        for bound, count in zip([f"{bucket:g}" for bucket in self.buckets] + ["+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile as the upper bound of the bucket holding it (None when empty).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for (_, total), bucket in zip(self.cumulative(), self.buckets + (float("inf"),)):
+            if total >= rank:
+                return bucket
+        return float("inf")
+
+
+# ----------------------------
+# Metrics Registry
+# ----------------------------
+
+class Metrics:
+    """
+    Per-endpoint request metrics of LightBox clients.
+
+    Records, per endpoint: a latency histogram of the requests sent over the
+    network, response counts per status code, retries, bytes sent and
+    received, and hits and misses per cache tier ('memory', 'persistent',
+    'prefix', 'spatial'). Several clients can share one instance.
+
+    Every recorded event is also passed, as a dict, to the sinks added with
+    add_sink, e.g. to forward it to StatsD or a log; a failing sink is counted
+    and otherwise ignored. Snapshots export as JSON or in the Prometheus text format.
+
+    Args:
+        buckets (Sequence[float]): Upper bounds in seconds of the latency histogram buckets.
+        sinks (Sequence[Callable]): Functions called with every event.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, sinks: Optional[Sequence[Callable[[Dict], None]]] = None):
+        self.buckets = tuple(buckets)
+        self._sinks: List[Callable[[Dict], None]] = list(sinks or [])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets every recorded value.
+        """
+        with self._lock:
+            self._latency: Dict[str, Histogram] = {}
+            self._responses: Dict[Tuple[str, str], int] = {}
+            self._retries: Dict[str, int] = {}
+            self._bytes_out: Dict[str, int] = {}
+            self._bytes_in: Dict[str, int] = {}
+            self._cache: Dict[Tuple[str, str, str], int] = {}
+            self._sink_errors = 0
+
+    def add_sink(self, sink: Callable[[Dict], None]) -> None:
+        """
+        Adds a function called with every event recorded from now on.
+
+        Events are dicts with a 'type' of 'request' (endpoint, status_code, seconds,
+        bytes_out, bytes_in), 'retry' (endpoint) or 'cache' (endpoint, tier, hit).
+
+        Args:
+            sink (Callable): The function; it runs on the thread that made the request.
+        """
+        with self._lock:
+            self._sinks.append(sink)
+
+    def _emit(self, event: Dict) -> None:
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception:
+                with self._lock:
+                    self._sink_errors += 1
+
+    def observe_request(self, endpoint: str, status_code: Optional[int], seconds: float, bytes_out: int, bytes_in: int) -> None:
+        """
+        Records one request sent over the network.
+
+        Args:
+            endpoint (str): Short name of the endpoint.
+            status_code (int): Status code of the response, None when no response was received.
+            seconds (float): Time from sending the request to having read the whole response.
+            bytes_out (int): Approximate size of the request.
+            bytes_in (int): Size of the response body.
+        """
+        status = str(status_code) if status_code is not None else NO_RESPONSE
+        with self._lock:
+            histogram = self._latency.get(endpoint)
+            if histogram is None:
+                histogram = self._latency[endpoint] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self._responses[endpoint, status] = self._responses.get((endpoint, status), 0) + 1
+            self._bytes_out[endpoint] = self._bytes_out.get(endpoint, 0) + bytes_out
+            self._bytes_in[endpoint] = self._bytes_in.get(endpoint, 0) + bytes_in
+        if self._sinks:
+            self._emit({"type": "request", "endpoint": endpoint, "status_code": status_code, "seconds": seconds,
+                        "bytes_out": bytes_out, "bytes_in": bytes_in})
+
+    def count_retry(self, endpoint: str) -> None:
+        """
+        Records one retry of a request.
+
+        Args:
+            endpoint (str): Short name of the endpoint.
+        """
+        with self._lock:
+            self._retries[endpoint] = self._retries.get(endpoint, 0) + 1
+        if self._sinks:
+            self._emit({"type": "retry", "endpoint": endpoint})
+
+    def count_cache(self, endpoint: str, tier: str, hit: bool) -> None:
+        """
+        Records one cache lookup.
+
+        Args:
+            endpoint (str): Short name of the endpoint.
+            tier (str): Name of the cache ('memory', 'persistent', 'prefix' or 'spatial').
+            hit (bool): Whether the cache answered the request.
+        """
+        key = (endpoint, tier, "hit" if hit else "miss")
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+        if self._sinks:
+            self._emit({"type": "cache", "endpoint": endpoint, "tier": tier, "hit": hit})
+
+    def snapshot(self) -> Dict:
+        """
+        Returns every recorded value, per endpoint.
+
+        Returns:
+            dict: {endpoint: {'requests', 'latency' ({'sum', 'count', 'p50', 'p95', 'p99', 'buckets'}),
+                  'responses' ({status: count}), 'retries', 'bytes_out', 'bytes_in',
+                  'cache' ({tier: {'hit': count, 'miss': count}})}}, plus 'sink_errors'.
+                  Latency quantiles are bucket upper bounds in seconds.
+        """
+        with self._lock:
+            endpoints = set(self._latency) | set(self._retries) | {key[0] for key in self._cache}
+            snapshot: Dict = {}
+            for endpoint in sorted(endpoints):
+                histogram = self._latency.get(endpoint, Histogram(self.buckets))
+                cache: Dict[str, Dict[str, int]] = {}
+                for (name, tier, result), count in self._cache.items():
+                    if name == endpoint:
+                        cache.setdefault(tier, {"hit": 0, "miss": 0})[result] = count
+                snapshot[endpoint] = {
+                    "requests": histogram.count,
+                    "latency": {
+                        "sum": histogram.sum,
+                        "count": histogram.count,
+                        "p50": histogram.quantile(0.50),
+                        "p95": histogram.quantile(0.95),
+                        "p99": histogram.quantile(0.99),
+                        "buckets": dict(histogram.cumulative()),
+                    },
+                    "responses": {status: count for (name, status), count in sorted(self._responses.items()) if name == endpoint},
+                    "retries": self._retries.get(endpoint, 0),
+                    "bytes_out": self._bytes_out.get(endpoint, 0),
+                    "bytes_in": self._bytes_in.get(endpoint, 0),
+                    "cache": cache,
+                }
+            return {"endpoints": snapshot, "sink_errors": self._sink_errors}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns the snapshot as a JSON string; keyword arguments are passed to json.dumps.
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "lightbox") -> str:
+        """
+        Returns the recorded values in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of the metric names.
+
+        Returns:
+            str: The metrics, ready to be served on a /metrics endpoint or written for a textfile collector.
+        """
+        with self._lock:
+            lines = [
+                f"# HELP {prefix}_request_duration_seconds Latency of the requests sent to the LightBox API.",
+                f"# TYPE {prefix}_request_duration_seconds histogram",
+            ]
+            for endpoint, histogram in sorted(self._latency.items()):
+                for bound, total in histogram.cumulative():
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {total}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram.sum:.6f}')
+                lines.append(f'{prefix}_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram.count}')
+
+            lines += [f"# HELP {prefix}_responses_total Responses received, per status code.",
+                      f"# TYPE {prefix}_responses_total counter"]
+            lines += [f'{prefix}_responses_total{{endpoint="{endpoint}",code="{status}"}} {count}'
+                      for (endpoint, status), count in sorted(self._responses.items())]
+
+            for name, values, help in (
+                    ("retries_total", self._retries, "Requests retried."),
+                    ("request_bytes_total", self._bytes_out, "Approximate bytes sent."),
+                    ("response_bytes_total", self._bytes_in, "Response body bytes received."),
+            ):
+                lines += [f"# HELP {prefix}_{name} {help}", f"# TYPE {prefix}_{name} counter"]
+                lines += [f'{prefix}_{name}{{endpoint="{endpoint}"}} {count}' for endpoint, count in sorted(values.items())]
+
+            lines += [f"# HELP {prefix}_cache_lookups_total Cache lookups, per cache tier and result.",
+                      f"# TYPE {prefix}_cache_lookups_total counter"]
+            lines += [f'{prefix}_cache_lookups_total{{endpoint="{endpoint}",tier="{tier}",result="{result}"}} {count}'
+                      for (endpoint, tier, result), count in sorted(self._cache.items())]
+        return "\n".join(lines) + "\n"
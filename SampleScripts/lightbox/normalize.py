@@ -0,0 +1,125 @@
+import re
+from typing import List
+
+
+# ----------------------------
+# Address Abbreviations
+# ----------------------------
+
+# USPS standard abbreviations of street suffixes
+STREET_SUFFIXES = {
+    "ALLEY": "ALY",
+    "AVENUE": "AVE",
+    "BOULEVARD": "BLVD",
+    "CIRCLE": "CIR",
+    "COURT": "CT",
+    "DRIVE": "DR",
+    "EXPRESSWAY": "EXPY",
+    "FREEWAY": "FWY",
+    "HIGHWAY": "HWY",
+    "LANE": "LN",
+    "PARKWAY": "PKWY",
+    "PLACE": "PL",
+    "PLAZA": "PLZ",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "SQUARE": "SQ",
+    "STREET": "ST",
+    "TERRACE": "TER",
+    "TRAIL": "TRL",
+}
+
+# USPS standard abbreviations of directionals
+DIRECTIONALS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+
+# USPS standard abbreviations of unit designators
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT",
+    "BUILDING": "BLDG",
+    "FLOOR": "FL",
+    "SUITE": "STE",
+}
+
+# Every abbreviation above
+ADDRESS_ABBREVIATIONS = {**STREET_SUFFIXES, **DIRECTIONALS, **UNIT_DESIGNATORS}
+
+# Anything that is neither a letter, a digit, '#' nor whitespace
+_PUNCTUATION = re.compile(r"[^\w#\s]|_")
+
+
+# Function to tell whether a word is one of the words of a table, spelled out or abbreviated.
+def _is_one_of(word: str, table: dict) -> bool:
+    return word in table or word in table.values()
+
+
+# Function to abbreviate the words of a street line that are in a suffix, directional or unit position.
+def _normalize_street(words: List[str]) -> List[str]:
+    """
+    Abbreviates the words of '<number> [pre-directional] <name> [suffix] [post-directional] [unit]'.
+
+    The unit is a designator, spelled out or abbreviated, followed by the unit
+    number ('Apt 4', 'Ste 200'), or a '#' unit number ('#4', '# 4').
+
+    A word is only abbreviated where it plays that part, so the name itself is
+    kept: 'East Street' becomes 'EAST ST', not 'E ST', and 'Court Street'
+    becomes 'COURT ST'.
+    """
+    # A unit designator followed by the unit number, or a '#' unit number, ends the street
+    unit = []
+    for index in range(2, len(words)):
+        if words[index] == "#" and index + 1 < len(words):
+            unit = ["#" + words[index + 1]] + words[index + 2:]
+        elif words[index].startswith("#"):
+            unit = words[index:]
+        elif index + 1 < len(words) and _is_one_of(words[index], UNIT_DESIGNATORS):
+            unit = [UNIT_DESIGNATORS.get(words[index], words[index])] + words[index + 1:]
+        else:
+            continue
+        words = words[:index]
+        break
+
+    number = words[:1] if words and any(char.isdigit() for char in words[0]) else []
+    name = words[len(number):]
+    pre, suffix, post = [], [], []
+    if len(name) >= 3 and _is_one_of(name[-1], DIRECTIONALS) and _is_one_of(name[-2], STREET_SUFFIXES):
+        post = [DIRECTIONALS.get(name[-1], name[-1])]
+        name = name[:-1]
+    if len(name) >= 2 and _is_one_of(name[-1], STREET_SUFFIXES):
+        suffix = [STREET_SUFFIXES.get(name[-1], name[-1])]
+        name = name[:-1]
+    if len(name) >= 2 and _is_one_of(name[0], DIRECTIONALS):
+        pre = [DIRECTIONALS.get(name[0], name[0])]
+        name = name[1:]
+    return number + pre + name + suffix + post + unit
+
+
+# Function to reduce an address string to a canonical key.
+def normalize_address(address: str) -> str:
+    """
+    Reduces an address to a canonical key shared by equivalent spellings.
+
+    The key is upper-cased, punctuation is dropped and whitespace is collapsed.
+    In the street line (the text before the first comma), street suffixes,
+    directionals and unit designators are abbreviated where they stand in that
+    position, so '807 Farson Street, Belpre OH' and '807 farson st., belpre OH'
+    share one key while 'East Street' and 'E Street' do not. The key is only
+    meant for matching; geocode the original address.
+
+    Args:
+        address (str): The address string.
+
+    Returns:
+        str: The canonical key of the address.
+    """
+    street, _, rest = str(address).upper().partition(",")
+    words = _normalize_street(_PUNCTUATION.sub(" ", street).split())
+    return " ".join(words + _PUNCTUATION.sub(" ", rest).split())
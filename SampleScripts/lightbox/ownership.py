@@ -0,0 +1,280 @@
+import sqlite3
+import time
+import requests
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+from .client import LightBoxClient
+
+
+# ----------------------------
+# Union-Find
+# ----------------------------
+
+class UnionFind:
+    """
+    Disjoint sets of parcel IDs, merged as common-ownership links are discovered.
+
+    Uses union by size and path compression, so merging and finding clusters
+    stays close to constant time however large the holdings grow.
+    """
+
+    def __init__(self):
+        self._parents: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+
+    def add(self, item: str) -> None:
+        if item not in self._parents:
+            self._parents[item] = item
+            self._sizes[item] = 1
+
+    def find(self, item: str) -> str:
+        """
+        Returns the representative of the set holding item, adding it as a singleton when new.
+        """
+        self.add(item)
+        root = item
+        while self._parents[root] != root:
+            root = self._parents[root]
+        while self._parents[item] != root:
+            self._parents[item], item = root, self._parents[item]
+        return root
+
+    def union(self, first: str, second: str) -> str:
+        """
+        Merges the sets holding first and second, and returns the representative of the merged set.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return first
+        if self._sizes[first] < self._sizes[second]:
+            first, second = second, first
+        self._parents[second] = first
+        self._sizes[first] += self._sizes.pop(second)
+        return first
+
+    def groups(self) -> List[List[str]]:
+        """
+        Returns every set as a sorted list of items, largest set first.
+        """
+        groups: Dict[str, List[str]] = {}
+        for item in self._parents:
+            groups.setdefault(self.find(item), []).append(item)
+        return sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group[0]))
+
+
+# ----------------------------
+# Ownership Graph
+# ----------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parcels (
+    country_code TEXT NOT NULL,
+    id TEXT NOT NULL,
+    expanded_at REAL NOT NULL,
+    PRIMARY KEY (country_code, id)
+);
+CREATE TABLE IF NOT EXISTS links (
+    country_code TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (country_code, source, target)
+);
+"""
+
+
+class OwnershipGraph:
+    """
+    Common-ownership adjacency graph persisted in SQLite.
+
+    A parcel is 'expanded' once its adjacent parcels with a common owner have
+    been fetched and stored. Later crawls read the links of expanded parcels
+    from the graph instead of the API, so only the frontier is fetched again.
+
+    Args:
+        path (str): Path of the SQLite database file; ':memory:' keeps the graph for this process only.
+        max_age (float): Seconds after which an expanded parcel is fetched again; never by default.
+    """
+
+    def __init__(self, path: str = ":memory:", max_age: Optional[float] = None):
+        self.path = path
+        self.max_age = max_age
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+
+    def neighbors(self, country_code: str, id: str) -> Optional[List[str]]:
+        """
+        Returns the stored links of a parcel, or None when it was never expanded or is too old.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID of the parcel.
+        """
+        country_code = country_code.upper()
+        row = self._connection.execute(
+            "SELECT expanded_at FROM parcels WHERE country_code = ? AND id = ?", (country_code, id)
+        ).fetchone()
+        if row is None or (self.max_age is not None and time.time() - row[0] > self.max_age):
+            return None
+        rows = self._connection.execute(
+            "SELECT target FROM links WHERE country_code = ? AND source = ? ORDER BY target", (country_code, id)
+        )
+        return [target for target, in rows]
+
+    def record(self, country_code: str, id: str, neighbors: Iterable[str]) -> None:
+        """
+        Stores the links of a parcel and marks it expanded, replacing what was stored before.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            id (str): The LightBox ID of the parcel.
+            neighbors (Iterable[str]): The LightBox IDs of its adjacent parcels with a common owner.
+        """
+        country_code = country_code.upper()
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.execute("DELETE FROM links WHERE country_code = ? AND source = ?", (country_code, id))
+            connection.executemany(
+                "INSERT OR IGNORE INTO links VALUES (?, ?, ?)",
+                [(country_code, id, neighbor) for neighbor in neighbors]
+            )
+            connection.execute("INSERT OR REPLACE INTO parcels VALUES (?, ?, ?)", (country_code, id, time.time()))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict:
+        """
+        Returns the size of the stored graph.
+
+        Returns:
+            dict: parcels (expanded) and links.
+        """
+        parcels, = self._connection.execute("SELECT COUNT(*) FROM parcels").fetchone()
+        links, = self._connection.execute("SELECT COUNT(*) FROM links").fetchone()
+        return {"parcels": parcels, "links": links}
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+# ----------------------------
+# Ownership Crawler
+# ----------------------------
+
+# Function to fetch the adjacent parcels of one parcel that share its owner.
+def fetch_common_owners(client: LightBoxClient, country_code: str, id: str) -> Dict:
+    """
+    Fetches the adjacent parcels with a common owner of one parcel.
+
+    Args:
+        client (LightBoxClient): The client used to send the request.
+        country_code (str): ISO 3166 alpha-2 country code.
+        id (str): The LightBox ID of the parcel.
+
+    Returns:
+        dict: {'data': <LightBox IDs of the adjacent parcels>} on success, {'error': <description>} otherwise.
+    """
+    try:
+        # Only the IDs are needed; streaming them skips decoding the parcel geometries
+        parcels = list(client.iter_common_owners(country_code, id, "true", fields=["id"]))
+    except requests.HTTPError as error:
+        return {"error": f"Status Code: {error.response.status_code}"}
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+    return {"data": [parcel["id"] for parcel in parcels if parcel.get("id") and parcel["id"] != id]}
+
+
+# Function to expand ownership clusters breadth-first from seed parcels.
+def crawl_ownership(
+        client: LightBoxClient,
+        seeds: Iterable[str],
+        country_code: str = "US",
+        graph: Optional[OwnershipGraph] = None,
+        max_workers: int = 8,
+        max_parcels: Optional[int] = None
+) -> Dict:
+    """
+    Finds the contiguous holdings of the seed parcels by following common-ownership links.
+
+    Parcels are expanded breadth-first, with up to max_workers requests in
+    flight. Every parcel reached is remembered, so each one is fetched at most
+    once per crawl however many of its neighbors link back to it. Links are
+    merged into clusters with union-find and stored in the graph; parcels the
+    graph already expanded are not fetched again, so a rerun only expands the
+    frontier left by earlier crawls.
+
+    Args:
+        client (LightBoxClient): The client used to send the requests.
+        seeds (Iterable[str]): LightBox IDs of the parcels to start from.
+        country_code (str): ISO 3166 alpha-2 country code of the parcels.
+        graph (OwnershipGraph): Graph the links are read from and stored in; a new in-memory graph by default.
+        max_workers (int): Maximum number of requests in flight at once.
+        max_parcels (int): Maximum number of parcels fetched from the API; unlimited by default.
+
+    Returns:
+        dict: clusters (lists of LightBox IDs, largest first), fetched and reused (number of parcels
+              expanded from the API and from the graph), frontier (LightBox IDs reached but not
+              expanded because of max_parcels) and errors ({LightBox ID: description}).
+    """
+    graph = graph or OwnershipGraph()
+    clusters = UnionFind()
+    visited = set()
+    queue = deque()
+    frontier = []
+    errors: Dict[str, str] = {}
+    fetched = reused = 0
+
+    def reach(id: str) -> None:
+        clusters.add(id)
+        if id not in visited:
+            visited.add(id)
+            queue.append(id)
+
+    def link(id: str, neighbors: List[str]) -> None:
+        for neighbor in neighbors:
+            clusters.union(id, neighbor)
+            reach(neighbor)
+
+    for seed in seeds:
+        reach(seed)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        while queue or in_flight:
+            # Fill the free workers in breadth-first order, expanding stored parcels on the way
+            while queue and len(in_flight) < max_workers:
+                id = queue.popleft()
+                neighbors = graph.neighbors(country_code, id)
+                if neighbors is not None:
+                    reused += 1
+                    link(id, neighbors)
+                elif max_parcels is None or fetched < max_parcels:
+                    fetched += 1
+                    in_flight[executor.submit(fetch_common_owners, client, country_code, id)] = id
+                else:
+                    frontier.append(id)
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                id = in_flight.pop(future)
+                result = future.result()
+                if "error" in result:
+                    # Left unexpanded in the graph, so the next crawl retries it
+                    errors[id] = result["error"]
+                    continue
+                graph.record(country_code, id, result["data"])
+                link(id, result["data"])
+
+    return {
+        "clusters": clusters.groups(),
+        "fetched": fetched,
+        "reused": reused,
+        "frontier": frontier,
+        "errors": errors,
+    }
@@ -0,0 +1,260 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Marks the end of the input on a stage queue
+_DONE = object()
+
+# Seconds between two checks of the stop signal by threads blocked on a queue
+_POLL_INTERVAL = 0.1
+
+
+# ----------------------------
+# Pipeline Definition
+# ----------------------------
+
+class PipelineItem:
+    """
+    One input travelling through the pipeline.
+
+    Attributes:
+        index (int): Position of the input in the input stream.
+        input: The original input.
+        value: The output of the last stage that ran.
+        error (str): Description of the failure that stopped the item, or None.
+        failed_stage (str): Name of the stage that failed, or None.
+    """
+    __slots__ = ("index", "input", "value", "error", "failed_stage")
+
+    def __init__(self, index: int, input: Any):
+        self.index = index
+        self.input = input
+        self.value = input
+        self.error = None
+        self.failed_stage = None
+
+
+class _Stage:
+    """
+    Counters and input queue of one stage.
+    """
+
+    def __init__(self, name: str, function: Callable, workers: int, queue_size: int):
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.reset(queue_size)
+
+    def reset(self, queue_size: int) -> None:
+        """
+        Starts a new run: an empty queue, zeroed counters and every worker running.
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self.running_workers = self.workers
+
+
+class StagedPipeline:
+    """
+    Runs dependent calls as a chain of worker pools connected by bounded queues.
+
+    Each stage has its own pool of worker threads reading from its input
+    queue, so stage N of one input overlaps stage N-1 of the next one. The
+    bounded queues apply back pressure: a slow stage makes earlier stages
+    wait instead of piling up inputs in memory. A stage function receives the
+    output of the previous stage; when it raises, the item skips the remaining
+    stages and carries the error.
+
+    Items are yielded in input order, so those finishing early wait for their
+    predecessors; at most max_in_flight items are between the input and the
+    caller at a time, which bounds that reorder buffer when one item is slow.
+
+    Args:
+        stages (Sequence[Tuple[str, Callable, int]]): (name, function, number of workers) of each stage, in order.
+        queue_size (int): Capacity of the queue in front of each stage.
+        max_in_flight (int): Maximum number of items taken from the input and not yet yielded;
+                             enough to fill every queue by default.
+    """
+
+    def __init__(self, stages: Sequence[Tuple[str, Callable, int]], queue_size: int = 100, max_in_flight: Optional[int] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight or queue_size * (len(stages) + 1)
+        self._stages = [_Stage(name, function, max(1, workers), queue_size) for name, function, workers in stages]
+        self._output = queue.Queue(maxsize=queue_size)
+        self._started_at = None
+        self._stop = threading.Event()
+        self._window = threading.Semaphore(self.max_in_flight)
+        self._feed_error: Optional[BaseException] = None
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """
+        Puts an item on a queue unless the run is stopped first; returns whether it was put.
+        """
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, source: queue.Queue):
+        """
+        Takes an item from a queue, or returns _DONE once the run is stopped.
+        """
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _work(self, position: int) -> None:
+        """
+        Worker loop of a stage: processes items until the end of the input or until the run is stopped.
+        """
+        stage = self._stages[position]
+        next_queue = self._stages[position + 1].queue if position + 1 < len(self._stages) else self._output
+        while True:
+            item = self._get(stage.queue)
+            if item is _DONE:
+                break
+            # Depth seen by this worker, counting the item just taken
+            depth = stage.queue.qsize() + 1
+            if depth > stage.max_queue_depth:
+                stage.max_queue_depth = depth
+            if item.error is None:
+                started_at = time.perf_counter()
+                try:
+                    item.value = stage.function(item.value)
+                    failed = False
+                except Exception as error:
+                    item.error = f"{type(error).__name__}: {error}"
+                    item.failed_stage = stage.name
+                    failed = True
+                with stage.lock:
+                    stage.processed += 1
+                    stage.errors += failed
+                    stage.busy_seconds += time.perf_counter() - started_at
+            if not self._put(next_queue, item):
+                return
+
+        # The last worker of a stage to finish passes the end of the input on
+        with stage.lock:
+            stage.running_workers -= 1
+            last = stage.running_workers == 0
+        if last:
+            following = self._stages[position + 1].workers if position + 1 < len(self._stages) else 1
+            for _ in range(following):
+                self._put(next_queue, _DONE)
+
+    def _feed(self, inputs: Iterable) -> None:
+        """
+        Puts the inputs on the first stage queue, then one end marker per worker.
+
+        An error raised by the input iterator is kept for run() to raise once
+        the items taken before it are out.
+        """
+        first = self._stages[0]
+        try:
+            for index, input in enumerate(inputs):
+                # Waiting for the caller to take an item whenever max_in_flight are already out
+                while not self._window.acquire(timeout=_POLL_INTERVAL):
+                    if self._stop.is_set():
+                        return
+                if not self._put(first.queue, PipelineItem(index, input)):
+                    return
+        except BaseException as error:
+            self._feed_error = error
+        for _ in range(first.workers):
+            self._put(first.queue, _DONE)
+
+    def run(self, inputs: Iterable) -> Iterator[PipelineItem]:
+        """
+        Runs every input through the stages and yields the finished items in input order.
+
+        A pipeline runs one input stream at a time; each run starts with fresh
+        queues and counters. When the caller stops early (e.g. breaks out of
+        the loop), the worker threads are stopped and the queues emptied.
+
+        Args:
+            inputs (Iterable): The inputs of the first stage, consumed lazily.
+
+        Yields:
+            PipelineItem: The finished items; value holds the output of the last stage.
+
+        Raises:
+            Exception: The error raised by the input iterator, after the items taken before it.
+        """
+        for stage in self._stages:
+            stage.reset(self.queue_size)
+        self._output = queue.Queue(maxsize=self.queue_size)
+        self._stop.clear()
+        self._window = threading.Semaphore(self.max_in_flight)
+        self._feed_error = None
+        self._started_at = time.perf_counter()
+
+        threads = [threading.Thread(target=self._feed, args=(inputs,), daemon=True)]
+        for position, stage in enumerate(self._stages):
+            threads += [threading.Thread(target=self._work, args=(position,), daemon=True) for _ in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            # Items finish out of order; hold early ones until their predecessors are out
+            finished: Dict[int, PipelineItem] = {}
+            next_index = 0
+            while True:
+                item = self._output.get()
+                if item is _DONE:
+                    break
+                finished[item.index] = item
+                while next_index in finished:
+                    self._window.release()
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            # Unblocking every thread when the caller stopped early, then dropping the items left
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            for target in [stage.queue for stage in self._stages] + [self._output]:
+                while not target.empty():
+                    target.get_nowait()
+
+        if self._feed_error is not None:
+            raise self._feed_error
+
+    def stats(self) -> List[Dict]:
+        """
+        Returns the throughput and queue depth of every stage; safe to call while running.
+
+        Returns:
+            List[dict]: Per stage: name, workers, processed, errors, throughput (items per second
+                        since the start), utilization (fraction of worker time spent busy),
+                        queue_depth (current) and max_queue_depth.
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        stats = []
+        for stage in self._stages:
+            with stage.lock:
+                processed, errors, busy_seconds = stage.processed, stage.errors, stage.busy_seconds
+            stats.append({
+                "name": stage.name,
+                "workers": stage.workers,
+                "processed": processed,
+                "errors": errors,
+                "throughput": processed / elapsed if elapsed else 0.0,
+                "utilization": busy_seconds / (elapsed * stage.workers) if elapsed else 0.0,
+                "queue_depth": stage.queue.qsize(),
+                "max_queue_depth": max(stage.max_queue_depth, stage.queue.qsize()),
+            })
+        return stats
@@ -0,0 +1,119 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+# Default number of suggestions the autocomplete endpoint returns at most
+DEFAULT_PAGE_SIZE = 10
+
+
+# Function to normalize a typed prefix for cache lookups.
+def normalize_prefix(text: str) -> str:
+    """
+    Normalizes a partial address: case-folded, with runs of whitespace collapsed.
+
+    Unlike normalize_address, words are not abbreviated, since the last word of
+    a prefix is usually incomplete.
+
+    Args:
+        text (str): The partial address.
+
+    Returns:
+        str: The normalized prefix.
+    """
+    return re.sub(r"\s+", " ", str(text)).strip().casefold()
+
+
+class PrefixCache:
+    """
+    Autocomplete cache that refines cached suggestions locally as the prefix grows.
+
+    Suggestions are stored per (country code, normalized prefix). A lookup
+    first tries the exact prefix, then walks its shorter prefixes from the
+    longest down: when one of them holds a complete result set (fewer
+    suggestions than the endpoint's page size) whose labels all start with
+    that prefix, the suggestions for the longer prefix are a subset of it and
+    are filtered locally, with no network call. Entries are evicted least
+    recently used first.
+
+    Args:
+        max_entries (int): Maximum number of cached prefixes.
+        page_size (int): Maximum number of suggestions returned by the endpoint; a
+                         shorter result set is complete.
+    """
+
+    def __init__(self, max_entries: int = 10000, page_size: int = DEFAULT_PAGE_SIZE):
+        self.max_entries = max_entries
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        # (country code, prefix) -> (suggestions, refinable), least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[List[Dict], bool]]" = OrderedDict()
+        self._counters = {"hits": 0, "refined": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _label(suggestion: Dict) -> str:
+        return normalize_prefix(suggestion.get("label", ""))
+
+    def lookup(self, text: str, country_code: str) -> Optional[List[Dict]]:
+        """
+        Returns the suggestions for a partial address, or None when the API must be asked.
+
+        Args:
+            text (str): The partial address.
+            country_code (str): The ISO 3166-1 alpha-2 country code.
+        """
+        prefix = normalize_prefix(text)
+        country_code = str(country_code).upper()
+        with self._lock:
+            entry = self._entries.get((country_code, prefix))
+            if entry is not None:
+                self._entries.move_to_end((country_code, prefix))
+                self._counters["hits"] += 1
+                return entry[0]
+
+            for length in range(len(prefix) - 1, 0, -1):
+                entry = self._entries.get((country_code, prefix[:length]))
+                if entry is not None and entry[1]:
+                    self._entries.move_to_end((country_code, prefix[:length]))
+                    self._counters["refined"] += 1
+                    return [suggestion for suggestion in entry[0] if self._label(suggestion).startswith(prefix)]
+
+            self._counters["misses"] += 1
+            return None
+
+    def add(self, text: str, country_code: str, suggestions: List[Dict]) -> None:
+        """
+        Stores the suggestions returned by the API for a partial address.
+
+        Args:
+            text (str): The partial address.
+            country_code (str): The ISO 3166-1 alpha-2 country code.
+            suggestions (List[dict]): The 'addresses' returned by the autocomplete endpoint.
+        """
+        prefix = normalize_prefix(text)
+        key = (str(country_code).upper(), prefix)
+        # Only a complete, purely prefix-matched result set can answer longer prefixes
+        refinable = len(suggestions) < self.page_size and all(
+            self._label(suggestion).startswith(prefix) for suggestion in suggestions
+        )
+        with self._lock:
+            self._entries[key] = (suggestions, refinable)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict:
+        """
+        Returns the hit/miss counters and the size of the cache.
+
+        Returns:
+            dict: hits (exact prefix), refined (filtered from a shorter prefix), misses,
+                  evictions, hit_rate (share of lookups answered locally) and entries.
+        """
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries))
+        lookups = stats["hits"] + stats["refined"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["refined"]) / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,206 @@
+import multiprocessing
+import random
+import threading
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+
+# ----------------------------
+# Rate Limiter
+# ----------------------------
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of requests.
+
+    Tokens are added continuously at 'rate' per second, up to 'capacity'.
+    Each request takes one token and waits when none is left, so bursts of
+    up to 'capacity' requests pass immediately and the sustained rate never
+    exceeds 'rate'.
+
+    Args:
+        rate (float): Sustained number of requests allowed per second.
+        capacity (float): Maximum burst size; defaults to one second worth of requests.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        # Tokens left, time of the last refill and end of the current pause (monotonic clock)
+        self._state = [self.capacity, time.monotonic(), 0.0]
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float, borrow: bool = True) -> float:
+        """
+        Takes tokens from the bucket and returns how long to wait for them.
+
+        With borrow, the tokens are always taken, possibly leaving the bucket
+        negative; without, they are only taken when available, and otherwise
+        the time until they are is returned. No tokens are added while the
+        bucket is paused.
+        """
+        with self._lock:
+            state = self._state
+            now = time.monotonic()
+            refill_from = max(state[1], state[2])
+            if now > refill_from:
+                state[0] = min(self.capacity, state[0] + (now - refill_from) * self.rate)
+            state[1] = now
+            paused = max(0.0, state[2] - now)
+            if not borrow and (paused or state[0] < tokens):
+                return paused + max(0.0, tokens - state[0]) / self.rate
+            state[0] -= tokens
+            return paused + (-state[0] / self.rate if state[0] < 0 else 0.0)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Blocks until the requested tokens are available and takes them.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Takes the requested tokens only if they are available right away.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: 0.0 when the tokens were taken, otherwise the seconds until they will be available.
+        """
+        return self._reserve(tokens, borrow=False)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Withholds new tokens for a number of seconds, e.g. after a 429 response.
+
+        Pauses overlap rather than add up: concurrent 429s each asking for one
+        second hold the bucket for one second, not one second per response.
+        The burst saved up before the pause is dropped.
+
+        Args:
+            seconds (float): Seconds during which no new request may start.
+        """
+        with self._lock:
+            state = self._state
+            state[0] = min(state[0], 0.0)
+            state[2] = max(state[2], time.monotonic() + seconds)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by several processes, e.g. the shard workers of one batch job.
+
+    The tokens live in shared memory behind a process-shared lock, so every
+    process drawing from the bucket counts against one combined rate, and a
+    pause after a 429 holds back all of them. It must reach the worker
+    processes when they are created, e.g. in the initargs of a process pool.
+
+    Args:
+        rate (float): Sustained number of requests allowed per second, across all processes.
+        capacity (float): Maximum burst size; defaults to one second worth of requests.
+        context (multiprocessing.context.BaseContext): Context the worker processes are started from.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, context=None):
+        super().__init__(rate, capacity)
+        context = context or multiprocessing.get_context()
+        # The monotonic clock is system-wide, so refill and pause times compare across processes
+        self._state = context.RawArray("d", self._state)
+        self._lock = context.Lock()
+
+
+# ----------------------------
+# Retry Policy
+# ----------------------------
+
+# HTTP status codes worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for throttled and failed requests.
+
+    Retry-After headers sent with 429 and 503 responses take precedence
+    over the computed backoff.
+
+    Args:
+        max_retries (int): Maximum number of retries per request.
+        backoff_factor (float): Base delay in seconds, doubled on each retry.
+        backoff_max (float): Upper bound in seconds of any single delay.
+        status_codes (Iterable[int]): HTTP status codes that are retried.
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 5,
+            backoff_factor: float = 0.5,
+            backoff_max: float = 60.0,
+            status_codes: Iterable[int] = RETRY_STATUS_CODES
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.status_codes = frozenset(status_codes)
+
+    def should_retry(self, attempt: int, response: Optional[requests.Response]) -> bool:
+        """
+        Tells whether a request should be retried.
+
+        Args:
+            attempt (int): Number of retries already made.
+            response (requests.Response): The response, or None after a connection error.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in self.status_codes
+
+    def delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """
+        Returns the number of seconds to wait before the next retry.
+
+        Args:
+            attempt (int): Number of retries already made.
+            response (requests.Response): The response, or None after a connection error.
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+
+
+# Function to parse the value of a Retry-After header.
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value.
+
+    Returns:
+        float: Seconds to wait, or None when missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
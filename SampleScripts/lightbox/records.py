@@ -0,0 +1,326 @@
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Union, get_args, get_origin, get_type_hints
+
+
+# ----------------------------
+# Geocode Records
+# ----------------------------
+
+# Outcome of each geocode request
+MATCH, NO_MATCH, FAILED = "match", "no_match", "failed"
+
+
+# Function to read a nested value of a JSON object, or None when any level is missing.
+def _dig(data: Optional[Dict], *keys):
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class GeocodeRecord(NamedTuple):
+    """
+    Result of geocoding one address: the first match, or nulls with the outcome in status.
+    """
+    address: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    confidence_score: Optional[float]
+    precision_code: Optional[str]
+    status: str
+    status_code: Optional[int]
+
+    @classmethod
+    def from_response(cls, address: str, response) -> "GeocodeRecord":
+        """
+        Builds the record of an address from its geocode response.
+
+        Args:
+            address (str): The address string that was geocoded.
+            response (requests.Response): The response of the geocode endpoint.
+        """
+        if response.status_code != 200:
+            return cls(address, None, None, None, None, FAILED, response.status_code)
+        addresses = response.json().get("addresses")
+        if not addresses:
+            return cls(address, None, None, None, None, NO_MATCH, response.status_code)
+        # Extracting data from the first match
+        first_match = addresses[0]
+        point = _dig(first_match, "location", "representativePoint")
+        return cls(
+            address,
+            _dig(point, "latitude"),
+            _dig(point, "longitude"),
+            _dig(first_match, "$metadata", "geocode", "confidence", "score"),
+            _dig(first_match, "$metadata", "geocode", "precisionCode"),
+            MATCH,
+            response.status_code,
+        )
+
+
+# ----------------------------
+# Parcel Records
+# ----------------------------
+
+class ParcelRecord(NamedTuple):
+    """
+    Main attributes of a parcel, without its geometry.
+    """
+    id: str
+    fips: Optional[str]
+    apn: Optional[str]
+    county: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    land_use: Optional[str]
+    lot_area: Optional[float]
+
+    @classmethod
+    def from_json(cls, parcel: Dict) -> "ParcelRecord":
+        """
+        Builds the record of one item of the 'parcels' array of a parcel response.
+        """
+        point = _dig(parcel, "location", "representativePoint")
+        return cls(
+            parcel.get("id"),
+            parcel.get("fips"),
+            parcel.get("parcelApn"),
+            parcel.get("county"),
+            _dig(point, "latitude"),
+            _dig(point, "longitude"),
+            _dig(parcel, "landUse", "normalized", "categoryDescription"),
+            _dig(parcel, "derived", "calculatedLotArea"),
+        )
+
+
+class AssessmentRecord(NamedTuple):
+    """
+    Main values of an assessment record.
+    """
+    id: str
+    parcel_id: Optional[str]
+    apn: Optional[str]
+    fips: Optional[str]
+    avm: Optional[float]
+    assessed_total: Optional[float]
+    market_total: Optional[float]
+    year_built: Optional[int]
+    units: Optional[float]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+    @classmethod
+    def from_json(cls, assessment: Dict) -> "AssessmentRecord":
+        """
+        Builds the record of one item of the 'assessments' array of an assessment response.
+        """
+        point = _dig(assessment, "location", "representativePoint")
+        year_built = _dig(assessment, "primaryStructure", "yearBuilt")
+        return cls(
+            assessment.get("id"),
+            _dig(assessment, "parcel", "id"),
+            assessment.get("apn"),
+            assessment.get("fips"),
+            assessment.get("avm"),
+            _dig(assessment, "assessedValue", "total"),
+            _dig(assessment, "marketValue", "total"),
+            int(year_built) if year_built else None,
+            _dig(assessment, "primaryStructure", "units"),
+            _dig(point, "latitude"),
+            _dig(point, "longitude"),
+        )
+
+
+# ----------------------------
+# Hazard Records
+# ----------------------------
+
+class FloodHazardRecord(NamedTuple):
+    """
+    FEMA flood hazard (NFHL) status of a parcel.
+    """
+    parcel_id: str
+    fips: Optional[str]
+    dfirm_id: Optional[str]
+    sfha: Optional[bool]
+    in_100_year: Optional[bool]
+    zones: Optional[str]
+    effective_date: Optional[str]
+
+    @classmethod
+    def from_json(cls, parcel_id: str, nfhl: Dict) -> "FloodHazardRecord":
+        """
+        Builds the record of one item of the 'nfhls' array of a flood hazard response.
+        """
+        zones = [zone.get("zone") for zone in nfhl.get("zones") or [] if zone.get("zone")]
+        return cls(
+            parcel_id,
+            nfhl.get("fips"),
+            nfhl.get("dfirmId"),
+            nfhl.get("sfha"),
+            nfhl.get("isIn100Year"),
+            ",".join(zones) or None,
+            nfhl.get("effectiveDate"),
+        )
+
+
+class WetlandRecord(NamedTuple):
+    """
+    One wetland on or near a parcel, without its geometry.
+    """
+    parcel_id: str
+    type: Optional[str]
+    classification_code: Optional[str]
+    wetland_area: Optional[float]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+    @classmethod
+    def from_json(cls, parcel_id: str, wetland: Dict) -> "WetlandRecord":
+        """
+        Builds the record of one item of the 'wetlands' array of a wetlands response.
+        """
+        point = _dig(wetland, "location", "representativePoint")
+        return cls(
+            parcel_id,
+            wetland.get("type"),
+            wetland.get("classificationCode"),
+            wetland.get("wetlandArea"),
+            _dig(point, "latitude"),
+            _dig(point, "longitude"),
+        )
+
+
+# ----------------------------
+# Columnar Storage
+# ----------------------------
+
+# Storage of each field type: floats as float64 (NaN for null), integers as int64 and
+# booleans as int8, both with a validity mask; anything else in a list
+_ARRAY_TYPECODES = {float: "d", int: "q", bool: "b"}
+
+
+# Function to find how a field of a record type is stored.
+def _field_kind(annotation) -> Optional[type]:
+    """
+    Returns float, int or bool for numeric fields (Optional or not), None for any other field.
+    """
+    if get_origin(annotation) is Union:
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        annotation = arguments[0] if len(arguments) == 1 else None
+    return annotation if annotation in _ARRAY_TYPECODES else None
+
+
+class RecordColumns:
+    """
+    Column-oriented collection of records of one NamedTuple type.
+
+    Numeric fields are appended to typed arrays (8 bytes per float instead of
+    a Python float object per value, plus the record holding it), other fields
+    to plain lists. Numeric columns convert to NumPy arrays with one memory
+    copy each, and from there to a pandas DataFrame or an Arrow table; NumPy,
+    pandas and pyarrow are only imported by the conversion methods.
+
+    Args:
+        record_type (type): The NamedTuple type of the records, e.g. GeocodeRecord.
+        records (Iterable): Records to add right away.
+    """
+
+    def __init__(self, record_type: type, records: Iterable[NamedTuple] = ()):
+        self.record_type = record_type
+        self.fields = record_type._fields
+        hints = get_type_hints(record_type)
+        self._kinds = {field: _field_kind(hints.get(field)) for field in self.fields}
+        self._values: Dict[str, Union[array, List]] = {}
+        self._masks: Dict[str, bytearray] = {}
+        for field, kind in self._kinds.items():
+            self._values[field] = array(_ARRAY_TYPECODES[kind]) if kind else []
+            if kind in (int, bool):
+                self._masks[field] = bytearray()
+        self._length = 0
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, record: NamedTuple) -> None:
+        """
+        Adds one record.
+        """
+        for field, value in zip(self.fields, record):
+            kind = self._kinds[field]
+            if kind is float:
+                self._values[field].append(math.nan if value is None else value)
+            elif kind is None:
+                self._values[field].append(value)
+            else:
+                self._values[field].append(0 if value is None else value)
+                self._masks[field].append(value is None)
+        self._length += 1
+
+    def extend(self, records: Iterable[NamedTuple]) -> None:
+        """
+        Adds records, e.g. straight from a generator.
+        """
+        for record in records:
+            self.append(record)
+
+    def __iter__(self) -> Iterator[NamedTuple]:
+        for index in range(self._length):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> NamedTuple:
+        values = []
+        for field in self.fields:
+            value = self._values[field][index]
+            kind = self._kinds[field]
+            if kind is float:
+                value = None if math.isnan(value) else value
+            elif kind is not None:
+                value = None if self._masks[field][index] else kind(value)
+            values.append(value)
+        return self.record_type(*values)
+
+    def column(self, field: str):
+        """
+        Returns the values of one field: a NumPy array for numeric fields (NaN or masked
+        for nulls), a list otherwise.
+        """
+        kind = self._kinds[field]
+        if kind is None:
+            return self._values[field]
+        import numpy as np
+        # Copied (a single memcpy) so that the arrays can keep growing while the result is in use
+        values = np.frombuffer(self._values[field], dtype={float: np.float64, int: np.int64, bool: np.int8}[kind]).copy()
+        if kind is float:
+            return values
+        mask = np.frombuffer(bytes(self._masks[field]), dtype=np.bool_).copy()
+        return np.ma.MaskedArray(values.astype(bool) if kind is bool else values, mask=mask)
+
+    def to_dataframe(self):
+        """
+        Returns the records as a pandas DataFrame: float64 for floats, nullable Int64 and
+        boolean for integers and booleans, object columns otherwise.
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for field in self.fields:
+            column = self.column(field)
+            if isinstance(column, np.ma.MaskedArray):
+                array_type = pd.arrays.BooleanArray if column.dtype == np.bool_ else pd.arrays.IntegerArray
+                column = array_type(column.data, column.mask)
+            elif isinstance(column, list):
+                column = pd.Series(column, dtype=object)
+            data[field] = column
+        return pd.DataFrame(data, columns=list(self.fields))
+
+    def to_arrow(self):
+        """
+        Returns the records as a pyarrow Table, with nulls where values are missing.
+        """
+        import pyarrow as pa
+        return pa.Table.from_pandas(self.to_dataframe(), preserve_index=False)
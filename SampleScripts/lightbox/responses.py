@@ -0,0 +1,58 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Dict, Optional
+
+
+# Function to rebuild a requests.Response from stored parts.
+def build_response(status_code: int, content: bytes, headers: Optional[Dict] = None, url: str = "") -> requests.Response:
+    """
+    Builds a requests.Response that behaves like one returned by the LightBox API.
+
+    Used to answer requests locally (e.g., from a cache) while callers keep
+    using status_code, json() and headers as usual.
+
+    Args:
+        status_code (int): The HTTP status code.
+        content (bytes): The raw response body.
+        headers (dict): The response headers.
+        url (str): The URL the response is for.
+
+    Returns:
+        requests.Response: The rebuilt response.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.encoding = "utf-8"
+    response.reason = requests.status_codes._codes.get(status_code, ("",))[0].replace("_", " ").upper()
+    return response
+
+
+# Function to compute the full URL of a request without sending it.
+def request_url(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Returns the URL, including the encoded query string, that requests would send.
+
+    Args:
+        url (str): The URL without query string.
+        params (dict): Query string parameters.
+    """
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+# Function to estimate the number of bytes a request puts on the wire.
+def request_size(request: Optional[requests.PreparedRequest]) -> int:
+    """
+    Returns the approximate size of a request: request line, headers and body.
+
+    Args:
+        request (requests.PreparedRequest): The request that was sent.
+    """
+    if request is None:
+        return 0
+    size = len(request.method or "") + len(request.url or "") + len(" HTTP/1.1\r\n")
+    size += sum(len(name) + len(value) + 4 for name, value in request.headers.items())
+    body = request.body or b""
+    return size + len(body) + 2
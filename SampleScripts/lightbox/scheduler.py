@@ -0,0 +1,177 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from .metrics import Histogram
+from .ratelimit import TokenBucket
+
+
+# ----------------------------
+# Priority Classes
+# ----------------------------
+
+# Classes of requests, from the most to the least latency-sensitive
+INTERACTIVE, NORMAL, BATCH = "interactive", "normal", "batch"
+
+# Share of the rate budget each class gets while every class has requests waiting
+DEFAULT_WEIGHTS = {INTERACTIVE: 100.0, NORMAL: 10.0, BATCH: 1.0}
+
+# Class of the requests of each endpoint, when the calling code did not set one
+DEFAULT_PRIORITIES = {"autocomplete": INTERACTIVE}
+
+# Upper bounds in seconds of the queue wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("lightbox_request_priority", default=None)
+
+
+# Function to set the class of the requests made by a block of code.
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Runs the requests made inside the block with a priority class, whatever their endpoint.
+
+    The class is held in a context variable, so it follows the code into
+    threads only when their tasks run in a copy of the caller's context
+    (contextvars.copy_context().run), as the batch helpers of the sample scripts do.
+
+    Args:
+        priority (str): INTERACTIVE, NORMAL, BATCH or another class of the scheduler.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# Function to read the priority class set by request_priority.
+def current_priority() -> Optional[str]:
+    return _priority.get()
+
+
+# ----------------------------
+# Priority Scheduler
+# ----------------------------
+
+class PriorityScheduler:
+    """
+    Hands out the tokens of a rate limiter to waiting requests, by priority class.
+
+    Each class has its own queue. Whenever a token is available it goes to
+    the head of one queue, chosen by stride scheduling: under contention,
+    each class gets a share of the rate budget proportional to its weight,
+    and a class with nothing waiting leaves its share to the others. A class
+    whose queue was empty rejoins at the current virtual time, so it never
+    saves up credit. With the default weights, an interactive request only
+    waits for the next token, while batch requests absorb the leftover
+    capacity and still get 1 token in 101 under full interactive load.
+
+    A request arriving with a higher share preempts the head that is waiting
+    for the next token. The scheduler can be shared by several clients; the
+    wait of every request in its queue is recorded per class.
+
+    Args:
+        rate_limiter (TokenBucket): The rate budget to share, e.g. TokenBucket(10) for 10 requests per second.
+        weights (dict): Weight of each priority class; DEFAULT_WEIGHTS by default.
+    """
+
+    def __init__(self, rate_limiter: TokenBucket, weights: Optional[Dict[str, float]] = None):
+        weights = dict(weights or DEFAULT_WEIGHTS)
+        if not weights or any(weight <= 0 for weight in weights.values()):
+            raise ValueError(f"weights must be positive, got {weights}")
+        self.rate_limiter = rate_limiter
+        self.weights = weights
+        self._condition = threading.Condition()
+        self._queues: Dict[str, deque] = {priority: deque() for priority in weights}
+        # Virtual time of the next grant of each class, and of the last grant overall
+        self._passes = {priority: 0.0 for priority in weights}
+        self._virtual_time = 0.0
+        self._waits = {priority: Histogram(WAIT_BUCKETS) for priority in weights}
+        self._max_waits = {priority: 0.0 for priority in weights}
+
+    def _next_class(self) -> Optional[str]:
+        """
+        Returns the class whose head gets the next token; the lock must be held.
+        """
+        waiting = [priority for priority, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda priority: (self._passes[priority], -self.weights[priority]))
+
+    def acquire(self, priority: str = NORMAL) -> float:
+        """
+        Blocks until the scheduler grants the request a token of the rate limiter.
+
+        Args:
+            priority (str): The priority class of the request.
+
+        Returns:
+            float: Seconds spent waiting in the queue (0.0 when a token was granted right away).
+        """
+        queue = self._queues.get(priority)
+        if queue is None:
+            raise ValueError(f"Unknown priority class '{priority}', expected one of {list(self._queues)}")
+
+        ticket = object()
+        started_at = time.monotonic()
+        waited = False
+        with self._condition:
+            if not queue:
+                self._passes[priority] = max(self._passes[priority], self._virtual_time)
+            queue.append(ticket)
+            # Waking the current head, which this request may preempt
+            self._condition.notify_all()
+            while True:
+                head_class = self._next_class()
+                if self._queues[head_class][0] is ticket:
+                    wait = self.rate_limiter.try_acquire()
+                    if wait == 0.0:
+                        break
+                    # Sleeping until the next token, unless a request of a higher share arrives first
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+                waited = True
+
+            queue.popleft()
+            self._virtual_time = self._passes[priority]
+            self._passes[priority] += 1.0 / self.weights[priority]
+            self._condition.notify_all()
+
+            seconds = time.monotonic() - started_at if waited else 0.0
+            self._waits[priority].observe(seconds)
+            self._max_waits[priority] = max(self._max_waits[priority], seconds)
+        return seconds
+
+    def pause(self, seconds: float) -> None:
+        """
+        Withholds new tokens for a number of seconds, e.g. after a 429 response.
+        """
+        self.rate_limiter.pause(seconds)
+
+    def stats(self) -> Dict:
+        """
+        Returns the queue wait of the requests of each class.
+
+        Returns:
+            dict: {priority: {'requests', 'waiting' (requests in the queue now), 'wait_sum',
+                  'wait_max', 'wait_p50', 'wait_p95', 'wait_p99'}}, in seconds. Quantiles
+                  are bucket upper bounds.
+        """
+        with self._condition:
+            return {
+                priority: {
+                    "requests": histogram.count,
+                    "waiting": len(self._queues[priority]),
+                    "wait_sum": histogram.sum,
+                    "wait_max": self._max_waits[priority],
+                    "wait_p50": histogram.quantile(0.50),
+                    "wait_p95": histogram.quantile(0.95),
+                    "wait_p99": histogram.quantile(0.99),
+                }
+                for priority, histogram in self._waits.items()
+            }
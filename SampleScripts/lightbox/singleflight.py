@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """
+    One call in flight, awaited by every caller asking for the same key.
+    """
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one.
+
+    While a call for a key is in flight, further callers asking for the same
+    key wait for it and receive its result (or its exception) instead of
+    making their own call. Once the call completes the key is forgotten, so
+    later callers start a fresh call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters = {"calls": 0, "collapsed": 0}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Runs function for key unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            function (Callable): The call to make when none is in flight for key.
+
+        Returns:
+            The result of the call, shared by every caller that waited for it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["calls"] += 1
+            else:
+                self._counters["collapsed"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict:
+        """
+        Returns the number of calls made and of calls collapsed into one in flight.
+
+        Returns:
+            dict: calls, collapsed and in_flight.
+        """
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
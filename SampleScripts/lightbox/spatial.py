@@ -0,0 +1,479 @@
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# ----------------------------
+# Geometry Helpers
+# ----------------------------
+
+# Meters per unit accepted by the 'bufferUnit' parameter
+BUFFER_UNITS = {"m": 1.0, "km": 1000.0, "ft": 0.3048, "mi": 1609.344}
+
+EARTH_RADIUS_M = 6371008.8
+
+# Meters per degree of latitude
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+_POINT_WKT = re.compile(r"^\s*POINT\s*\(\s*([-+0-9.eE]+)\s+([-+0-9.eE]+)\s*\)\s*$", re.IGNORECASE)
+
+
+# Function to read the coordinates of a WKT point.
+def parse_point_wkt(wkt: str) -> Optional[Tuple[float, float]]:
+    """
+    Parses a 'POINT(longitude latitude)' WKT string.
+
+    Args:
+        wkt (str): The geometry expressed in WKT format.
+
+    Returns:
+        Tuple[float, float]: The longitude and latitude, or None when wkt is not a valid point.
+    """
+    match = _POINT_WKT.match(str(wkt))
+    if match is None:
+        return None
+    longitude, latitude = float(match.group(1)), float(match.group(2))
+    if not (-180 <= longitude <= 180 and -90 <= latitude <= 90):
+        return None
+    return longitude, latitude
+
+
+# Function to compute the great-circle distance between two points.
+def haversine_m(longitude1: float, latitude1: float, longitude2: float, latitude2: float) -> float:
+    """
+    Returns the great-circle distance in meters between two points given in degrees.
+    """
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(longitude2 - longitude1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+# A ring of a polygon: its (longitude, latitude) vertices, the first repeated at the end
+Ring = List[Tuple[float, float]]
+
+_POLYGON_WKT = re.compile(r"^\s*(MULTI)?POLYGON\b", re.IGNORECASE)
+_WKT_RING = re.compile(r"\(([^()]+)\)")
+
+
+# Function to read the rings of a WKT polygon or multipolygon.
+def parse_polygon_wkt(wkt: str) -> Optional[List[Ring]]:
+    """
+    Parses a POLYGON or MULTIPOLYGON WKT string into the list of all its rings.
+
+    Outer rings and holes are returned alike: for valid (multi)polygons, the
+    even-odd rule over all rings tells inside from outside (see point_in_rings).
+    Z and M coordinates are dropped.
+
+    Args:
+        wkt (str): The geometry expressed in WKT format.
+
+    Returns:
+        List[Ring]: The closed rings, or None when wkt is not a non-empty polygon.
+    """
+    if not _POLYGON_WKT.match(str(wkt)):
+        return None
+    rings = []
+    for ring_text in _WKT_RING.findall(wkt):
+        try:
+            ring = [(float(values[0]), float(values[1])) for values in (vertex.split() for vertex in ring_text.split(","))]
+        except (IndexError, ValueError):
+            return None
+        if len(ring) < 3:
+            return None
+        if ring[0] != ring[-1]:
+            ring.append(ring[0])
+        rings.append(ring)
+    return rings or None
+
+
+# Function to compute the bounding box of polygon rings.
+def rings_bounds(rings: Sequence[Ring]) -> Tuple[float, float, float, float]:
+    """
+    Returns the (min longitude, min latitude, max longitude, max latitude) box of the rings.
+    """
+    longitudes = [x for ring in rings for x, _ in ring]
+    latitudes = [y for ring in rings for _, y in ring]
+    return min(longitudes), min(latitudes), max(longitudes), max(latitudes)
+
+
+# Function to test whether a point lies inside polygon rings.
+def point_in_rings(longitude: float, latitude: float, rings: Sequence[Ring], tolerance: float = 1e-9) -> Optional[bool]:
+    """
+    Tests a point against polygon rings with the even-odd (ray casting) rule.
+
+    Args:
+        longitude (float): Longitude of the point.
+        latitude (float): Latitude of the point.
+        rings (Sequence[Ring]): Closed rings, e.g. from parse_polygon_wkt.
+        tolerance (float): Distance in degrees from an edge within which the point counts as on the boundary.
+
+    Returns:
+        bool: True inside, False outside, None on the boundary, where the answer depends on rounding.
+    """
+    inside = False
+    for ring in rings:
+        x1, y1 = ring[0]
+        for x2, y2 in ring[1:]:
+            # On the boundary: close to the edge's line and within its extent
+            if (min(x1, x2) - tolerance <= longitude <= max(x1, x2) + tolerance
+                    and min(y1, y2) - tolerance <= latitude <= max(y1, y2) + tolerance
+                    and abs((x2 - x1) * (latitude - y1) - (y2 - y1) * (longitude - x1)) <= tolerance * math.hypot(x2 - x1, y2 - y1)):
+                return None
+            # Counting the edges crossed by a ray going east from the point
+            if (y1 > latitude) != (y2 > latitude) and longitude < x1 + (latitude - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            x1, y1 = x2, y2
+    return inside
+
+
+# ----------------------------
+# Grid Index
+# ----------------------------
+
+class GridIndex:
+    """
+    Spatial index bucketing items into a regular longitude/latitude grid.
+
+    Each item is registered in every cell its bounding circle overlaps, so a
+    lookup only inspects the few cells around the query.
+
+    Args:
+        cell_degrees (float): Size of a grid cell in degrees.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], set] = defaultdict(set)
+
+    def cells(self, longitude: float, latitude: float, radius_m: float = 0.0) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the cells overlapped by a circle.
+        """
+        dlat = radius_m / _METERS_PER_DEGREE
+        dlon = dlat / max(math.cos(math.radians(latitude)), 1e-6)
+        return self.box_cells((longitude - dlon, latitude - dlat, longitude + dlon, latitude + dlat))
+
+    def box_cells(self, box: Tuple[float, float, float, float]) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the cells overlapped by a (min longitude, min latitude, max longitude, max latitude) box.
+        """
+        size = self.cell_degrees
+        for x in range(math.floor(box[0] / size), math.floor(box[2] / size) + 1):
+            for y in range(math.floor(box[1] / size), math.floor(box[3] / size) + 1):
+                yield x, y
+
+    def insert(self, item, longitude: float, latitude: float, radius_m: float = 0.0) -> None:
+        self._insert_cells(item, self.cells(longitude, latitude, radius_m))
+
+    def remove(self, item, longitude: float, latitude: float, radius_m: float = 0.0) -> None:
+        self._remove_cells(item, self.cells(longitude, latitude, radius_m))
+
+    def insert_box(self, item, box: Tuple[float, float, float, float]) -> None:
+        self._insert_cells(item, self.box_cells(box))
+
+    def remove_box(self, item, box: Tuple[float, float, float, float]) -> None:
+        self._remove_cells(item, self.box_cells(box))
+
+    def _insert_cells(self, item, cells: Iterable[Tuple[int, int]]) -> None:
+        for cell in cells:
+            self._cells[cell].add(item)
+
+    def _remove_cells(self, item, cells: Iterable[Tuple[int, int]]) -> None:
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+
+    def query(self, longitude: float, latitude: float, radius_m: float = 0.0) -> set:
+        """
+        Returns the items registered in the cells overlapped by a circle.
+        """
+        items = set()
+        for cell in self.cells(longitude, latitude, radius_m):
+            items |= self._cells.get(cell, set())
+        return items
+
+
+# ----------------------------
+# Reverse Search Cache
+# ----------------------------
+
+# Default maximum number of addresses the reverse search endpoint returns; larger limits are capped to it
+DEFAULT_MAX_LIMIT = 100
+
+
+class ReverseSearchCache:
+    """
+    Spatial cache answering reverse address searches from previously fetched areas.
+
+    Every successful reverse search around a point fetches the addresses
+    within a circle. When fewer addresses than the limit came back, and than
+    the endpoint's own maximum, which silently caps larger limits, the circle
+    is known to be complete and is remembered as a covered area. A
+    later search whose own circle lies fully inside a covered area is answered
+    locally by filtering the cached addresses by distance, without any API
+    call. Addresses and covered areas are indexed in grids of cell_degrees.
+
+    Distances are measured to each address's representative point, and local
+    answers contain only the 'addresses' list of the API response.
+
+    Args:
+        max_areas (int): Maximum number of covered areas kept; the oldest are dropped first.
+        cell_degrees (float): Size of the grid cells in degrees (0.005 is about 500 m).
+        max_radius_m (float): Searches with larger buffers are not remembered, to bound the index size.
+        max_limit (int): Maximum number of addresses returned by the endpoint; a result is
+                         complete only when shorter than both this and the requested limit.
+    """
+
+    def __init__(self, max_areas: int = 100000, cell_degrees: float = 0.005, max_radius_m: float = 5000.0,
+                 max_limit: int = DEFAULT_MAX_LIMIT):
+        self.max_areas = max_areas
+        self.max_radius_m = max_radius_m
+        self.max_limit = max_limit
+        self._lock = threading.Lock()
+        self._area_index = GridIndex(cell_degrees)
+        self._address_index = GridIndex(cell_degrees)
+        # area id -> (longitude, latitude, radius_m, address keys), oldest first
+        self._areas: "OrderedDict[int, tuple]" = OrderedDict()
+        # address key -> [record, longitude, latitude, number of areas holding it]
+        self._addresses: Dict[str, list] = {}
+        self._next_area_id = 0
+        self._counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _address_point(record: Dict) -> Optional[Tuple[str, float, float]]:
+        try:
+            point = record["location"]["representativePoint"]
+            longitude, latitude = float(point["longitude"]), float(point["latitude"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        key = record.get("id") or f"{record.get('label')}@{longitude},{latitude}"
+        return key, longitude, latitude
+
+    def lookup(self, longitude: float, latitude: float, radius_m: float, limit: int) -> Optional[List[Dict]]:
+        """
+        Answers a reverse search locally when its circle lies inside a covered area.
+
+        Args:
+            longitude (float): Longitude of the searched point.
+            latitude (float): Latitude of the searched point.
+            radius_m (float): Buffer distance in meters.
+            limit (int): Maximum number of addresses to return.
+
+        Returns:
+            List[dict]: The address records nearest first, or None on a miss.
+        """
+        with self._lock:
+            covered = any(
+                haversine_m(longitude, latitude, area[0], area[1]) + radius_m <= area[2]
+                for area in (self._areas[area_id] for area_id in self._area_index.query(longitude, latitude))
+            )
+            if not covered:
+                self._counters["misses"] += 1
+                return None
+
+            matches = []
+            for key in self._address_index.query(longitude, latitude, radius_m):
+                record, address_longitude, address_latitude, _ = self._addresses[key]
+                distance = haversine_m(longitude, latitude, address_longitude, address_latitude)
+                if distance <= radius_m:
+                    matches.append((distance, key, record))
+            self._counters["hits"] += 1
+        matches.sort(key=lambda match: match[:2])
+        return [record for _, _, record in matches[:limit]]
+
+    def add(self, longitude: float, latitude: float, radius_m: float, limit: int, records: List[Dict]) -> None:
+        """
+        Remembers the addresses returned by a reverse search.
+
+        Args:
+            longitude (float): Longitude of the searched point.
+            latitude (float): Latitude of the searched point.
+            radius_m (float): Buffer distance in meters.
+            limit (int): The limit the search was made with.
+            records (List[dict]): The address records returned.
+        """
+        # A truncated result, by the limit or by the endpoint's cap, says nothing about the addresses left out
+        if len(records) >= min(limit, self.max_limit) or radius_m > self.max_radius_m:
+            return
+
+        points = [(record, self._address_point(record)) for record in records]
+        # An address without a point could never be matched locally
+        if any(point is None for _, point in points):
+            return
+
+        with self._lock:
+            area_keys = []
+            for record, (key, address_longitude, address_latitude) in points:
+                entry = self._addresses.get(key)
+                if entry is None:
+                    entry = self._addresses[key] = [record, address_longitude, address_latitude, 0]
+                    self._address_index.insert(key, address_longitude, address_latitude)
+                entry[3] += 1
+                area_keys.append(key)
+
+            area_id = self._next_area_id
+            self._next_area_id += 1
+            self._areas[area_id] = (longitude, latitude, radius_m, area_keys)
+            self._area_index.insert(area_id, longitude, latitude, radius_m)
+
+            while len(self._areas) > self.max_areas:
+                self._drop_oldest_area()
+
+    def _drop_oldest_area(self) -> None:
+        """
+        Forgets the oldest covered area and the addresses no other area holds; the lock must be held.
+        """
+        area_id, (longitude, latitude, radius_m, keys) = self._areas.popitem(last=False)
+        self._area_index.remove(area_id, longitude, latitude, radius_m)
+        for key in keys:
+            entry = self._addresses[key]
+            entry[3] -= 1
+            if entry[3] == 0:
+                self._address_index.remove(key, entry[1], entry[2])
+                del self._addresses[key]
+
+    def stats(self) -> Dict:
+        """
+        Returns the local hit/miss counters and the size of the cache.
+
+        Returns:
+            dict: hits, misses, hit_rate, areas and addresses.
+        """
+        with self._lock:
+            stats = dict(self._counters, areas=len(self._areas), addresses=len(self._addresses))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# ----------------------------
+# Parcel Geometry Cache
+# ----------------------------
+
+class ParcelGeometryCache:
+    """
+    Spatial cache resolving points to parcels whose polygons were already fetched.
+
+    Every parcel returned with its geometry is remembered with its polygon,
+    indexed by bounding box in a grid of cell_degrees. A later point lookup
+    only tests the polygons registered in the point's cell: when the point lies
+    inside one or more of them, those parcels are the answer and no API call
+    is made. Points outside every cached polygon, or on a polygon's boundary,
+    are misses.
+
+    Parcels are assumed not to overlap partially: a point inside a cached
+    polygon is resolved to every cached parcel containing it (e.g. stacked
+    condominium parcels sharing a footprint), not to parcels never fetched.
+
+    Args:
+        max_parcels (int): Maximum number of parcels kept; the least recently used are dropped first.
+        cell_degrees (float): Size of the grid cells in degrees (0.001 is about 100 m).
+        max_cells (int): Parcels whose bounding box overlaps more cells are not kept, to bound the index size.
+    """
+
+    def __init__(self, max_parcels: int = 100000, cell_degrees: float = 0.001, max_cells: int = 400):
+        self.max_parcels = max_parcels
+        self.max_cells = max_cells
+        self._lock = threading.Lock()
+        self._index = GridIndex(cell_degrees)
+        # (country code, parcel id) -> (record, rings, bounding box), least recently used first
+        self._parcels: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _parcel_rings(record: Dict) -> Optional[List[Ring]]:
+        for container in (record.get("location"), record):
+            try:
+                wkt = container["geometry"]["wkt"]
+            except (KeyError, TypeError):
+                continue
+            return parse_polygon_wkt(wkt)
+        return None
+
+    def lookup(self, country_code: str, longitude: float, latitude: float) -> Optional[List[Dict]]:
+        """
+        Resolves a point to the cached parcels containing it.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            longitude (float): Longitude of the point.
+            latitude (float): Latitude of the point.
+
+        Returns:
+            List[dict]: The parcel records containing the point, or None on a miss.
+        """
+        country_code = country_code.lower()
+        with self._lock:
+            matches = []
+            for key in self._index.query(longitude, latitude):
+                record, rings, box = self._parcels[key]
+                if key[0] != country_code or not (box[0] <= longitude <= box[2] and box[1] <= latitude <= box[3]):
+                    continue
+                inside = point_in_rings(longitude, latitude, rings)
+                if inside is None:
+                    matches = None
+                    break
+                if inside:
+                    matches.append(key)
+            if not matches:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            for key in matches:
+                self._parcels.move_to_end(key)
+            # Sorted so that the answer does not depend on the order of the grid's sets
+            return [self._parcels[key][0] for key in sorted(matches)]
+
+    def add(self, country_code: str, records: List[Dict]) -> int:
+        """
+        Remembers the parcels of a response.
+
+        Args:
+            country_code (str): ISO 3166 alpha-2 country code.
+            records (List[dict]): The parcel records, with their geometry.
+
+        Returns:
+            int: The number of parcels kept.
+        """
+        country_code = country_code.lower()
+        kept = 0
+        for record in records:
+            rings = self._parcel_rings(record)
+            if rings is None or not record.get("id"):
+                continue
+            box = rings_bounds(rings)
+            if sum(1 for _ in islice(self._index.box_cells(box), self.max_cells + 1)) > self.max_cells:
+                continue
+            key = (country_code, record["id"])
+            with self._lock:
+                previous = self._parcels.pop(key, None)
+                if previous is not None:
+                    self._index.remove_box(key, previous[2])
+                self._parcels[key] = (record, rings, box)
+                self._index.insert_box(key, box)
+                while len(self._parcels) > self.max_parcels:
+                    old_key, (_, _, old_box) = self._parcels.popitem(last=False)
+                    self._index.remove_box(old_key, old_box)
+            kept += 1
+        return kept
+
+    def stats(self) -> Dict:
+        """
+        Returns the local hit/miss counters and the size of the cache.
+
+        Returns:
+            dict: hits, misses, hit_rate (the fraction of lookups resolved locally) and parcels.
+        """
+        with self._lock:
+            stats = dict(self._counters, parcels=len(self._parcels))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
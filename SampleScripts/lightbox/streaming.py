@@ -0,0 +1,289 @@
+import codecs
+import json
+import re
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+
+# ----------------------------
+# Streaming Configuration
+# ----------------------------
+
+# Keys of each record left out unless requested, since they hold the bulk of the payload
+DEFAULT_SKIP_FIELDS = ("geometry",)
+
+# Size of the chunks read from a streamed response body
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Consumed text is dropped from the buffer once it is longer than this
+_COMPACT_THRESHOLD = 1024 * 1024
+
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class _Incomplete(Exception):
+    """
+    Raised when the buffered text ends before the value being scanned.
+    """
+
+
+# ----------------------------
+# Scanning Helpers
+# ----------------------------
+
+# Function to skip whitespace.
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+# Function to read the character at a position, or signal that more text is needed.
+def _char(text: str, pos: int) -> str:
+    if pos >= len(text):
+        raise _Incomplete
+    return text[pos]
+
+
+# Function to find the next character that is not whitespace, or signal that more text is needed.
+def _next_token(text: str, pos: int) -> int:
+    pos = _skip_whitespace(text, pos)
+    _char(text, pos)
+    return pos
+
+
+# Function to find the end of a JSON string.
+def _string_end(text: str, pos: int) -> int:
+    """
+    Returns the position just after the string opening at pos.
+    """
+    index = pos + 1
+    while True:
+        index = text.find('"', index)
+        if index < 0:
+            raise _Incomplete
+        # A quote preceded by an odd number of backslashes is escaped
+        backslashes = 0
+        while text[index - 1 - backslashes] == "\\":
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return index + 1
+        index += 1
+
+
+# Function to find the end of a JSON value without decoding it.
+def _value_end(text: str, pos: int) -> int:
+    """
+    Returns the position just after the value starting at pos.
+
+    Containers are skipped by jumping from one bracket or quote to the next,
+    and strings (such as WKT polygons) by jumping to their closing quote, so
+    skipped values are never turned into Python objects.
+    """
+    char = _char(text, pos)
+    if char == '"':
+        return _string_end(text, pos)
+    if char in "{[":
+        depth, index = 0, pos
+        while True:
+            match = _STRUCTURE.search(text, index)
+            if match is None:
+                raise _Incomplete
+            token = match.group()
+            if token == '"':
+                index = _string_end(text, match.start())
+                continue
+            index = match.end()
+            depth += 1 if token in "{[" else -1
+            if depth == 0:
+                return index
+    # Number, true, false or null: it only ends at a delimiter, which may not be buffered yet
+    match = _SCALAR_END.search(text, pos)
+    if match is None:
+        raise _Incomplete
+    return match.start()
+
+
+# Function to turn dotted field paths into a tree of keys.
+def _field_tree(fields: Optional[Sequence[str]]) -> Optional[Dict]:
+    """
+    Turns ['id', 'location.representativePoint'] into {'id': None, 'location': {'representativePoint': None}}.
+    """
+    if fields is None:
+        return None
+    tree: Dict = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for parent in parents:
+            if node.get(parent, {}) is None:
+                break  # An ancestor is already requested whole
+            node = node.setdefault(parent, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+# Function to decode a complete value, keeping only the requested keys of objects.
+def _project(text: str, pos: int, tree: Optional[Dict], skip: Sequence[str], decoder: json.JSONDecoder) -> Tuple[object, int]:
+    """
+    Decodes the value at pos, keeping the keys of tree (or every key outside skip when tree is None).
+
+    Returns:
+        Tuple[object, int]: The decoded value and the position just after it.
+    """
+    char = text[pos]
+    if char == "[" and tree is not None:
+        items = []
+        pos = _skip_whitespace(text, pos + 1)
+        while text[pos] != "]":
+            item, pos = _project(text, pos, tree, skip, decoder)
+            items.append(item)
+            pos = _skip_whitespace(text, pos)
+            if text[pos] == ",":
+                pos = _skip_whitespace(text, pos + 1)
+        return items, pos + 1
+    if char != "{" or (tree is None and not skip):
+        return decoder.raw_decode(text, pos)
+
+    record = {}
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos] == "}":
+        return record, pos + 1
+    while True:
+        key_end = _string_end(text, pos)
+        key = text[pos + 1:key_end - 1]
+        if "\\" in key:
+            key = json.loads(text[pos:key_end])
+        pos = _skip_whitespace(text, key_end)
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+
+        if tree is None:
+            wanted, subtree = key not in skip, None
+        else:
+            wanted, subtree = key in tree, tree.get(key)
+        if not wanted:
+            pos = _value_end(text, pos)
+        elif subtree is None:
+            record[key], pos = decoder.raw_decode(text, pos)
+        else:
+            record[key], pos = _project(text, pos, subtree, (), decoder)
+
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == ",":
+            pos = _skip_whitespace(text, pos + 1)
+        elif text[pos] == "}":
+            return record, pos + 1
+        else:
+            raise ValueError(f"Expected ',' or '}}' at position {pos}")
+
+
+# Function to find the array held by a key of the top-level object.
+def _array_start(text: str, key: str) -> Optional[int]:
+    """
+    Returns the position just after the '[' of the array under key, or None when the key is missing.
+    """
+    pos = _skip_whitespace(text, 0)
+    if _char(text, pos) != "{":
+        raise ValueError("Expected a JSON object")
+    pos = _skip_whitespace(text, pos + 1)
+    while _char(text, pos) != "}":
+        key_end = _string_end(text, pos)
+        name = json.loads(text[pos:key_end])
+        pos = _skip_whitespace(text, key_end)
+        if _char(text, pos) != ":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+        if name == key:
+            if _char(text, pos) != "[":
+                raise ValueError(f"Expected '{key}' to be an array")
+            return pos + 1
+        pos = _skip_whitespace(text, _value_end(text, pos))
+        if _char(text, pos) == ",":
+            pos = _skip_whitespace(text, pos + 1)
+    return None
+
+
+# ----------------------------
+# Streaming Decoder
+# ----------------------------
+
+# Function to decode the records of a JSON array one at a time from chunks of a response body.
+def iter_json_records(
+        chunks: Iterable[bytes],
+        key: str,
+        fields: Optional[Sequence[str]] = None,
+        skip: Sequence[str] = DEFAULT_SKIP_FIELDS
+) -> Iterator[Dict]:
+    """
+    Yields the records of the array under key in a JSON object, as the body arrives.
+
+    Only one record is ever decoded at a time: the scanner finds where each
+    record ends, then decodes just the requested fields of it. Skipped values,
+    such as parcel geometries, are stepped over without being decoded.
+
+    Args:
+        chunks (Iterable[bytes]): The UTF-8 body, in chunks (e.g. response.iter_content()).
+        key (str): Key of the array in the top-level object (e.g. 'parcels', 'addresses').
+        fields (Sequence[str]): Fields kept in each record, as dotted paths (e.g. 'id',
+                                'location.representativePoint'); every field outside skip by default.
+        skip (Sequence[str]): Keys of each record left out when fields is None.
+
+    Yields:
+        dict: The records, in order.
+    """
+    tree = _field_tree(fields)
+    skip = tuple(skip or ())
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    state = {"text": "", "eof": False}
+
+    def read(at_least: int) -> None:
+        """
+        Appends at least at_least characters to the buffer, or raises ValueError at the end of the body.
+        """
+        if state["eof"]:
+            raise ValueError("JSON body ended before the end of the array")
+        parts, size = [], 0
+        for chunk in chunks:
+            part = utf8.decode(chunk)
+            parts.append(part)
+            size += len(part)
+            if size >= at_least:
+                break
+        else:
+            parts.append(utf8.decode(b"", final=True))
+            state["eof"] = True
+        state["text"] += "".join(parts)
+
+    # Reading more each time the buffer falls short keeps rescans of a long value linear overall
+    def attempt(function, start: int):
+        while True:
+            try:
+                return function(state["text"])
+            except _Incomplete:
+                read(max(DEFAULT_CHUNK_SIZE, len(state["text"]) - start))
+
+    pos = attempt(lambda text: _array_start(text, key), 0)
+    if pos is None:
+        return
+
+    while True:
+        pos = attempt(lambda text: _next_token(text, pos), pos)
+        char = state["text"][pos]
+        if char == "]":
+            return
+        if char == ",":
+            pos += 1
+            continue
+
+        start = pos
+        end = attempt(lambda text: _value_end(text, start), start)
+        record, _ = _project(state["text"], start, tree, skip, decoder)
+        pos = end
+        if pos > _COMPACT_THRESHOLD:
+            state["text"] = state["text"][pos:]
+            pos = 0
+        yield record